@@ -16,9 +16,12 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+from database import SQLALCHEMY_DATABASE_URL, init_db
+import models
+target_metadata = models.Base.metadata
+
+# 使用與應用程式相同的數據庫 URL
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -63,6 +66,10 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
+    # 部署時的一次性結構設定：建立資料表、搜尋索引與觸發器，再執行遷移
+    # （worker 啟動時不再執行，見 database.DB_AUTO_INIT）
+    init_db()
+
     with connectable.connect() as connection:
         context.configure(
             connection=connection, target_metadata=target_metadata
@@ -0,0 +1,36 @@
+"""add_hot_query_indexes
+
+Revision ID: 4c1f9a7d2e3b
+Revises: b2395e77dcc9
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1f9a7d2e3b'
+down_revision: Union[str, None] = 'b2395e77dcc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 新數據庫可能已由 create_all 建立索引，因此使用 if_not_exists
+    op.create_index('ix_tasks_position', 'tasks', ['position'], unique=False, if_not_exists=True)
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_tasks_status_position', 'tasks', ['status', 'position'], unique=False, if_not_exists=True)
+    op.create_index('ix_articles_category', 'articles', ['category'], unique=False, if_not_exists=True)
+    op.create_index('ix_articles_created_at', 'articles', ['created_at'], unique=False, if_not_exists=True)
+    # 更新查詢規劃器的統計資訊
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_created_at', table_name='articles', if_exists=True)
+    op.drop_index('ix_articles_category', table_name='articles', if_exists=True)
+    op.drop_index('ix_tasks_status_position', table_name='tasks', if_exists=True)
+    op.drop_index('ix_tasks_due_date', table_name='tasks', if_exists=True)
+    op.drop_index('ix_tasks_position', table_name='tasks', if_exists=True)
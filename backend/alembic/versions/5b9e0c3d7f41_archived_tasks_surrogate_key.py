@@ -0,0 +1,76 @@
+"""archived_tasks_surrogate_key
+
+Revision ID: 5b9e0c3d7f41
+Revises: f3a8c61d0e27
+Create Date: 2026-10-18 21:37:52.416803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e0c3d7f41'
+down_revision: Union[str, None] = 'f3a8c61d0e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COPY_COLUMNS = "title, description, priority, status, due_date, created_at, updated_at, position, tags, archived_at"
+
+
+def _rebuild(task_key: bool, copy: str) -> None:
+    # SQLite 無法修改主鍵，改名後重建再複製；舊表的觸發器（每日完成數，見 analytics.py）隨 DROP TABLE 移除，
+    # 複製完成後在新表重新建立，複製時不會重複計數
+    conn = op.get_bind()
+    triggers = conn.execute(sa.text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'archived_tasks'"
+    )).scalars().all()
+    op.drop_index('ix_archived_tasks_archived_at', table_name='archived_tasks', if_exists=True)
+    op.rename_table('archived_tasks', 'archived_tasks_old')
+    columns = [sa.Column('id', sa.Integer(), autoincrement=task_key, nullable=False)]
+    if task_key:
+        columns.append(sa.Column('task_id', sa.Integer(), nullable=False))
+    op.create_table(
+        'archived_tasks',
+        *columns,
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=True),
+        sa.Column('tags', sa.String(length=255), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(copy)
+    op.drop_table('archived_tasks_old')
+    op.create_index('ix_archived_tasks_archived_at', 'archived_tasks', ['archived_at'], unique=False)
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    # tasks.id 沒有 AUTOINCREMENT，原任務 id 可能重複封存：改用自己的主鍵，原 id 存在 task_id
+    # 新數據庫已由 create_all 建立新的結構
+    conn = op.get_bind()
+    if 'task_id' in {column['name'] for column in sa.inspect(conn).get_columns('archived_tasks')}:
+        return
+    _rebuild(True, f"""
+        INSERT INTO archived_tasks (task_id, {_COPY_COLUMNS})
+        SELECT id, {_COPY_COLUMNS} FROM archived_tasks_old ORDER BY archived_at, id
+    """)
+    op.create_index('ix_archived_tasks_task_id', 'archived_tasks', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    # 同一個任務封存多次時只保留最近封存的一筆
+    op.drop_index('ix_archived_tasks_task_id', table_name='archived_tasks', if_exists=True)
+    _rebuild(False, f"""
+        INSERT OR IGNORE INTO archived_tasks (id, {_COPY_COLUMNS})
+        SELECT task_id, {_COPY_COLUMNS} FROM archived_tasks_old ORDER BY id DESC
+    """)
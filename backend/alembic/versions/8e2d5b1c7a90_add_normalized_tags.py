@@ -0,0 +1,93 @@
+"""add_normalized_tags
+
+Revision ID: 8e2d5b1c7a90
+Revises: 4c1f9a7d2e3b
+Create Date: 2026-10-18 14:02:17.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d5b1c7a90'
+down_revision: Union[str, None] = '4c1f9a7d2e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse_tags(value):
+    tags = []
+    for tag in (value or "").split(","):
+        tag = tag.strip()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def _backfill(conn, owner_table, link_table, owner_column):
+    """將既有的逗號分隔標籤拆分寫入關聯表"""
+    rows = conn.execute(sa.text(f"SELECT id, tags FROM {owner_table} WHERE coalesce(tags, '') != ''")).all()
+    for owner_id, tags in rows:
+        for name in _parse_tags(tags):
+            conn.execute(sa.text("INSERT OR IGNORE INTO tags (name) VALUES (:name)"), {"name": name})
+            conn.execute(
+                sa.text(
+                    f"INSERT OR IGNORE INTO {link_table} ({owner_column}, tag_id) "
+                    "SELECT :owner_id, id FROM tags WHERE name = :name"
+                ),
+                {"owner_id": owner_id, "name": name}
+            )
+
+
+def upgrade() -> None:
+    # 新數據庫可能已由 create_all 建立資料表
+    conn = op.get_bind()
+    existing = set(sa.inspect(conn).get_table_names())
+
+    if 'tags' not in existing:
+        op.create_table(
+            'tags',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_tags_id', 'tags', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_tags_name', 'tags', ['name'], unique=True, if_not_exists=True)
+
+    if 'task_tags' not in existing:
+        op.create_table(
+            'task_tags',
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('tag_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('task_id', 'tag_id')
+        )
+    op.create_index('ix_task_tags_tag_id_task_id', 'task_tags', ['tag_id', 'task_id'], unique=False, if_not_exists=True)
+
+    if 'article_tags' not in existing:
+        op.create_table(
+            'article_tags',
+            sa.Column('article_id', sa.Integer(), nullable=False),
+            sa.Column('tag_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('article_id', 'tag_id')
+        )
+    op.create_index('ix_article_tags_tag_id_article_id', 'article_tags', ['tag_id', 'article_id'], unique=False, if_not_exists=True)
+
+    _backfill(conn, 'tasks', 'task_tags', 'task_id')
+    _backfill(conn, 'articles', 'article_tags', 'article_id')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_article_tags_tag_id_article_id', table_name='article_tags', if_exists=True)
+    op.drop_table('article_tags')
+    op.drop_index('ix_task_tags_tag_id_task_id', table_name='task_tags', if_exists=True)
+    op.drop_table('task_tags')
+    op.drop_index('ix_tags_name', table_name='tags', if_exists=True)
+    op.drop_index('ix_tags_id', table_name='tags', if_exists=True)
+    op.drop_table('tags')
@@ -0,0 +1,45 @@
+"""add_archived_tasks
+
+Revision ID: d41c7e2a9b53
+Revises: 8e2d5b1c7a90
+Create Date: 2026-10-18 16:21:45.301274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c7e2a9b53'
+down_revision: Union[str, None] = '8e2d5b1c7a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 新數據庫可能已由 create_all 建立資料表；保留每日完成數的觸發器由 analytics.init_analytics 建立
+    conn = op.get_bind()
+    if 'archived_tasks' not in sa.inspect(conn).get_table_names():
+        op.create_table(
+            'archived_tasks',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.String(length=1000), nullable=True),
+            sa.Column('priority', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('due_date', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('position', sa.Integer(), nullable=True),
+            sa.Column('tags', sa.String(length=255), nullable=True),
+            sa.Column('archived_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_archived_tasks_archived_at', 'archived_tasks', ['archived_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_tasks_archived_at', table_name='archived_tasks', if_exists=True)
+    op.drop_table('archived_tasks')
@@ -0,0 +1,26 @@
+"""add_articles_updated_at_index
+
+Revision ID: f3a8c61d0e27
+Revises: d41c7e2a9b53
+Create Date: 2026-10-18 19:02:17.884120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c61d0e27'
+down_revision: Union[str, None] = 'd41c7e2a9b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 相關文章索引依 updated_at 補上其他 worker 修改的文章；新數據庫已由 create_all 建立
+    op.create_index('ix_articles_updated_at', 'articles', ['updated_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_articles_updated_at', table_name='articles', if_exists=True)
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# 任務統計的彙總表，由觸發器在每次任務寫入時（含批次操作）於同一交易中增量更新，
+# 讀取圖表資料不需掃描任務表。
+# task_stats：各狀態／優先級的任務數
+# task_completions：每日完成數，以台北時間的 updated_at 日期計算（與前端趨勢圖一致），
+#   包含已封存的任務（封存／還原時 tasks 與 archived_tasks 的觸發器互相抵銷）
+LOCAL_DAY = "date({col}, '+8 hours')"
+
+_CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS task_stats (
+        dimension VARCHAR(20) NOT NULL,
+        value VARCHAR(20) NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, value)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_completions (
+        day VARCHAR(10) NOT NULL PRIMARY KEY,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+
+def _stat_delta(dimension: str, ref: str, delta: int) -> str:
+    value = f"coalesce(CAST({ref}.{dimension} AS TEXT), '')"
+    return f"""
+        INSERT INTO task_stats(dimension, value, count) VALUES ('{dimension}', {value}, {delta})
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + {delta};
+    """
+
+
+def _completion_delta(ref: str, delta: int) -> str:
+    day = LOCAL_DAY.format(col=f"{ref}.updated_at")
+    return f"""
+        INSERT INTO task_completions(day, count) SELECT {day}, {delta} WHERE {ref}.status = 'DONE'
+        ON CONFLICT(day) DO UPDATE SET count = count + {delta};
+    """
+
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_stats_ai AFTER INSERT ON tasks BEGIN
+        {_stat_delta("status", "new", 1)}
+        {_stat_delta("priority", "new", 1)}
+        {_completion_delta("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_stats_ad AFTER DELETE ON tasks BEGIN
+        {_stat_delta("status", "old", -1)}
+        {_stat_delta("priority", "old", -1)}
+        {_completion_delta("old", -1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_stats_au_status AFTER UPDATE OF status ON tasks
+    WHEN old.status IS NOT new.status BEGIN
+        {_stat_delta("status", "old", -1)}
+        {_stat_delta("status", "new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_stats_au_priority AFTER UPDATE OF priority ON tasks
+    WHEN old.priority IS NOT new.priority BEGIN
+        {_stat_delta("priority", "old", -1)}
+        {_stat_delta("priority", "new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS archived_tasks_stats_ai AFTER INSERT ON archived_tasks BEGIN
+        {_completion_delta("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS archived_tasks_stats_ad AFTER DELETE ON archived_tasks BEGIN
+        {_completion_delta("old", -1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_stats_au_completion AFTER UPDATE ON tasks
+    WHEN (old.status = 'DONE' OR new.status = 'DONE')
+        AND (old.status IS NOT new.status
+             OR {LOCAL_DAY.format(col="old.updated_at")} IS NOT {LOCAL_DAY.format(col="new.updated_at")}) BEGIN
+        {_completion_delta("old", -1)}
+        {_completion_delta("new", 1)}
+    END
+    """,
+]
+
+_REBUILD = [
+    "DELETE FROM task_stats",
+    "DELETE FROM task_completions",
+    """
+    INSERT INTO task_stats(dimension, value, count)
+    SELECT 'status', coalesce(CAST(status AS TEXT), ''), count(*) FROM tasks GROUP BY 2
+    """,
+    """
+    INSERT INTO task_stats(dimension, value, count)
+    SELECT 'priority', coalesce(CAST(priority AS TEXT), ''), count(*) FROM tasks GROUP BY 2
+    """,
+    f"""
+    INSERT INTO task_completions(day, count)
+    SELECT day, count(*) FROM (
+        SELECT {LOCAL_DAY.format(col="updated_at")} AS day FROM tasks WHERE status = 'DONE'
+        UNION ALL
+        SELECT {LOCAL_DAY.format(col="updated_at")} AS day FROM archived_tasks WHERE status = 'DONE'
+    ) GROUP BY 1
+    """,
+]
+
+
+def init_analytics(engine) -> None:
+    """建立彙總表與觸發器，首次建立時從任務表重新計算"""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_stats'")
+        ).first()
+        for statement in _CREATE_TABLES + _TRIGGERS:
+            conn.execute(text(statement))
+        if not exists:
+            for statement in _REBUILD:
+                conn.execute(text(statement))
+            logger.info("Task analytics tables created and populated")
+
+
+def rebuild_analytics(engine) -> None:
+    """從任務表完整重新計算彙總資料"""
+    with engine.begin() as conn:
+        for statement in _REBUILD:
+            conn.execute(text(statement))
+    logger.info("Task analytics rebuilt")
+
+
+def get_analytics(db: Session, days: int = 7) -> dict:
+    """讀取彙總表，查詢成本與任務數量無關"""
+    stats = {"status": {}, "priority": {}}
+    for row in db.execute(text("SELECT dimension, value, count FROM task_stats WHERE count != 0")):
+        stats[row.dimension][row.value] = row.count
+
+    today = datetime.now(pytz.timezone('Asia/Taipei')).date()
+    first_day = today - timedelta(days=days - 1)
+    completed = {
+        row.day: row.count
+        for row in db.execute(
+            text("SELECT day, count FROM task_completions WHERE day >= :first_day"),
+            {"first_day": first_day.isoformat()}
+        )
+    }
+    trend = []
+    for offset in range(days):
+        day = (first_day + timedelta(days=offset)).isoformat()
+        trend.append({"date": day, "completed": completed.get(day, 0)})
+
+    return {
+        "total": sum(stats["status"].values()),
+        "status": stats["status"],
+        "priority": stats["priority"],
+        "completion_trend": trend,
+    }
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+from sqlalchemy import select, insert, delete, literal, or_, and_
+from sqlalchemy.orm import Session
+import threading
+import logging
+import os
+import models
+from positions import next_position
+from tagging import sync_task_tags
+
+logger = logging.getLogger(__name__)
+
+# 完成的任務封存：背景執行緒定期把 updated_at 早於 TASK_ARCHIVE_AFTER_DAYS 天的 DONE 任務
+# 分批移到 archived_tasks，每批一個短交易，不長時間佔住寫入鎖。
+# 刪除時觸發器照常維護搜尋索引、統計與變更紀錄（客戶端收到墓碑），標籤關聯隨外鍵刪除；
+# 每日完成數由 archived_tasks 的觸發器保留（見 analytics.py）。
+# TASK_ARCHIVE_AFTER_DAYS=0 停用背景封存。
+TASK_ARCHIVE_AFTER_DAYS = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "30"))
+TASK_ARCHIVE_INTERVAL = float(os.getenv("TASK_ARCHIVE_INTERVAL", "3600"))
+TASK_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "500"))
+
+_TASK_COLUMNS = ("title", "description", "priority", "status", "due_date",
+                 "created_at", "updated_at", "position", "tags")
+
+
+def archive_batch(db: Session, cutoff: datetime, limit: int = TASK_ARCHIVE_BATCH_SIZE) -> List[int]:
+    """將一批在 cutoff 之前完成的任務移到封存表，返回移動的任務 id（由呼叫端 commit）"""
+    # DONE 任務會持續被封存，掃描的範圍有上限，不另外為 updated_at 建索引增加寫入成本
+    ids = db.execute(
+        select(models.Task.id)
+        .where(models.Task.status == models.TaskStatus.DONE.value, models.Task.updated_at < cutoff)
+        .limit(limit)
+    ).scalars().all()
+    if not ids:
+        return []
+
+    archived_at = datetime.now(timezone.utc).replace(microsecond=0)
+    columns = [getattr(models.Task, name) for name in _TASK_COLUMNS]
+    db.execute(
+        insert(models.ArchivedTask).from_select(
+            ["task_id", *_TASK_COLUMNS, "archived_at"],
+            select(models.Task.id, *columns, literal(archived_at, models.ArchivedTask.archived_at.type))
+            .where(models.Task.id.in_(ids))
+        )
+    )
+    db.execute(
+        delete(models.Task).where(models.Task.id.in_(ids)),
+        execution_options={"synchronize_session": False}
+    )
+    return ids
+
+
+def list_archived(db: Session, limit: int, after: Optional[tuple] = None) -> List[models.ArchivedTask]:
+    """依封存時間由新到舊列出，after 為上一頁最後一筆的 (archived_at, 封存紀錄 id)"""
+    query = select(models.ArchivedTask).order_by(
+        models.ArchivedTask.archived_at.desc(), models.ArchivedTask.id.desc()
+    )
+    if after is not None:
+        archived_at, last_id = after
+        query = query.where(or_(
+            models.ArchivedTask.archived_at < archived_at,
+            and_(models.ArchivedTask.archived_at == archived_at, models.ArchivedTask.id < last_id)
+        ))
+    return db.execute(query.limit(limit)).scalars().all()
+
+
+def restore_task(db: Session, task_id: int) -> Optional[models.Task]:
+    """將封存的任務移回看板最後，返回還原的任務（由呼叫端 commit）"""
+    # 同一個 task_id 封存多次時先還原最近封存的一筆
+    archived = db.execute(
+        select(models.ArchivedTask)
+        .where(models.ArchivedTask.task_id == task_id)
+        .order_by(models.ArchivedTask.id.desc())
+        .limit(1)
+    ).scalar()
+    if archived is None:
+        return None
+    values = {name: getattr(archived, name) for name in _TASK_COLUMNS}
+    # 原 id 若已被新任務沿用（SQLite 以 max(rowid)+1 配發），改用新的 id
+    if db.get(models.Task, task_id) is None:
+        values["id"] = task_id
+    values["position"] = next_position(db)
+    # 視為一次修改：更新 updated_at，避免下一輪又立即被封存
+    values["updated_at"] = datetime.now(timezone.utc).replace(microsecond=0)
+    db.delete(archived)
+    task = models.Task(**values)
+    db.add(task)
+    db.flush()
+    sync_task_tags(db, {task.id: task.tags})
+    return task
+
+
+class TaskArchiver:
+    def __init__(self, session_factory, on_archived: Callable[[List[int]], None] = None,
+                 after_days: int = TASK_ARCHIVE_AFTER_DAYS, interval: float = TASK_ARCHIVE_INTERVAL,
+                 batch_size: int = TASK_ARCHIVE_BATCH_SIZE):
+        self._session_factory = session_factory
+        self._on_archived = on_archived
+        self._after_days = after_days
+        self._interval = interval
+        self._batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+        """封存所有符合條件的任務，返回封存數"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self._after_days)
+        total = 0
+        while not self._stop.is_set():
+            db = self._session_factory()
+            try:
+                ids = archive_batch(db, cutoff, self._batch_size)
+                db.commit()
+            except Exception as e:
+                logger.error("Error archiving tasks: %s", e)
+                db.rollback()
+                break
+            finally:
+                db.close()
+            if not ids:
+                break
+            total += len(ids)
+            if self._on_archived is not None:
+                self._on_archived(ids)
+        if total:
+            logger.info("Archived %s tasks completed before %s", total, cutoff)
+        return total
+
+    def _run(self) -> None:
+        while True:
+            self.run_once()
+            if self._stop.wait(self._interval):
+                break
+
+    def start(self) -> None:
+        """啟動背景封存執行緒（TASK_ARCHIVE_AFTER_DAYS=0 時不啟動）"""
+        if self._thread is not None or self._after_days <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="task-archiver", daemon=True)
+        self._thread.start()
+        logger.info("Task archiver started: after %s days, every %ss", self._after_days, self._interval)
+
+    def stop(self) -> None:
+        """停止背景執行緒，進行中的批次會先完成"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,133 @@
+from typing import Dict, List, Set
+from itertools import groupby
+from sqlalchemy import insert, update, delete
+from sqlalchemy.orm import Session
+import logging
+import models
+import schemas
+from positions import POSITION_GAP, next_position, position_for_index, rebalance_positions
+from tagging import sync_task_tags
+
+logger = logging.getLogger(__name__)
+
+# SQLite 單一語句的參數上限，IN 查詢需分段
+SQLITE_MAX_VARIABLES = 900
+
+
+def _existing_task_ids(db: Session, ids: List[int]) -> Set[int]:
+    """查詢仍存在的任務 id"""
+    found = set()
+    unique_ids = list(set(ids))
+    for start in range(0, len(unique_ids), SQLITE_MAX_VARIABLES):
+        chunk = unique_ids[start:start + SQLITE_MAX_VARIABLES]
+        found.update(row.id for row in db.query(models.Task.id).filter(models.Task.id.in_(chunk)))
+    return found
+
+
+def bulk_insert_ids(db: Session, model, rows: List[dict]) -> List[int]:
+    """
+    批次插入並依參數順序返回新 id。
+    使用 Core 資料表而非 ORM 批次插入：ORM 會依各列的 None 欄位分組，
+    每組結果再合併進累積結果，欄位不一致的資料列會使耗時隨筆數平方成長。
+    """
+    table = model.__table__
+    return db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars().all()
+
+
+def _not_found(index: int, op) -> schemas.TaskBatchResult:
+    return schemas.TaskBatchResult(index=index, op=op.op, status="error", id=op.id, error="Task not found")
+
+
+def _apply_creates(db: Session, items) -> List[schemas.TaskBatchResult]:
+    """以 executemany 一次插入多筆任務"""
+    position = next_position(db)
+    rows = []
+    for offset, (_, op) in enumerate(items):
+        row = op.data.dict()
+        row["position"] = position + offset * POSITION_GAP
+        rows.append(row)
+    ids = bulk_insert_ids(db, models.Task, rows)
+    sync_task_tags(db, {task_id: row["tags"] for task_id, row in zip(ids, rows) if row.get("tags")})
+    return [
+        schemas.TaskBatchResult(index=index, op=op.op, status="ok", id=task_id)
+        for (index, op), task_id in zip(items, ids)
+    ]
+
+
+def _apply_updates(db: Session, items) -> List[schemas.TaskBatchResult]:
+    """以主鍵批次更新任務"""
+    existing = _existing_task_ids(db, [op.id for _, op in items])
+    results = []
+    mappings = []
+    for index, op in items:
+        if op.id not in existing:
+            results.append(_not_found(index, op))
+            continue
+        values = op.data.dict(exclude_unset=True)
+        if values:
+            mappings.append({"id": op.id, **values})
+        results.append(schemas.TaskBatchResult(index=index, op=op.op, status="ok", id=op.id))
+    if mappings:
+        db.execute(update(models.Task), mappings)
+        sync_task_tags(db, {values["id"]: values["tags"] for values in mappings if "tags" in values})
+    return results
+
+
+def _apply_deletes(db: Session, items) -> List[schemas.TaskBatchResult]:
+    """以 IN 條件批次刪除任務"""
+    ids = [op.id for _, op in items]
+    existing = _existing_task_ids(db, ids)
+    deletable = list(existing)
+    for start in range(0, len(deletable), SQLITE_MAX_VARIABLES):
+        chunk = deletable[start:start + SQLITE_MAX_VARIABLES]
+        db.execute(
+            delete(models.Task).where(models.Task.id.in_(chunk)).execution_options(synchronize_session=False)
+        )
+    results = []
+    deleted: Set[int] = set()
+    for index, op in items:
+        if op.id in existing and op.id not in deleted:
+            deleted.add(op.id)
+            results.append(schemas.TaskBatchResult(index=index, op=op.op, status="ok", id=op.id))
+        else:
+            results.append(_not_found(index, op))
+    return results
+
+
+def _apply_reorders(db: Session, items) -> List[schemas.TaskBatchResult]:
+    """依序移動任務，每次只改寫被移動的任務"""
+    existing = _existing_task_ids(db, [op.id for _, op in items])
+    results = []
+    for index, op in items:
+        if op.id not in existing:
+            results.append(_not_found(index, op))
+            continue
+        position = position_for_index(db, op.id, op.new_position)
+        if position is None:
+            rebalance_positions(db)
+            position = position_for_index(db, op.id, op.new_position)
+        db.execute(update(models.Task).where(models.Task.id == op.id).values(position=position))
+        results.append(schemas.TaskBatchResult(index=index, op=op.op, status="ok", id=op.id))
+    return results
+
+
+_HANDLERS = {
+    "create": _apply_creates,
+    "update": _apply_updates,
+    "delete": _apply_deletes,
+    "reorder": _apply_reorders,
+}
+
+
+def apply_task_batch(db: Session, operations: List[schemas.TaskBatchOperation]) -> List[schemas.TaskBatchResult]:
+    """
+    在同一個交易中套用批次操作（不負責 commit）。
+    連續的同類操作會合併成一次批次語句，不同類操作之間維持請求順序。
+    """
+    results: Dict[int, schemas.TaskBatchResult] = {}
+    for op_type, group in groupby(enumerate(operations), key=lambda item: item[1].op):
+        items = list(group)
+        for result in _HANDLERS[op_type](db, items):
+            results[result.index] = result
+    logger.info("Applied batch of %d task operations", len(operations))
+    return [results[index] for index in range(len(operations))]
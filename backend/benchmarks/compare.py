@@ -0,0 +1,95 @@
+"""
+比較兩份 suite.py 的結果，列出各情境 p50/p95/p99 與吞吐量的變化。
+
+延遲上升或吞吐量下降超過 --threshold（百分比）的情境視為退步，有退步時以狀態碼 1 結束，
+可用於 CI 或提交前檢查。
+
+用法：
+    cd backend
+    python benchmarks/compare.py baseline.json current.json
+    python benchmarks/compare.py baseline.json current.json --threshold 15 --metric p95_ms --operations
+"""
+import argparse
+import json
+import sys
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def compare_entry(before: dict, after: dict, metric: str, threshold: float) -> tuple:
+    """返回 (輸出欄位, 是否退步)"""
+    columns = []
+    for name in LATENCY_METRICS:
+        columns.append(f"{after[name]:>9.2f} ({_change(before[name], after[name]):+6.1f}%)")
+    regressed = _change(before[metric], after[metric]) > threshold
+    if "throughput_rps" in before and "throughput_rps" in after:
+        change = _change(before["throughput_rps"], after["throughput_rps"])
+        columns.append(f"{after['throughput_rps']:>9.1f} ({change:+6.1f}%)")
+        regressed = regressed or change < -threshold
+    if after.get("errors", 0) > before.get("errors", 0):
+        columns.append(f"errors {before.get('errors', 0)} -> {after['errors']}")
+        regressed = True
+    return columns, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="視為退步的變化百分比")
+    parser.add_argument("--metric", choices=LATENCY_METRICS, default="p95_ms", help="判斷延遲退步所用的百分位數")
+    parser.add_argument("--operations", action="store_true", help="一併列出情境內各操作")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    for label, report in (("baseline", baseline), ("current", current)):
+        env = report.get("environment", {})
+        print(f"{label:<9} commit {env.get('commit')}{' (dirty)' if env.get('dirty') else ''}  "
+              f"dataset {report['dataset']['tasks']} tasks / {report['dataset']['articles']} articles  "
+              f"concurrency {report['config']['concurrency']}")
+    if baseline["dataset"] != current["dataset"] or baseline["config"] != current["config"]:
+        print("warning: dataset or config differ, results are not directly comparable")
+
+    regressions = []
+    header = f"{'scenario':<40} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18} {'req/s':>18}"
+    for mode, scenarios in current["results"].items():
+        before_mode = baseline["results"].get(mode)
+        if before_mode is None:
+            continue
+        print(f"\n[{mode}]")
+        print(header)
+        for name, after in scenarios.items():
+            before = before_mode.get(name)
+            if before is None:
+                continue
+            columns, regressed = compare_entry(before, after, args.metric, args.threshold)
+            marker = " !" if regressed else ""
+            print(f"{name:<40} " + " ".join(columns) + marker)
+            if regressed:
+                regressions.append(f"{mode}/{name}")
+            if args.operations:
+                for op, op_after in after.get("operations", {}).items():
+                    op_before = before.get("operations", {}).get(op)
+                    if op_before is None:
+                        continue
+                    op_columns, _ = compare_entry(op_before, op_after, args.metric, args.threshold)
+                    print(f"  {op:<38} " + " ".join(op_columns))
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
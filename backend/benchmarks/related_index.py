@@ -0,0 +1,139 @@
+"""
+相關文章索引基準測試：以 seed.py 的文章產生器建立指定篇數的 TF-IDF 索引（不經過數據庫），
+報告建立時間、各部分記憶體用量、查詢延遲與增量更新延遲。
+
+seed.py 的文章由固定的句型組成、詞彙很少；--extra-chars 在每篇文章後加上依 Zipf 分布
+抽出的常用字，讓詞彙數與詞頻分布接近真實的中文文章。
+
+用法：
+    cd backend
+    pip install -r requirements.txt
+    python benchmarks/related_index.py --articles 100000
+    python benchmarks/related_index.py --articles 100000 --json > related_index.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="related-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmpdir, 'app.db')}")
+
+from related import RelatedIndex, document_terms, related_available  # noqa: E402
+from benchmarks.seed import article_rows  # noqa: E402
+
+# 2000 個漢字，第 n 個字的出現機率與 1/n 成正比
+CHAR_POOL = [chr(code) for code in range(0x4E00, 0x4E00 + 2000)]
+CHAR_WEIGHTS = list(itertools.accumulate(1.0 / rank for rank in range(1, len(CHAR_POOL) + 1)))
+
+
+def documents(count: int, extra_chars: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for article_id, row in enumerate(article_rows(rng, count, now), start=1):
+        extra = "".join(rng.choices(CHAR_POOL, cum_weights=CHAR_WEIGHTS, k=extra_chars))
+        yield article_id, row["title"], row["summary"], row["content"] + extra
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timings(values) -> dict:
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--extra-chars", type=int, default=80, help="每篇文章附加的隨機字數")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5, help="每次查詢的相關文章數")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="以 JSON 輸出")
+    args = parser.parse_args()
+
+    if not related_available:
+        parser.error("numpy and scipy are required (pip install -r requirements.txt)")
+
+    index = RelatedIndex(session_factory=None)
+    started = time.perf_counter()
+    index.build_from(documents(args.articles, args.extra_chars, args.seed))
+    build_seconds = time.perf_counter() - started
+    build_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memory = index.memory_usage()
+    stats = index.stats()
+
+    rng = random.Random(args.seed + 1)
+    query_times = []
+    for _ in range(args.queries):
+        article_id = rng.randint(1, args.articles)
+        started = time.perf_counter()
+        index.related(article_id, args.limit)
+        query_times.append(time.perf_counter() - started)
+
+    # 增量更新：以新的內容取代既有文章（進入增量區），再測量查詢
+    replacements = list(documents(args.updates, args.extra_chars, args.seed + 2))
+    update_times = []
+    for (_, title, summary, content) in replacements:
+        article_id = rng.randint(1, args.articles)
+        started = time.perf_counter()
+        with index._lock:
+            index._add_locked(article_id, document_terms(title, summary, content))
+        update_times.append(time.perf_counter() - started)
+    delta_query_times = []
+    for _ in range(args.queries):
+        article_id = rng.randint(1, args.articles)
+        started = time.perf_counter()
+        index.related(article_id, args.limit)
+        delta_query_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    index.merge()
+    merge_seconds = time.perf_counter() - started
+
+    report = {
+        "articles": stats["articles"],
+        "terms": stats["terms"],
+        "nonzeros": int(index._matrix.nnz),
+        "build_seconds": round(build_seconds, 2),
+        "memory_mb": {part: round(size / 2 ** 20, 2) for part, size in memory.items()},
+        "memory_total_mb": round(sum(memory.values()) / 2 ** 20, 1),
+        "build_max_rss_mb": round(build_rss / 1024, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "query": timings(query_times),
+        "update": timings(update_times),
+        "query_with_delta": timings(delta_query_times),
+        "merge_seconds": round(merge_seconds, 2),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"articles {report['articles']}  terms {report['terms']}  nonzeros {report['nonzeros']}")
+    print(f"build {report['build_seconds']}s, merge {report['merge_seconds']}s")
+    print("memory " + ", ".join(f"{part} {size} MB" for part, size in report["memory_mb"].items())
+          + f"; total {report['memory_total_mb']} MB")
+    print(f"process max RSS {report['build_max_rss_mb']} MB after build, {report['max_rss_mb']} MB after merge")
+    for name in ("query", "update", "query_with_delta"):
+        result = report[name]
+        print(f"{name:<17} p50 {result['p50_ms']:>8.3f} ms  p95 {result['p95_ms']:>8.3f} ms  "
+              f"p99 {result['p99_ms']:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,166 @@
+"""
+以可重現的假資料填入數據庫：任務與含中文內容的文章。
+
+直接以批次 INSERT 寫入（觸發器照常維護搜尋索引、統計與變更紀錄），
+並同步標籤關聯，結果與經由 API 建立的資料相同。
+
+用法：
+    cd backend
+    python benchmarks/seed.py --size medium                 # 寫入 DATABASE_URL（預設 todo.db）
+    python benchmarks/seed.py --tasks 5000 --articles 300 --database /tmp/bench.db
+
+規模預設值：small=1k、medium=100k、large=1M 任務，文章數為任務數的 1/20（至少 50 篇）。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SIZES = {"small": 1_000, "medium": 100_000, "large": 1_000_000}
+BATCH_SIZE = 5_000
+POSITION_GAP = 1024
+
+VERBS = ["整理", "更新", "確認", "撰寫", "檢查", "規劃", "安排", "回覆", "準備", "修正", "審核", "研究"]
+OBJECTS = [
+    "季度報告", "會議記錄", "專案時程", "客戶需求", "預算表", "產品規格", "測試案例", "行銷企劃",
+    "年度目標", "供應商合約", "使用者回饋", "部署流程", "設計稿", "讀書筆記", "旅行行程", "健身計畫",
+]
+DETAILS = [
+    "並寄給團隊成員", "並更新共用文件", "在週五前完成", "與主管討論細節", "附上相關數據",
+    "確認截止日期", "整理成簡報", "列出待解決問題", "",
+]
+TAGS = ["工作", "生活", "學習", "重要", "緊急", "家庭", "健康", "財務", "閱讀", "旅行", "專案", "會議"]
+CATEGORIES = ["效率", "生活", "技術", "學習", "健康", "理財"]
+TOPICS = ["時間管理", "專注力", "番茄工作法", "習慣養成", "遠端工作", "目標設定", "筆記方法", "睡眠品質",
+          "閱讀計畫", "個人理財", "程式設計", "團隊溝通", "壓力調適", "運動習慣"]
+SENTENCES = [
+    "許多人在忙碌的生活中忽略了{topic}的重要性。",
+    "研究顯示，良好的{topic}能讓工作效率提升三成以上。",
+    "開始之前，先寫下你對{topic}最在意的三件事。",
+    "不必追求完美，每天進步一點點就足夠了。",
+    "把大目標拆成小步驟，完成時記得給自己一點獎勵。",
+    "若遇到瓶頸，不妨暫停片刻，換個角度重新思考。",
+    "記錄每天的實際情況，一週後回頭檢視會有新的發現。",
+    "與朋友分享你的計畫，能幫助你持續下去。",
+    "{topic}沒有標準答案，找到適合自己的節奏最重要。",
+    "在台北的通勤時間，也可以用來練習{topic}。",
+]
+
+
+def _tags(rng: random.Random) -> str:
+    count = rng.choice([0, 0, 1, 1, 2, 3])
+    return ",".join(rng.sample(TAGS, count)) if count else None
+
+
+def task_rows(rng: random.Random, start: int, count: int, now: datetime):
+    for i in range(start, start + count):
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        status = rng.choices(["TODO", "IN_PROGRESS", "DONE"], weights=[5, 2, 3])[0]
+        yield {
+            "title": f"{rng.choice(VERBS)}{rng.choice(OBJECTS)}{rng.choice(DETAILS)}",
+            "description": rng.choice(SENTENCES).format(topic=rng.choice(TOPICS)) if rng.random() < 0.6 else None,
+            "priority": rng.choice([1, 2, 2, 3]),
+            "status": status,
+            "due_date": created + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.7 else None,
+            "position": (i + 1) * POSITION_GAP,
+            "tags": _tags(rng),
+            "created_at": created,
+            "updated_at": created + timedelta(hours=rng.randint(0, 72)) if status != "TODO" else created,
+        }
+
+
+def article_rows(rng: random.Random, count: int, now: datetime):
+    for _ in range(count):
+        topic = rng.choice(TOPICS)
+        paragraphs = []
+        for _ in range(rng.randint(3, 8)):
+            paragraphs.append("".join(
+                rng.choice(SENTENCES).format(topic=topic) for _ in range(rng.randint(4, 10))
+            ))
+        content = "\n\n".join(paragraphs)[:10000]
+        created = now - timedelta(hours=rng.randint(0, 24 * 365))
+        yield {
+            "title": f"{topic}：{rng.choice(['入門指南', '實用技巧', '常見誤區', '我的經驗', '七個建議'])}",
+            "content": content,
+            "summary": content[:120],
+            "category": rng.choice(CATEGORIES),
+            "tags": _tags(rng),
+            "views": int(rng.paretovariate(1.5) * 10),
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _insert(db, model, rows, kind):
+    from batch import bulk_insert_ids
+    from tagging import sync_tags
+
+    ids = bulk_insert_ids(db, model, rows)
+    sync_tags(db, kind, {owner_id: row["tags"] for owner_id, row in zip(ids, rows) if row["tags"]})
+
+
+def seed(session_factory, tasks: int, articles: int, seed: int = 42, log=print) -> dict:
+    """寫入指定數量的任務與文章，返回耗時（models 需在設定 DATABASE_URL 後才載入）"""
+    import models
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    started = time.perf_counter()
+    with session_factory() as db:
+        for start in range(0, tasks, BATCH_SIZE):
+            _insert(db, models.Task, list(task_rows(rng, start, min(BATCH_SIZE, tasks - start), now)), "task")
+            db.commit()
+            log(f"tasks: {min(start + BATCH_SIZE, tasks)}/{tasks}")
+        for start in range(0, articles, BATCH_SIZE):
+            _insert(db, models.Article, list(article_rows(rng, min(BATCH_SIZE, articles - start), now)), "article")
+            db.commit()
+        log(f"articles: {articles}")
+        db.execute(text("ANALYZE"))
+        db.commit()
+    return {"tasks": tasks, "articles": articles, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def counts(session_factory) -> dict:
+    with session_factory() as db:
+        return {
+            "tasks": db.execute(text("SELECT count(*) FROM tasks")).scalar(),
+            "articles": db.execute(text("SELECT count(*) FROM articles")).scalar(),
+        }
+
+
+def resolve_counts(size: str, tasks: int = None, articles: int = None) -> tuple:
+    tasks = tasks if tasks is not None else SIZES[size]
+    articles = articles if articles is not None else max(50, tasks // 20)
+    return tasks, articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--tasks", type=int, help="覆蓋規模預設的任務數")
+    parser.add_argument("--articles", type=int, help="覆蓋規模預設的文章數")
+    parser.add_argument("--database", help="SQLite 檔案路徑（預設使用 DATABASE_URL 或 todo.db）")
+    parser.add_argument("--seed", type=int, default=42, help="亂數種子，相同種子產生相同資料")
+    args = parser.parse_args()
+
+    if args.database:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.database)}"
+    from database import SessionLocal, init_db
+    init_db()  # 建立資料表、觸發器與索引
+
+    tasks, articles = resolve_counts(args.size, args.tasks, args.articles)
+    existing = counts(SessionLocal)
+    if existing["tasks"] or existing["articles"]:
+        print(f"Database already has {existing['tasks']} tasks and {existing['articles']} articles, skipping")
+        return
+    result = seed(SessionLocal, tasks, articles, args.seed)
+    print(f"Seeded {result['tasks']} tasks and {result['articles']} articles in {result['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+任務列表序列化基準測試：比較預設路徑（ORM + TZDateTime + Pydantic）與 fast=true 路徑
+（tuple + 固定時差 + orjson）。
+
+用法：
+    cd backend
+    pip install -r requirements-dev.txt
+    python benchmarks/serialization.py --rows 10000 --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="serialization-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+
+
+def seed(client: TestClient, rows: int) -> None:
+    for start in range(0, rows, 5000):
+        operations = [
+            {
+                "op": "create",
+                "data": {
+                    "title": f"整理第 {i} 份報告",
+                    "description": "確認數據來源並更新圖表" if i % 2 else None,
+                    "priority": 1 + i % 3,
+                    "status": ["TODO", "IN_PROGRESS", "DONE"][i % 3],
+                    "due_date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T09:30:00",
+                    "tags": "工作,報告",
+                },
+            }
+            for i in range(start, min(start + 5000, rows))
+        ]
+        assert client.post("/tasks/batch", json={"operations": operations}).status_code == 200
+
+
+def measure(client: TestClient, params: dict, repeat: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/tasks", params=params)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        size = len(response.content)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+        "bytes": size,
+    }
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    client = TestClient(main.app)
+    seed(client, args.rows)
+    # 預熱
+    client.get("/tasks", params={"all": True})
+    client.get("/tasks", params={"all": True, "fast": True})
+
+    default = measure(client, {"all": True}, args.repeat)
+    fast = measure(client, {"all": True, "fast": True}, args.repeat)
+    result = {
+        "rows": args.rows,
+        "default": default,
+        "fast": fast,
+        "speedup": round(default["median_ms"] / fast["median_ms"], 2),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"rows={args.rows}")
+        print(f"default: median {default['median_ms']} ms, {default['bytes']} bytes")
+        print(f"fast:    median {fast['median_ms']} ms, {fast['bytes']} bytes")
+        print(f"speedup: {result['speedup']}x")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,137 @@
+"""
+SQLite 讀寫並發基準測試：比較預設設定（rollback journal）與效能設定（WAL 等 PRAGMA）。
+
+每個設定檔使用獨立的臨時數據庫，同時執行讀取執行緒（看板列表查詢）與寫入執行緒
+（新增任務並 commit），統計吞吐量、延遲百分位數與鎖定錯誤次數。
+
+用法：
+    cd backend
+    python benchmarks/sqlite_concurrency.py --seconds 5 --readers 8 --writers 2
+    python benchmarks/sqlite_concurrency.py --json > sqlite_concurrency.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmpdir = tempfile.mkdtemp(prefix="sqlite-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmpdir, 'app.db')}")
+
+from sqlalchemy import text  # noqa: E402
+from database import create_db_engine  # noqa: E402
+import models  # noqa: E402
+
+LIST_QUERY = text("SELECT id, title, status, position FROM tasks ORDER BY position, id LIMIT 50")
+INSERT_QUERY = text(
+    "INSERT INTO tasks (title, priority, status, position, created_at, updated_at) "
+    "VALUES (:title, 2, 'TODO', :position, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_profile(profile: str, seconds: float, readers: int, writers: int, seed_rows: int) -> dict:
+    path = os.path.join(_tmpdir, f"{profile}.db")
+    engine = create_db_engine(f"sqlite:///{path}", profile=profile)
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(INSERT_QUERY, [{"title": f"任務 {i}", "position": i * 1024} for i in range(seed_rows)])
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"read": [], "write": [], "errors": 0}
+
+    def reader():
+        latencies = []
+        errors = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(LIST_QUERY).fetchall()
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+        with lock:
+            stats["read"].extend(latencies)
+            stats["errors"] += errors
+
+    def writer(worker: int):
+        latencies = []
+        errors = 0
+        n = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(INSERT_QUERY, {"title": f"w{worker}-{n}", "position": (seed_rows + n) * 1024})
+                latencies.append(time.perf_counter() - start)
+                n += 1
+            except Exception:
+                errors += 1
+        with lock:
+            stats["write"].extend(latencies)
+            stats["errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    result = {"profile": profile, "errors": stats["errors"]}
+    for kind in ("read", "write"):
+        latencies = stats[kind]
+        result[kind] = {
+            "ops": len(latencies),
+            "ops_per_sec": round(len(latencies) / seconds, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--json", action="store_true", help="輸出 JSON 方便比較")
+    args = parser.parse_args()
+
+    results = [
+        run_profile(profile, args.seconds, args.readers, args.writers, args.seed_rows)
+        for profile in ("default", "performance")
+    ]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    print(f"{'profile':<12} {'kind':<6} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        for kind in ("read", "write"):
+            row = result[kind]
+            print(f"{result['profile']:<12} {kind:<6} {row['ops_per_sec']:>10} "
+                  f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}")
+        print(f"{result['profile']:<12} errors {result['errors']:>10}")
+
+
+if __name__ == "__main__":
+    main()
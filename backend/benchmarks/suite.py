@@ -0,0 +1,557 @@
+"""
+後端負載與端點基準測試套件。
+
+以 seed.py 產生固定規模的資料集（同一組參數只產生一次並重複使用），每種模式
+從同一份資料集的副本開始，以多個並發客戶端執行下列情境，輸出各情境與各操作的
+p50/p95/p99 延遲與吞吐量：
+
+- endpoint:<操作>：逐一測試 main.py 的每個端點（/events 為長連線，不列入）
+- read_heavy：看板列表、文章閱讀、搜尋與統計
+- board_reorders：並發拖曳排序，同時讀取看板
+- article_views：熱門文章的大量瀏覽與偶發編輯
+- write_heavy：新增、更新、刪除與批次操作
+- mixed：所有操作混合
+
+模式：
+- inprocess：以 httpx 的 ASGI transport 直接呼叫應用，不經過網路
+- uvicorn：先執行部署時的 `alembic upgrade head`，再啟動本機 uvicorn 子行程，經由 HTTP 連線測試；
+  --workers 可列出多個 worker 數（例如 1,2,4,8），每個 worker 數各使用一份資料集副本，
+  結果鍵為 uvicorn（1 個 worker）或 uvicorn-w<N>
+
+用法：
+    cd backend
+    pip install -r requirements-dev.txt
+    python benchmarks/suite.py --size small --output baseline.json
+    python benchmarks/suite.py --size medium --modes uvicorn --concurrency 32 --scenarios read_heavy,mixed
+    python benchmarks/suite.py --modes uvicorn --workers 1,2,4,8 --concurrency 32 --scenarios read_heavy,write_heavy
+    python benchmarks/compare.py baseline.json current.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from seed import SIZES, SENTENCES, TAGS, TOPICS, resolve_counts  # noqa: E402
+from pagination import encode_cursor  # noqa: E402
+
+SCHEMA_VERSION = 1
+POSITION_GAP = 1024
+
+
+class WorkerState:
+    """單一客戶端的狀態：亂數來源、自己建立的資料與最近的 ETag"""
+
+    def __init__(self, rng: random.Random, tasks: int, articles: int):
+        self.rng = rng
+        self.tasks = tasks
+        self.articles = articles
+        self.own_tasks = []
+        self.own_articles = []
+        self.etag = None
+        # 計時起點；需要前置請求的操作會在送出受測請求前重設
+        self.started = 0.0
+
+    def task_id(self) -> int:
+        return self.rng.randint(1, self.tasks)
+
+    def hot_article_id(self) -> int:
+        # 長尾分布：少數熱門文章佔多數瀏覽
+        return min(self.articles, int(self.rng.paretovariate(1.2)))
+
+
+def _task_payload(state: WorkerState) -> dict:
+    rng = state.rng
+    return {
+        "title": f"基準測試任務 {rng.randint(1, 10 ** 6)}",
+        "description": rng.choice(SENTENCES).format(topic=rng.choice(TOPICS)),
+        "priority": rng.randint(1, 3),
+        "tags": ",".join(rng.sample(TAGS, 2)),
+    }
+
+
+def _article_payload(state: WorkerState) -> dict:
+    rng = state.rng
+    topic = rng.choice(TOPICS)
+    return {
+        "title": f"{topic}的基準測試文章",
+        "content": "".join(rng.choice(SENTENCES).format(topic=topic) for _ in range(30)),
+        "category": "效率",
+        "tags": rng.choice(TAGS),
+    }
+
+
+# 每個操作送出一個受測請求並返回回應
+async def op_root(client, state):
+    return await client.get("/")
+
+
+async def op_health(client, state):
+    return await client.get("/health")
+
+
+async def op_metrics(client, state):
+    return await client.get("/metrics")
+
+
+async def op_list_tasks(client, state):
+    return await client.get("/tasks", params={"limit": 50})
+
+
+async def op_list_tasks_page(client, state):
+    cursor = encode_cursor(state.task_id() * POSITION_GAP, 0)
+    return await client.get("/tasks", params={"limit": 50, "cursor": cursor})
+
+
+async def op_list_tasks_filtered(client, state):
+    return await client.get("/tasks", params={"status": "TODO", "priority": state.rng.randint(1, 3), "limit": 50})
+
+
+async def op_list_tasks_by_tag(client, state):
+    return await client.get("/tasks", params={"tags": state.rng.choice(TAGS), "limit": 50})
+
+
+async def op_list_tasks_fast(client, state):
+    return await client.get("/tasks", params={"limit": 200, "fast": True})
+
+
+async def op_list_tasks_conditional(client, state):
+    headers = {"If-None-Match": state.etag} if state.etag else {}
+    response = await client.get("/tasks", params={"limit": 50}, headers=headers)
+    state.etag = response.headers.get("etag", state.etag)
+    return response
+
+
+async def op_task_changes(client, state):
+    return await client.get("/tasks/changes", params={"since": max(0, state.tasks - 500), "limit": 500})
+
+
+async def op_due_tasks(client, state):
+    return await client.get("/tasks/due", params={"within": state.rng.choice([60, 1440, 10080])})
+
+
+async def op_list_archive(client, state):
+    return await client.get("/tasks/archive", params={"limit": 50})
+
+
+async def op_tags(client, state):
+    return await client.get("/tags", params={"type": state.rng.choice(["task", "article"])})
+
+
+async def op_analytics(client, state):
+    return await client.get("/analytics", params={"days": 30})
+
+
+async def op_search(client, state):
+    return await client.get("/search", params={"q": state.rng.choice(TOPICS), "limit": 20})
+
+
+async def op_list_articles(client, state):
+    return await client.get("/articles", params={"skip": state.rng.randint(0, max(0, state.articles - 10)), "limit": 10})
+
+
+async def op_list_articles_compact(client, state):
+    return await client.get("/articles", params={"limit": 50, "view": "list"})
+
+
+async def op_get_article(client, state):
+    return await client.get(f"/articles/{state.hot_article_id()}")
+
+
+async def op_related_articles(client, state):
+    return await client.get(f"/articles/{state.hot_article_id()}/related")
+
+
+async def op_export_articles(client, state):
+    return await client.get("/export", params={"type": "article"})
+
+
+async def op_create_task(client, state):
+    response = await client.post("/tasks", json=_task_payload(state))
+    if response.status_code == 200:
+        state.own_tasks.append(response.json()["id"])
+    return response
+
+
+async def op_update_task(client, state):
+    fields = state.rng.choice([
+        {"status": state.rng.choice(["TODO", "IN_PROGRESS", "DONE"])},
+        {"priority": state.rng.randint(1, 3)},
+        {"tags": ",".join(state.rng.sample(TAGS, 2))},
+    ])
+    return await client.put(f"/tasks/{state.task_id()}", json=fields)
+
+
+async def op_reorder_task(client, state):
+    # 集中在看板前段，模擬多人同時拖曳同一欄
+    return await client.put(f"/tasks/{state.task_id()}/reorder", params={"new_position": state.rng.randint(0, 100)})
+
+
+async def op_delete_task(client, state):
+    if not state.own_tasks:
+        await op_create_task(client, state)
+        state.started = time.perf_counter()
+    return await client.delete(f"/tasks/{state.own_tasks.pop()}")
+
+
+async def op_batch_tasks(client, state):
+    operations = [{"op": "create", "data": _task_payload(state)} for _ in range(25)]
+    operations += [{"op": "update", "id": state.task_id(), "data": {"priority": 3}} for _ in range(25)]
+    return await client.post("/tasks/batch", json={"operations": operations})
+
+
+async def op_import_tasks(client, state):
+    body = "".join(json.dumps(_task_payload(state), ensure_ascii=False) + "\n" for _ in range(100))
+    return await client.post("/import", params={"type": "task"}, content=body.encode())
+
+
+async def op_create_article(client, state):
+    response = await client.post("/articles", json=_article_payload(state))
+    if response.status_code == 200:
+        state.own_articles.append(response.json()["id"])
+    return response
+
+
+async def op_update_article(client, state):
+    return await client.put(f"/articles/{state.hot_article_id()}", json={"summary": state.rng.choice(SENTENCES).format(topic="閱讀")})
+
+
+async def op_delete_article(client, state):
+    if not state.own_articles:
+        await op_create_article(client, state)
+        state.started = time.perf_counter()
+    return await client.delete(f"/articles/{state.own_articles.pop()}")
+
+
+OPERATIONS = {
+    name[3:]: func for name, func in list(globals().items()) if name.startswith("op_") and callable(func)
+}
+
+# 單一端點情境每次請求量較大的操作（匯出、匯入、批次）降低請求數
+HEAVY_OPERATIONS = {"export_articles", "import_tasks", "batch_tasks"}
+
+MIXED_SCENARIOS = {
+    "read_heavy": {
+        "list_tasks": 30, "list_tasks_conditional": 10, "get_article": 30, "list_articles": 10,
+        "search": 10, "tags": 5, "analytics": 5,
+    },
+    "board_reorders": {"reorder_task": 40, "list_tasks": 40, "update_task": 20},
+    "article_views": {"get_article": 60, "related_articles": 10, "list_articles": 20, "update_article": 10},
+    "write_heavy": {"create_task": 40, "update_task": 30, "delete_task": 20, "batch_tasks": 5, "create_article": 5},
+    "mixed": {
+        "list_tasks": 20, "list_tasks_by_tag": 5, "get_article": 20, "list_articles": 5, "search": 5,
+        "tags": 2, "analytics": 3, "create_task": 10, "update_task": 10, "reorder_task": 10,
+        "delete_task": 5, "create_article": 2, "update_article": 2, "delete_article": 1,
+    },
+}
+
+
+def all_scenarios():
+    scenarios = {f"endpoint:{name}": {name: 1} for name in OPERATIONS}
+    scenarios.update(MIXED_SCENARIOS)
+    return scenarios
+
+
+def percentile(values, pct):
+    """最近秩百分位數"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, errors, seconds=None) -> dict:
+    result = {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    if seconds is not None:
+        result["seconds"] = round(seconds, 3)
+        result["throughput_rps"] = round(len(latencies) / seconds, 1) if seconds > 0 else 0.0
+    return result
+
+
+async def run_scenario(client, weights: dict, requests: int, warmup: int, concurrency: int,
+                       seed: int, tasks: int, articles: int) -> dict:
+    """以 concurrency 個客戶端共送出 requests 個請求，返回延遲統計"""
+    names = list(weights)
+    cumulative = list(weights.values())
+    per_op = {name: {"latencies": [], "errors": 0} for name in names}
+    remaining = {"warmup": warmup, "measured": requests}
+    errors_sample = []
+
+    async def worker(index: int):
+        state = WorkerState(random.Random(seed * 1000 + index), tasks, articles)
+        while True:
+            if remaining["warmup"] > 0:
+                remaining["warmup"] -= 1
+                measured = False
+            elif remaining["measured"] > 0:
+                remaining["measured"] -= 1
+                measured = True
+            else:
+                return
+            name = state.rng.choices(names, weights=cumulative)[0]
+            state.started = time.perf_counter()
+            response = await OPERATIONS[name](client, state)
+            elapsed = time.perf_counter() - state.started
+            if not measured:
+                continue
+            stats = per_op[name]
+            stats["latencies"].append(elapsed)
+            if response.status_code >= 400:
+                stats["errors"] += 1
+                if len(errors_sample) < 5:
+                    errors_sample.append(f"{name}: {response.status_code} {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    seconds = time.perf_counter() - started
+
+    latencies = [value for stats in per_op.values() for value in stats["latencies"]]
+    result = summarize(latencies, sum(stats["errors"] for stats in per_op.values()), seconds)
+    result["operations"] = {
+        name: summarize(stats["latencies"], stats["errors"])
+        for name, stats in per_op.items() if stats["latencies"]
+    }
+    if errors_sample:
+        result["error_samples"] = errors_sample
+    return result
+
+
+async def run_suite(client, scenarios: dict, args, tasks: int, articles: int, log) -> dict:
+    results = {}
+    for index, (name, weights) in enumerate(scenarios.items()):
+        requests = args.requests
+        if name.startswith("endpoint:") and name.split(":", 1)[1] in HEAVY_OPERATIONS:
+            requests = max(args.concurrency, requests // 20)
+        result = await run_scenario(
+            client, weights, requests, args.warmup, args.concurrency,
+            args.seed + index, tasks, articles
+        )
+        results[name] = result
+        log(f"  {name:<34} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+            f"p99 {result['p99_ms']:>9.2f} ms  {result['throughput_rps']:>8.1f} req/s  errors {result['errors']}")
+    return results
+
+
+def prepare_dataset(args, tasks: int, articles: int, log) -> str:
+    """產生（或重複使用）資料集範本，返回範本路徑"""
+    os.makedirs(args.data_dir, exist_ok=True)
+    template = os.path.join(args.data_dir, f"bench-{tasks}-{articles}-{args.seed}.db")
+    if os.path.exists(template) and not args.reseed:
+        log(f"Reusing dataset {template}")
+        return template
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(template + suffix):
+            os.remove(template + suffix)
+    log(f"Seeding {tasks} tasks and {articles} articles into {template}")
+    subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, "seed.py"), "--database", template,
+         "--tasks", str(tasks), "--articles", str(articles), "--seed", str(args.seed)],
+        cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return template
+
+
+# 兩種模式共用的伺服器設定：停用背景封存，避免測試期間把資料集中的舊任務移出看板
+SERVER_ENV = {"TASK_ARCHIVE_AFTER_DAYS": "0"}
+
+
+def copy_dataset(template: str, workdir: str, name: str) -> str:
+    path = os.path.join(workdir, f"{name}.db")
+    shutil.copyfile(template, path)
+    return path
+
+
+async def run_inprocess(db_path: str, scenarios: dict, args, tasks: int, articles: int, log) -> dict:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.update(SERVER_ENV)
+    import main
+    import logging_config
+
+    # 日誌照常格式化（與 uvicorn 模式相同的成本），但不輸出到終端機
+    logging_config.set_stream(open(os.devnull, "w"))
+
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            return await run_suite(client, scenarios, args, tasks, articles, log)
+    finally:
+        await main.app.router.shutdown()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(db_path: str, scenarios: dict, args, tasks: int, articles: int, log, workers: int = 1) -> dict:
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", WEB_CONCURRENCY=str(workers), **SERVER_ENV)
+    env.pop("ASYNC_DATABASE_URL", None)
+    # 與部署相同：結構設定由一次性的遷移步驟完成，worker 啟動時不執行 DDL
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--no-access-log", "--workers", str(workers)]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            deadline = time.monotonic() + 120
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become healthy within 120s")
+                await asyncio.sleep(0.2)
+            return await run_suite(client, scenarios, args, tasks, articles, log)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def environment() -> dict:
+    def git(*command):
+        try:
+            return subprocess.run(["git", *command], cwd=BACKEND_DIR, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import sqlalchemy
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def main_suite():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="small=1k、medium=100k、large=1M 任務")
+    parser.add_argument("--tasks", type=int, help="覆蓋規模預設的任務數")
+    parser.add_argument("--articles", type=int, help="覆蓋規模預設的文章數")
+    parser.add_argument("--modes", default="inprocess,uvicorn", help="inprocess、uvicorn，以逗號分隔")
+    parser.add_argument("--scenarios", help="只執行指定情境（逗號分隔，可用 endpoint:* 代表所有單一端點情境）")
+    parser.add_argument("--concurrency", type=int, default=8, help="並發客戶端數")
+    parser.add_argument("--requests", type=int, default=400, help="每個情境測量的請求數")
+    parser.add_argument("--warmup", type=int, default=20, help="每個情境開始前不計入的請求數")
+    parser.add_argument("--workers", default="1", help="uvicorn worker 數，以逗號分隔可依序測試多個（例如 1,2,4,8）")
+    parser.add_argument("--seed", type=int, default=42, help="資料集與請求序列的亂數種子")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "smart-todo-bench"),
+                        help="資料集範本的存放目錄，相同參數會重複使用")
+    parser.add_argument("--reseed", action="store_true", help="忽略既有範本重新產生資料集")
+    parser.add_argument("--output", help="將結果寫入 JSON 檔案")
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    scenarios = all_scenarios()
+    if args.scenarios:
+        wanted = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+        selected = {}
+        for name in wanted:
+            if name == "endpoint:*":
+                selected.update({key: value for key, value in scenarios.items() if key.startswith("endpoint:")})
+            elif name in scenarios:
+                selected[name] = scenarios[name]
+            else:
+                parser.error(f"unknown scenario: {name}")
+        scenarios = selected
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in ("inprocess", "uvicorn"):
+            parser.error(f"unknown mode: {mode}")
+    try:
+        workers = [int(count) for count in args.workers.split(",") if count.strip()]
+    except ValueError:
+        parser.error(f"invalid --workers: {args.workers}")
+    if not workers or min(workers) < 1:
+        parser.error(f"invalid --workers: {args.workers}")
+
+    tasks, articles = resolve_counts(args.size, args.tasks, args.articles)
+    started = time.perf_counter()
+    template = prepare_dataset(args, tasks, articles, log)
+    workdir = tempfile.mkdtemp(prefix="smart-todo-bench-run-")
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "dataset": {"size": args.size, "tasks": tasks, "articles": articles, "seed": args.seed},
+        "config": {
+            "concurrency": args.concurrency, "requests": args.requests, "warmup": args.warmup,
+            "workers": workers, "modes": modes,
+        },
+        "results": {},
+    }
+    try:
+        # 每種模式使用範本的獨立副本，彼此的寫入不會互相影響
+        for mode in modes:
+            if mode == "inprocess":
+                db_path = copy_dataset(template, workdir, mode)
+                log(f"[{mode}] concurrency={args.concurrency} requests={args.requests}")
+                report["results"][mode] = asyncio.run(run_inprocess(db_path, scenarios, args, tasks, articles, log))
+                continue
+            for count in workers:
+                name = mode if count == 1 else f"{mode}-w{count}"
+                db_path = copy_dataset(template, workdir, name)
+                log(f"[{name}] workers={count} concurrency={args.concurrency} requests={args.requests}")
+                report["results"][name] = asyncio.run(
+                    run_uvicorn(db_path, scenarios, args, tasks, articles, log, workers=count)
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    report["seconds"] = round(time.perf_counter() - started, 1)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        log(f"Results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main_suite()
@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from importlib import import_module
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlencode
+from fastapi import Request, Response
+import logging
+import os
+import threading
+import time
+import orjson
+import metrics
+from fastjson import ORJSONBytesResponse
+
+logger = logging.getLogger(__name__)
+
+# 讀取路由的回應快取：以「路徑 + 排序後的查詢參數」為鍵，保存已序列化的回應 bytes，
+# 命中時不查詢數據庫也不序列化。每筆項目帶有標籤（例如 tasks、articles:42），
+# 寫入路由經由 notify_change 依標籤精確失效，TTL 只是保險。
+#
+# RESPONSE_CACHE_BACKEND：memory（預設，行程內 LRU）、none（停用），
+#   或「模組:類別」載入自訂的 CacheBackend 實作（以無參數建構）
+# RESPONSE_CACHE_TTL：項目存活秒數
+# RESPONSE_CACHE_MAX_ENTRIES / RESPONSE_CACHE_MAX_BYTES：行程內快取的項目數與總大小上限
+#
+# 失效只通知目前行程；多個 worker 時各自維護快取（與 versions.py 的版本號相同），
+# 共用的外部後端需另行處理跨行程的失效。
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# 隨回應一併快取的標頭（ETag 等條件式標頭由路由依目前版本另行設定）
+CACHED_HEADERS = ("x-next-cursor",)
+
+
+class CacheBackend:
+    """快取後端介面；值為 bytes，標籤用於失效"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, tags: Sequence[str], ttl: float) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tag: str) -> int:
+        """移除帶有此標籤的所有項目，返回移除數"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, object]:
+        """entries、bytes 與 evictions（依原因計數）"""
+        return {}
+
+
+class MemoryCache(CacheBackend):
+    """行程內的 LRU 快取，限制項目數與總大小"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # 鍵 -> (值, 到期時間, 標籤)，依最近使用排序
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._evictions = {"capacity": 0, "expired": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        value, _, tags = self._entries.pop(key)
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self._evictions["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, tags: Sequence[str], ttl: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tuple(tags))
+            self._bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions["capacity"] += 1
+
+    def invalidate(self, tag: str) -> int:
+        with self._lock:
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            self._evictions["invalidated"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "evictions": dict(self._evictions)}
+
+
+def load_backend(name: str = RESPONSE_CACHE_BACKEND) -> Optional[CacheBackend]:
+    if name == "none":
+        return None
+    if name == "memory":
+        return MemoryCache()
+    module, _, attribute = name.partition(":")
+    return getattr(import_module(module), attribute)()
+
+
+def _pack(body: bytes, headers: Dict[str, str]) -> bytes:
+    # 標頭（JSON，不含換行）與內容以換行分隔，存成單一 bytes 以支援任何後端
+    return orjson.dumps(headers) + b"\n" + body
+
+
+def _unpack(value: bytes) -> Tuple[bytes, Dict[str, str]]:
+    headers, _, body = value.partition(b"\n")
+    return body, orjson.loads(headers)
+
+
+class CacheLookup:
+    """一次查詢的結果；未命中時以 store 寫回"""
+
+    def __init__(self, cache: "ResponseCache", key: Optional[str], tags: Tuple[str, ...], generations: Tuple[int, ...],
+                 value: Optional[bytes]):
+        self._cache = cache
+        self._key = key
+        self._tags = tags
+        self._generations = generations
+        self.body: Optional[bytes] = None
+        self.headers: Dict[str, str] = {}
+        if value is not None:
+            self.body, self.headers = _unpack(value)
+
+    @property
+    def hit(self) -> bool:
+        return self.body is not None
+
+    def response(self, headers) -> Response:
+        """命中的回應，加上路由已設定的標頭（ETag 等）"""
+        return ORJSONBytesResponse(content=self.body, headers={**self.headers, **dict(headers)})
+
+    def store(self, body: bytes, headers=None) -> None:
+        if self._key is None:
+            return
+        cached_headers = {k: v for k, v in dict(headers or {}).items() if k.lower() in CACHED_HEADERS}
+        self._cache.store(self._key, self._tags, self._generations, _pack(body, cached_headers))
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = RESPONSE_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        # 每個標籤的失效次數；查詢後、寫回前若有失效，表示內容可能是舊的，不寫回
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def lookup(self, request: Request, *tags: str) -> CacheLookup:
+        if self.backend is None:
+            return CacheLookup(self, None, tags, (), None)
+        key = self.key(request)
+        with self._lock:
+            generations = tuple(self._generations.get(tag, 0) for tag in tags)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache get failed: %s", e)
+            value = None
+        cache_requests.inc(metrics.route_label(request), "hit" if value is not None else "miss")
+        return CacheLookup(self, key, tags, generations, value)
+
+    def store(self, key: str, tags: Tuple[str, ...], generations: Tuple[int, ...], value: bytes) -> None:
+        # 與 invalidate 互斥，確保失效之後不會再寫回失效前查詢的內容
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in tags) != generations:
+                return
+            try:
+                self.backend.set(key, value, tags, self.ttl)
+            except Exception as e:
+                logger.warning("Response cache set failed: %s", e)
+
+    def invalidate(self, *tags: str) -> None:
+        """寫入 commit 後呼叫，移除帶有這些標籤的項目"""
+        if self.backend is None:
+            return
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                try:
+                    self.backend.invalidate(tag)
+                except Exception as e:
+                    logger.warning("Response cache invalidation of %s failed: %s", tag, e)
+
+
+cache_requests = metrics.registry.register(metrics.Counter(
+    "response_cache_requests_total", "Response cache lookups by route and result.", ("route", "result")
+))
+
+response_cache = ResponseCache(load_backend())
+
+
+def cache_status() -> List[str]:
+    """快取後端目前的項目數、大小與淘汰次數（輸出時讀取）"""
+    if response_cache.backend is None:
+        return []
+    stats = response_cache.backend.stats()
+    lines = []
+    if "evictions" in stats:
+        lines += ["# HELP response_cache_evictions_total Response cache entries removed by reason.",
+                  "# TYPE response_cache_evictions_total counter"]
+        lines += [f'response_cache_evictions_total{{reason="{reason}"}} {count}'
+                  for reason, count in sorted(stats["evictions"].items())]
+    for name, help in (("entries", "Entries in the response cache."), ("bytes", "Size of cached response bodies.")):
+        if name in stats:
+            lines += [f"# HELP response_cache_{name} {help}", f"# TYPE response_cache_{name} gauge",
+                      f"response_cache_{name} {stats[name]}"]
+    return lines
+
+
+metrics.registry.add_collector(cache_status)
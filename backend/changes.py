@@ -0,0 +1,176 @@
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+import os
+import threading
+import models
+
+logger = logging.getLogger(__name__)
+
+# 任務變更紀錄，供增量同步使用。
+# updated_at 只有秒級精度且以時鐘為準，不適合作為游標；改由觸發器維護遞增的 seq：
+# 每個任務只保留最新一筆紀錄（INSERT OR REPLACE 會取得新的 seq），刪除時留下墓碑。
+# 墓碑保留 TASK_TOMBSTONE_RETENTION_DAYS 天，游標早於清除範圍時客戶端需完整重新同步。
+# 啟動時與背景執行緒每 TASK_TOMBSTONE_PRUNE_INTERVAL 秒清除一次（0 停用背景清除）。
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+TASK_TOMBSTONE_PRUNE_INTERVAL = float(os.getenv("TASK_TOMBSTONE_PRUNE_INTERVAL", "3600"))
+
+_CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS task_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL UNIQUE,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_changes_meta (
+        key VARCHAR(50) NOT NULL PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+]
+
+_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_ai AFTER INSERT ON tasks BEGIN
+        INSERT OR REPLACE INTO task_changes(task_id, deleted) VALUES (new.id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_au AFTER UPDATE ON tasks BEGIN
+        INSERT OR REPLACE INTO task_changes(task_id, deleted) VALUES (new.id, 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_changes_ad AFTER DELETE ON tasks BEGIN
+        INSERT OR REPLACE INTO task_changes(task_id, deleted) VALUES (old.id, 1);
+    END
+    """,
+]
+
+_BACKFILL = "INSERT INTO task_changes(task_id, deleted) SELECT id, 0 FROM tasks ORDER BY id"
+
+
+class CursorExpired(Exception):
+    """游標早於已清除的墓碑，客戶端必須重新完整同步"""
+
+
+def init_changes(engine) -> None:
+    """建立變更紀錄表與觸發器，首次建立時為既有任務建立紀錄"""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_changes'")
+        ).first()
+        for statement in _CREATE_TABLES + _TRIGGERS:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text(_BACKFILL))
+            logger.info("Task change log created")
+    prune_tombstones(engine)
+
+
+def prune_tombstones(engine, retention_days: int = TASK_TOMBSTONE_RETENTION_DAYS) -> int:
+    """清除過期的墓碑，並記錄清除範圍"""
+    with engine.begin() as conn:
+        horizon = conn.execute(
+            text(
+                "SELECT max(seq) FROM task_changes "
+                "WHERE deleted = 1 AND changed_at < datetime('now', :age)"
+            ),
+            {"age": f"-{retention_days} days"}
+        ).scalar()
+        if horizon is None:
+            return 0
+        removed = conn.execute(
+            text("DELETE FROM task_changes WHERE deleted = 1 AND seq <= :horizon"),
+            {"horizon": horizon}
+        ).rowcount
+        conn.execute(
+            text(
+                "INSERT INTO task_changes_meta(key, value) VALUES ('pruned_seq', :horizon) "
+                "ON CONFLICT(key) DO UPDATE SET value = max(value, excluded.value)"
+            ),
+            {"horizon": horizon}
+        )
+    logger.info("Pruned %s task tombstones up to seq=%s", removed, horizon)
+    return removed
+
+
+def latest_cursor(db: Session) -> int:
+    """目前的游標：客戶端載入任務前先取得，之後由此增量同步（墓碑清除後仍不早於清除範圍）"""
+    return db.execute(text(
+        "SELECT max(coalesce((SELECT max(seq) FROM task_changes), 0), "
+        "coalesce((SELECT value FROM task_changes_meta WHERE key = 'pruned_seq'), 0))"
+    )).scalar()
+
+
+def get_changes(db: Session, since: int, limit: int) -> dict:
+    """返回 since 之後的變更任務與墓碑，以及新的游標"""
+    pruned_seq = db.execute(
+        text("SELECT value FROM task_changes_meta WHERE key = 'pruned_seq'")
+    ).scalar() or 0
+    if 0 < since < pruned_seq:
+        raise CursorExpired(f"Cursor {since} is older than pruned history ({pruned_seq})")
+
+    rows = db.execute(
+        text("SELECT seq, task_id, deleted FROM task_changes WHERE seq > :since ORDER BY seq LIMIT :limit"),
+        {"since": since, "limit": limit + 1}
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed_ids = [row.task_id for row in rows if not row.deleted]
+    deleted: List[int] = [row.task_id for row in rows if row.deleted]
+    changed = []
+    if changed_ids:
+        tasks = {
+            task.id: task
+            for task in db.query(models.Task).filter(models.Task.id.in_(changed_ids))
+        }
+        changed = [tasks[task_id] for task_id in changed_ids if task_id in tasks]
+
+    return {
+        "cursor": rows[-1].seq if rows else max(since, 0),
+        "has_more": has_more,
+        "changed": changed,
+        "deleted": deleted,
+    }
+
+
+class TombstonePruner:
+    def __init__(self, engine, retention_days: int = TASK_TOMBSTONE_RETENTION_DAYS,
+                 interval: float = TASK_TOMBSTONE_PRUNE_INTERVAL):
+        self._engine = engine
+        self._retention_days = retention_days
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+        try:
+            return prune_tombstones(self._engine, self._retention_days)
+        except Exception as e:
+            logger.error("Error pruning task tombstones: %s", e)
+            return 0
+
+    def _run(self) -> None:
+        # 啟動時已由 init_changes（或部署步驟）清除一次，先等待一個間隔
+        while not self._stop.wait(self._interval):
+            self.run_once()
+
+    def start(self) -> None:
+        """啟動背景清除執行緒（TASK_TOMBSTONE_PRUNE_INTERVAL=0 時不啟動）"""
+        if self._thread is not None or self._interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tombstone-pruner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,40 +1,169 @@
 from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import logging
 import os
+from metrics import instrument_engine
+import profiler
+from logging_config import configure_logging
 
-# 配置日誌
-logging.basicConfig(level=logging.INFO)
+# 配置日誌（集中設定，見 logging_config.py）
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # 獲取當前文件所在目錄
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "todo.db")
 
-# 創建數據庫 URL
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+# 創建數據庫 URL（可用環境變量覆蓋，例如測試或基準測試時使用臨時數據庫）
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+# SQLite 效能設定，皆可用環境變量調整
+# SQLITE_PROFILE=performance：WAL 模式，讀取不會被寫入阻塞
+# SQLITE_PROFILE=default：維持 SQLite 預設（rollback journal），僅開啟外鍵
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# 負數代表以 KiB 為單位（-64000 約 64 MB）
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))
+
+# 多 worker 部署（uvicorn 以 WEB_CONCURRENCY 作為預設 worker 數）：
+# 結構設定改由部署時執行一次 `alembic upgrade head`，worker 啟動時不執行 DDL 與結構檢查
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+MULTI_WORKER = WEB_CONCURRENCY > 1
+DB_AUTO_INIT = os.getenv("DB_AUTO_INIT", "false" if MULTI_WORKER else "true").lower() == "true"
+
+# 連接池設定
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+
+
+def sqlite_pragmas(profile: str = SQLITE_PROFILE):
+    """返回指定設定檔在每個新連接上執行的 PRAGMA"""
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if profile == "performance":
+        pragmas += [
+            f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+            f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+            f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+    return pragmas
+
+
+def pool_options(url: str, is_async: bool = False):
+    """返回連接池參數；記憶體數據庫使用單一連接，不套用"""
+    if ":memory:" in url or url.endswith("://"):
+        return {}
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if is_async:
+        # aiosqlite 預設使用 NullPool（每次請求重新連接並重跑 PRAGMA），改用連接池
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def configure_sqlite(engine, profile: str = SQLITE_PROFILE):
+    """在引擎的每個新連接上套用 PRAGMA 設定"""
+    pragmas = sqlite_pragmas(profile)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = SQLITE_PROFILE):
+    """創建套用效能設定與連接池參數的同步引擎"""
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        **pool_options(url)
+    )
+    return configure_sqlite(engine, profile)
+
+
+def use_immediate_transactions(engine):
+    """
+    交易以 BEGIN IMMEDIATE 開始，一開始就取得寫入鎖。
+    預設的延遲交易先讀後寫時，若其他連接（例如其他 worker）已先寫入，升級寫入鎖會直接
+    失敗（SQLITE_BUSY），不受 busy_timeout 重試；IMMEDIATE 則在 BEGIN 時依 busy_timeout 等待。
+    """
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        # 由 SQLAlchemy 的 begin 事件自行送出 BEGIN
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
 
 # 創建數據庫引擎
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+engine = create_db_engine()
+
+# 寫入引擎：寫入路由（經由 writer.py）與背景寫入使用，交易一開始就取得寫入鎖
+write_engine = use_immediate_transactions(create_db_engine())
+
+# 創建異步數據庫引擎（aiosqlite），供 async 路由使用，不阻塞事件循環
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
 )
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL, is_async=True))
+configure_sqlite(async_engine.sync_engine)
 
-# 配置 SQLite 以支持外鍵
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+# 語句執行時間與連接池指標（/metrics）
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+instrument_engine(write_engine, "write")
 
-# 創建會話工廠
+# 選用的逐請求 SQL 分析（SQL_PROFILE=true）
+profiler.instrument_engine(engine)
+profiler.instrument_engine(async_engine.sync_engine)
+profiler.instrument_engine(write_engine)
+
+# 創建會話工廠（同步版本供腳本、遷移與同步路由使用）
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# 寫入會話工廠，commit 後不使物件過期，結果可交回其他執行緒使用
+WriteSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=write_engine
+)
+
+# 創建異步會話工廠，commit 後不使物件過期，避免在 async 環境中觸發隱式載入
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # 創建基類
 Base = declarative_base()
 
@@ -46,6 +175,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """獲取異步數據庫會話"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """初始化數據庫，創建所有表"""
     try:
@@ -59,11 +193,29 @@ def init_db():
         # 檢查表是否存在
         inspector = inspect(engine)
         tables = inspector.get_table_names()
-        logger.info(f"Existing tables: {tables}")
+        logger.info("Existing tables: %s", tables)
+        
+        # 建立全文搜尋索引、統計彙總表、變更紀錄、提醒認領表與標籤索引（模型尚未載入完成時略過）
+        if "tasks" in tables and "articles" in tables:
+            from search import init_search_index
+            init_search_index(engine)
+            
+            from analytics import init_analytics
+            init_analytics(engine)
+            
+            from changes import init_changes
+            init_changes(engine)
+            
+            from versions import init_versions
+            init_versions(engine)
+            
+            from reminders import init_reminders
+            init_reminders(engine)
+            
+            if "task_tags" in tables:
+                from tagging import init_tags
+                init_tags(engine)
         
     except Exception as e:
-        logger.error(f"Error initializing database: {str(e)}")
+        logger.error("Error initializing database: %s", e)
         raise
-
-# 初始化數據庫
-init_db()
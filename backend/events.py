@@ -0,0 +1,91 @@
+from typing import AsyncIterator, Optional, Set
+from fastapi import Request
+import asyncio
+import itertools
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 行程內的事件發佈／訂閱，供 /events SSE 串流使用。
+# 事件只序列化一次，再放進每個訂閱者的有界佇列；佇列滿的慢速訂閱者會收到
+# reset 事件後被斷開，由客戶端重新載入，不會拖慢其他訂閱者或寫入路由。
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE, heartbeat: float = EVENT_HEARTBEAT_SECONDS):
+        self._queue_size = queue_size
+        self._heartbeat = heartbeat
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """在事件循環中建立訂閱者"""
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, payload: dict) -> None:
+        """發佈事件，可從任何執行緒呼叫（同步路由在執行緒池中執行）"""
+        loop = self._loop
+        if loop is None or not self._subscribers or loop.is_closed():
+            return
+        with self._lock:
+            event_id = next(self._ids)
+        message = f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        try:
+            loop.call_soon_threadsafe(self._fan_out, message)
+        except RuntimeError:
+            # 事件循環已關閉
+            pass
+
+    def _fan_out(self, message: str) -> None:
+        for subscriber in list(self._subscribers):
+            if subscriber.overflowed:
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                logger.warning("Dropping slow event subscriber")
+
+    async def stream(self, subscriber: Subscriber, request: Request) -> AsyncIterator[str]:
+        """產生 SSE 內容，閒置時送出心跳"""
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscriber.overflowed:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=self._heartbeat)
+                    yield message
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+broker = EventBroker()
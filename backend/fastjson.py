@@ -0,0 +1,73 @@
+from datetime import timedelta, timezone
+from typing import Iterable, List, Sequence
+from fastapi import Response
+from sqlalchemy import DateTime, type_coerce
+import orjson
+import models
+
+# 列表的快速序列化路徑：以 tuple 取回資料，略過 ORM 物件、TZDateTime 的逐值 pytz
+# 轉換與 Pydantic 驗證，直接以 orjson 輸出 bytes。
+# 台北自 1979 年起不實施日光節約時間，可用固定時差取代 pytz 時區（結果與 TZDateTime 相同）。
+TAIPEI = timezone(timedelta(hours=8), "Asia/Taipei")
+
+# 與 schemas.Task / schemas.Article 的輸出欄位順序一致
+TASK_FIELDS = ("title", "description", "priority", "status", "due_date", "position", "tags",
+               "id", "created_at", "updated_at")
+ARTICLE_FIELDS = ("title", "content", "summary", "category", "tags",
+                  "id", "created_at", "updated_at", "views")
+_DATETIME_FIELDS = {"due_date", "created_at", "updated_at"}
+
+
+class ORJSONBytesResponse(Response):
+    """內容已序列化為 bytes 的 JSON 回應"""
+    media_type = "application/json"
+
+
+def columns_for(model, fields: Sequence[str]) -> List:
+    """返回查詢欄位；時間欄位改用一般 DateTime 型別，不經過 TZDateTime 的 pytz 轉換"""
+    columns = []
+    for name in fields:
+        column = getattr(model, name)
+        if name in _DATETIME_FIELDS:
+            column = type_coerce(column, DateTime).label(name)
+        columns.append(column)
+    return columns
+
+
+def task_columns() -> List:
+    return columns_for(models.Task, TASK_FIELDS)
+
+
+def article_columns(fields: Sequence[str] = ARTICLE_FIELDS) -> List:
+    return columns_for(models.Article, fields)
+
+
+def rows_to_dicts(rows: Iterable[tuple], fields: Sequence[str]) -> List[dict]:
+    """將 tuple 轉為字典，時間欄位以 UTC 解讀後轉為台北時間"""
+    datetime_indexes = [i for i, name in enumerate(fields) if name in _DATETIME_FIELDS]
+    utc = timezone.utc
+    result = []
+    for row in rows:
+        values = list(row)
+        for i in datetime_indexes:
+            value = values[i]
+            if value is not None:
+                values[i] = value.replace(tzinfo=utc).astimezone(TAIPEI)
+        result.append(dict(zip(fields, values)))
+    return result
+
+
+def dumps(items: List[dict]) -> bytes:
+    return orjson.dumps(items)
+
+
+def dump_models(schema, objects: Iterable) -> bytes:
+    """以 Pydantic 模型輸出（與 response_model 的結果相同），用於需要 bytes 的路徑（例如回應快取）"""
+    return orjson.dumps([schema.model_validate(obj).model_dump(mode="json") for obj in objects])
+
+
+def add_views(article: dict, extra: int) -> dict:
+    """在單篇文章（schemas.Article 的 JSON 字典）上加上尚未寫回的瀏覽數"""
+    if extra:
+        article["views"] = (article.get("views") or 0) + extra
+    return article
@@ -0,0 +1,148 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from fastapi import Request
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+
+# 集中的日誌設定，取代各模組各自呼叫 logging.basicConfig。
+# 呼叫端只把紀錄放進佇列，由背景執行緒格式化並寫出，請求不會因寫 stderr 而阻塞；
+# 各模組以 logger.info("... %s", value) 延遲格式化，被過濾或取樣略過的紀錄不會產生字串。
+#
+# LOG_LEVEL：根日誌等級（預設 INFO）
+# LOG_FORMAT：text 或 json（每行一個 JSON 物件，方便集中收集）
+# LOG_QUEUE：true 時使用佇列與背景寫出（預設），false 時直接寫出（除錯用）
+# LOG_SAMPLE_RATES：各路由 INFO 以下紀錄的取樣率，例如
+#     "GET /tasks=0.01,/articles/{article_id}=0.1,*=1"
+#   以「方法 路由樣板」或「路由樣板」比對，* 為預設值；WARNING 以上一律保留
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() == "true"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+TEXT_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+# LogRecord 內建屬性，其餘屬性視為 extra 欄位輸出
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# 目前請求是否記錄 INFO 以下的日誌（由 sample_request 依路由決定）
+_sampled: ContextVar[bool] = ContextVar("log_sampled", default=True)
+_route: ContextVar[Optional[str]] = ContextVar("log_route", default=None)
+
+_configured = False
+_listener: Optional[QueueListener] = None
+_stream_handler: Optional[logging.StreamHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """每筆紀錄輸出為一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    只把紀錄放進佇列，訊息留給背景執行緒格式化。
+    標準 QueueHandler.prepare 會在呼叫端先格式化訊息（為了跨行程傳遞），
+    同一行程內不需要；日誌參數應為呼叫後不再修改的值。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # 例外的 traceback 須在呼叫端展開，之後 frame 可能已被回收
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """依目前請求的取樣結果略過 INFO 以下的紀錄，並附上路由"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.route = _route.get()
+        return record.levelno >= logging.WARNING or _sampled.get()
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, rate = item.rsplit("=", 1)
+        try:
+            rates[key.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+_rates = parse_sample_rates(LOG_SAMPLE_RATES)
+
+
+def sample_rate(method: str, route: str) -> float:
+    return _rates.get(f"{method} {route}", _rates.get(route, _rates.get("*", 1.0)))
+
+
+async def sample_request(request: Request) -> None:
+    """全域依賴：路由匹配後決定此請求的日誌是否取樣"""
+    route = getattr(request.scope.get("route"), "path", None)
+    if route is None:
+        return
+    _route.set(route)
+    if _rates:
+        rate = sample_rate(request.method, route)
+        _sampled.set(rate >= 1.0 or random.random() < rate)
+
+
+def configure_logging() -> None:
+    """設定根日誌；可重複呼叫，只有第一次生效"""
+    global _configured, _listener, _stream_handler
+    if _configured:
+        return
+    _configured = True
+    root = logging.getLogger()
+
+    formatter = JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    stream_handler = _stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    if LOG_QUEUE:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        handler = stream_handler
+    handler.addFilter(SamplingFilter())
+
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+
+def set_stream(stream) -> None:
+    """改變日誌輸出的串流（例如基準測試時導向 os.devnull，格式化成本不變）"""
+    if _stream_handler is not None:
+        _stream_handler.setStream(stream)
@@ -1,22 +1,49 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, Path, Body
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, Query, Path, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 import models
 import schemas
-from database import SessionLocal, init_db
+from database import SessionLocal, WriteSessionLocal, engine, write_engine, init_db, get_async_db, async_engine, DB_AUTO_INIT
+from writer import writer, Rollback
+from pagination import encode_cursor, decode_cursor
+from positions import next_position, position_for_index, rebalance_positions
+from batch import apply_task_batch
+from view_counter import ViewCounter
+from archive import TaskArchiver, list_archived, restore_task
+from reminders import DueScheduler
+import related
+from related import related_index
+import search
+import analytics
+from versions import table_versions, conditional_response, conditional_response_async
+from cache import response_cache
+from events import broker
+import changes
+import fastjson
+import orjson
+import tagging
+import transfer
+import metrics
+import profiler
+import logging_config
 from typing import List, Optional
 from datetime import datetime
 import pytz
 import os
-from sqlalchemy import func
+import time
+from sqlalchemy import select, or_, and_, text
 
-# 配置日誌
-logging.basicConfig(level=logging.INFO)
+# 配置日誌（集中設定，見 logging_config.py）
+logging_config.configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# 全域依賴：依路由決定請求日誌的取樣（LOG_SAMPLE_RATES）
+app = FastAPI(dependencies=[Depends(logging_config.sample_request)])
 
 # 基本 CORS 設置
 origins = [
@@ -32,7 +59,7 @@ origins = [
 additional_origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
 origins.extend([origin.strip() for origin in additional_origins if origin.strip()])
 
-logger.info(f"Configured origins: {origins}")
+logger.info("Configured origins: %s", origins)
 
 app.add_middleware(
     CORSMiddleware,
@@ -40,12 +67,13 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Server-Timing"],
 )
 
 @app.middleware("http")
 async def cors_middleware(request: Request, call_next):
     origin = request.headers.get("origin", "")
-    logger.info(f"Request from origin: {origin}")
+    logger.debug("Request from origin: %s", origin)
     
     response = await call_next(request)
     
@@ -55,23 +83,172 @@ async def cors_middleware(request: Request, call_next):
     
     return response
 
-# 初始化數據庫
-init_db()
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    if not metrics.METRICS_ENABLED:
+        return await call_next(request)
+    method = request.method
+    # 路由在 call_next 內才會匹配，進行中的請求只以 method 區分
+    metrics.http_in_progress.inc(method)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = metrics.route_label(request)
+        metrics.http_in_progress.dec(method)
+        metrics.http_requests.inc(method, route, str(status_code))
+        metrics.http_duration.observe(time.perf_counter() - started, method, route)
+
+# 選用的逐請求 SQL 分析，只在 SQL_PROFILE=true 時掛上
+if profiler.SQL_PROFILE_ENABLED:
+    @app.middleware("http")
+    async def sql_profile_middleware(request: Request, call_next):
+        profile = profiler.start()
+        started = time.perf_counter()
+        response = await call_next(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        response.headers["Server-Timing"] = profile.server_timing(total_ms)
+        profiler.finish(metrics.route_label(request), request.method, profile, total_ms)
+        return response
+
+    @app.on_event("shutdown")
+    def dump_sql_profile():
+        profiler.summary.dump()
+
+# 初始化數據庫；多 worker 部署時由部署步驟執行一次 `alembic upgrade head`（DB_AUTO_INIT=false）
+if DB_AUTO_INIT:
+    init_db()
+else:
+    search.detect_search_index(engine)
+
+# 其他 worker 的寫入（共用版本，見 versions.py）：使本行程的回應快取失效，並更新到期提醒與相關文章索引；
+# 不是本行程的寫入時，另外發佈 tasks.changed / articles.changed，讓本行程的 SSE 訂閱者重新同步
+def on_shared_change(table: str, local: bool):
+    response_cache.invalidate(table, f"{table}:*")
+    if table == "tasks":
+        due_scheduler.mark_changed()
+    elif table == "articles" and related.related_enabled:
+        related_index.mark_foreign_change()
+    if not local:
+        broker.publish(f"{table}.changed", {"version": table_versions.version(table)})
+
+table_versions.add_listener(on_shared_change)
+
+@app.on_event("startup")
+def start_version_sync():
+    table_versions.start()
+
+@app.on_event("shutdown")
+def stop_version_sync():
+    table_versions.stop()
+
+# 寫入佇列（見 writer.py）
+@app.on_event("startup")
+def start_writer():
+    writer.start()
+
+@app.on_event("shutdown")
+def stop_writer():
+    writer.stop()
+
+# 文章瀏覽數寫入緩衝
+view_counter = ViewCounter(WriteSessionLocal)
+
+@app.on_event("startup")
+def start_view_counter():
+    view_counter.start()
+
+@app.on_event("shutdown")
+def stop_view_counter():
+    view_counter.stop()
+
+# 完成任務的背景封存
+task_archiver = TaskArchiver(
+    WriteSessionLocal,
+    on_archived=lambda ids: notify_change("tasks", "tasks.archived", {"count": len(ids)})
+)
+
+@app.on_event("startup")
+def start_task_archiver():
+    task_archiver.start()
+
+@app.on_event("shutdown")
+def stop_task_archiver():
+    task_archiver.stop()
+
+# 變更紀錄的墓碑定期清除（見 changes.py）
+tombstone_pruner = changes.TombstonePruner(write_engine)
+
+@app.on_event("startup")
+def start_tombstone_pruner():
+    tombstone_pruner.start()
+
+@app.on_event("shutdown")
+def stop_tombstone_pruner():
+    tombstone_pruner.stop()
+
+# 到期提醒：記憶體中的到期時間索引，依任務變更紀錄增量更新（見 reminders.py）
+due_scheduler = DueScheduler(
+    SessionLocal,
+    on_event=lambda kind, payload: broker.publish(f"task.{kind}", payload),
+    claim_session_factory=WriteSessionLocal
+)
+
+@app.on_event("startup")
+def start_due_scheduler():
+    due_scheduler.start()
+
+@app.on_event("shutdown")
+def stop_due_scheduler():
+    due_scheduler.stop()
+
+# 相關文章的 TF-IDF 索引：背景建立，文章寫入後增量更新；每個 worker 一份，RELATED_INDEX=false 停用（見 related.py）
+@app.on_event("startup")
+def start_related_index():
+    related_index.start()
+
+@app.on_event("shutdown")
+def stop_related_index():
+    related_index.stop()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
 
 # 根路由
 @app.get("/")
 def read_root():
     return {"status": "ok"}
 
+# Prometheus 指標
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# SQL 分析彙總（僅在 SQL_PROFILE=true 時提供）
+@app.get("/debug/sql-profile")
+def get_sql_profile(reset: bool = Query(False)):
+    if not profiler.SQL_PROFILE_ENABLED:
+        raise HTTPException(status_code=404, detail="SQL profiling is disabled")
+    snapshot = profiler.summary.snapshot()
+    if reset:
+        profiler.summary.reset()
+    return snapshot
+
 # 健康檢查
 @app.get("/health")
 def health_check():
+    db = SessionLocal()
     try:
-        db = next(get_db())
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {"status": "healthy"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
 
 # 依賴注入
 def get_db():
@@ -81,131 +258,457 @@ def get_db():
     finally:
         db.close()
 
+# 寫入後的通知：遞增資料表版本、使回應快取失效並發佈即時事件
+def notify_change(table: str, event_type: str, payload: dict):
+    table_versions.bump(table)
+    if "id" in payload:
+        response_cache.invalidate(table, f"{table}:{payload['id']}")
+    else:
+        response_cache.invalidate(table)
+    if table == "tasks":
+        due_scheduler.mark_changed()
+    elif table == "articles" and related.related_enabled:
+        related_index.mark_changed(payload.get("id"))
+    broker.publish(event_type, payload)
+
 # 任務相關的路由
 @app.get("/tasks", response_model=List[schemas.Task])
-def get_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(models.Task).order_by(models.Task.position).all()
+def get_tasks(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    status_filter: Optional[List[schemas.TaskStatus]] = Query(None, alias="status"),
+    priority: Optional[List[int]] = Query(None),
+    tags: Optional[str] = Query(None),
+    tag_mode: str = Query("all", pattern="^(all|any)$"),
+    due_after: Optional[datetime] = Query(None),
+    due_before: Optional[datetime] = Query(None),
+    all: bool = Query(False),
+    fast: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    # 資料未變時直接回應 304
+    not_modified = conditional_response(request, response, "tasks")
+    if not_modified is not None:
+        return not_modified
+
+    cached = response_cache.lookup(request, "tasks")
+    if cached.hit:
+        return cached.response(response.headers)
+
+    query = db.query(models.Task)
+
+    # 伺服器端篩選
+    if status_filter:
+        query = query.filter(models.Task.status.in_([s.value for s in status_filter]))
+    if priority:
+        query = query.filter(models.Task.priority.in_(priority))
+    tag_names = tagging.parse_tags(tags)
+    if tag_names:
+        # 以標籤倒排索引篩選，tag_mode=all 須全部符合，any 符合任一即可
+        query = query.filter(models.Task.id.in_(tagging.tag_filter("task", tag_names, tag_mode == "all")))
+    if due_after is not None:
+        query = query.filter(models.Task.due_date >= due_after)
+    if due_before is not None:
+        query = query.filter(models.Task.due_date < due_before)
+
+    query = query.order_by(models.Task.position, models.Task.id)
+
+    # 小型看板可明確要求一次取回全部任務，否則以 (position, id) 做 keyset 分頁
+    if not all:
+        if cursor:
+            try:
+                last_position, last_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            query = query.filter(or_(
+                models.Task.position > last_position,
+                and_(models.Task.position == last_position, models.Task.id > last_id)
+            ))
+        query = query.limit(limit + 1)
+
+    if fast:
+        # 快速路徑：以 tuple 取回並直接序列化為 bytes
+        tasks = fastjson.rows_to_dicts(query.with_entities(*fastjson.task_columns()).all(), fastjson.TASK_FIELDS)
+    else:
+        tasks = query.all()
+
+    if not all and len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        if fast:
+            response.headers["X-Next-Cursor"] = encode_cursor(last["position"], last["id"])
+        else:
+            response.headers["X-Next-Cursor"] = encode_cursor(last.position, last.id)
+
+    if fast or response_cache.enabled:
+        body = fastjson.dumps(tasks) if fast else fastjson.dump_models(schemas.Task, tasks)
+        cached.store(body, response.headers)
+        return fastjson.ORJSONBytesResponse(content=body, headers=dict(response.headers))
     return tasks
 
-@app.post("/tasks", response_model=schemas.Task)
-def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
+@app.get("/tasks/changes", response_model=schemas.TaskChanges)
+def get_task_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
     try:
-        # 獲取當前最大的 position
-        max_position = db.query(func.max(models.Task.position)).scalar() or -1
-        
-        # 創建新任務，position 設為最大值 + 1
+        return changes.get_changes(db, since, limit)
+    except changes.CursorExpired as e:
+        # 墓碑已清除，客戶端需以 since=0 重新同步
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except Exception as e:
+        logger.error("Error fetching task changes: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@app.get("/tasks/changes/cursor", response_model=schemas.TaskChangesCursor)
+def get_task_changes_cursor(db: Session = Depends(get_db)):
+    try:
+        return {"cursor": changes.latest_cursor(db)}
+    except Exception as e:
+        logger.error("Error fetching task changes cursor: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@app.get("/tasks/due", response_model=List[schemas.Task])
+def get_due_tasks(
+    within: int = Query(1440, ge=0, le=525600, description="到期時間在幾分鐘內"),
+    overdue: bool = Query(True, description="是否包含已逾期的任務"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    try:
+        # 由到期時間索引取得 id，再以主鍵載入任務；先套用尚未同步的寫入
+        table_versions.sync()
+        due_scheduler.catch_up()
+        entries = due_scheduler.due_within(within * 60, overdue, limit)
+        if not entries:
+            return []
+        tasks = {
+            task.id: task
+            for task in db.query(models.Task).filter(models.Task.id.in_([task_id for task_id, _ in entries]))
+        }
+        return [tasks[task_id] for task_id, _ in entries if task_id in tasks]
+    except Exception as e:
+        logger.error("Error fetching due tasks: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@app.get("/tasks/archive", response_model=List[schemas.ArchivedTask])
+def get_archived_tasks(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    # 依封存時間由新到舊，以 (archived_at, 封存紀錄 id) 做 keyset 分頁
+    after = None
+    if cursor:
+        try:
+            archived_ts, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        after = (datetime.fromtimestamp(archived_ts, pytz.UTC), last_id)
+    try:
+        tasks = list_archived(db, limit + 1, after)
+    except Exception as e:
+        logger.error("Error fetching archived tasks: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(int(last.archived_at.timestamp()), last.id)
+    return tasks
+
+@app.post("/tasks/archive/{task_id}/restore", response_model=schemas.Task)
+def restore_archived_task(task_id: int):
+    def write(db: Session):
+        task = restore_task(db, task_id)
+        if task is None:
+            raise HTTPException(status_code=404, detail="Archived task not found")
+        db.refresh(task)
+        return schemas.Task.model_validate(task)
+
+    try:
+        task = writer.run(write)
+        notify_change("tasks", "task.restored", {"id": task.id, "status": task.status, "position": task.position})
+        return task
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error restoring task: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 寫入路由經由寫入佇列執行（見 writer.py）：write 在寫入執行緒的 session 上執行，
+# 返回的結果在 commit 之後才交回路由，之後才通知變更
+@app.post("/tasks", response_model=schemas.Task)
+def create_task(task: schemas.TaskCreate):
+    def write(db: Session):
+        # 創建新任務，position 排在最後並保留間隔
         db_task = models.Task(**task.dict())
-        db_task.position = max_position + 1
+        db_task.position = next_position(db)
         
         db.add(db_task)
-        db.commit()
+        db.flush()
+        if db_task.tags:
+            tagging.sync_task_tags(db, {db_task.id: db_task.tags})
         db.refresh(db_task)
+        return schemas.Task.model_validate(db_task)
+
+    try:
+        db_task = writer.run(write)
+        notify_change("tasks", "task.created", {"id": db_task.id, "status": db_task.status, "position": db_task.position})
         return db_task
     except Exception as e:
-        logger.error(f"Error creating task: {str(e)}")
-        db.rollback()
+        logger.error("Error creating task: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @app.put("/tasks/{task_id}", response_model=schemas.Task)
-def update_task(task_id: int, task: schemas.TaskUpdate, db: Session = Depends(get_db)):
-    try:
+def update_task(task_id: int, task: schemas.TaskUpdate):
+    update_data = task.dict(exclude_unset=True)
+
+    def write(db: Session):
         db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
         if db_task is None:
             raise HTTPException(status_code=404, detail="Task not found")
         
         # 更新任務
-        update_data = task.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_task, field, value)
+        if "tags" in update_data:
+            tagging.sync_task_tags(db, {task_id: db_task.tags})
         
-        db.commit()
+        db.flush()
         db.refresh(db_task)
+        return schemas.Task.model_validate(db_task)
+
+    try:
+        db_task = writer.run(write)
+        notify_change("tasks", "task.updated", {"id": task_id, "fields": list(update_data)})
         return db_task
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating task: {str(e)}")
-        db.rollback()
+        logger.error("Error updating task: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @app.delete("/tasks/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    try:
+def delete_task(task_id: int):
+    def write(db: Session):
         db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
         if db_task is None:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        # 獲取被刪除任務的 position
-        deleted_position = db_task.position
-        
-        # 刪除任務
+        # 刪除任務，位置為稀疏編號，其他任務不需移動
         db.delete(db_task)
-        
-        # 更新其他任務的 position
-        db.query(models.Task).filter(models.Task.position > deleted_position).update(
-            {models.Task.position: models.Task.position - 1}
-        )
-        
-        db.commit()
+
+    try:
+        writer.run(write)
+        notify_change("tasks", "task.deleted", {"id": task_id})
         return {"status": "success"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting task: {str(e)}")
-        db.rollback()
+        logger.error("Error deleting task: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @app.put("/tasks/{task_id}/reorder")
-def reorder_tasks(task_id: int, new_position: int, db: Session = Depends(get_db)):
-    try:
+def reorder_tasks(task_id: int, new_position: int):
+    def write(db: Session):
         # 檢查任務是否存在
         task = db.query(models.Task).filter(models.Task.id == task_id).first()
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        old_position = task.position
+        # new_position 為排序中的目標索引，取前後相鄰任務的中間值
+        position = position_for_index(db, task_id, new_position)
+        rebalanced = position is None
+        if rebalanced:
+            # 間隔用盡，重新編號後再計算
+            rebalance_positions(db)
+            position = position_for_index(db, task_id, new_position)
         
-        # 如果位置相同，不需要更新
-        if old_position == new_position:
-            return {"status": "success"}
-        
-        # 更新其他任務的位置
-        if old_position < new_position:
-            # 向下移動
-            db.query(models.Task).filter(
-                models.Task.position > old_position,
-                models.Task.position <= new_position
-            ).update(
-                {models.Task.position: models.Task.position - 1}
-            )
+        # 只更新目標任務的位置
+        task.position = position
+        return position, rebalanced
+
+    try:
+        position, rebalanced = writer.run(write)
+        if rebalanced:
+            # 所有任務位置都已改變，客戶端需重新載入
+            notify_change("tasks", "tasks.rebalanced", {})
         else:
-            # 向上移動
-            db.query(models.Task).filter(
-                models.Task.position >= new_position,
-                models.Task.position < old_position
-            ).update(
-                {models.Task.position: models.Task.position + 1}
-            )
-        
-        # 更新目標任務的位置
-        task.position = new_position
-        db.commit()
+            notify_change("tasks", "task.reordered", {"id": task_id, "position": position})
         
         return {"status": "success"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error reordering task: {str(e)}")
-        db.rollback()
+        logger.error("Error reordering task: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@app.post("/tasks/batch", response_model=schemas.TaskBatchResponse)
+def batch_tasks(batch: schemas.TaskBatchRequest):
+    def write(db: Session):
+        # 所有操作在同一個交易中完成，只 commit 一次
+        results = apply_task_batch(db, batch.operations)
+        if batch.atomic and any(r.status == "error" for r in results):
+            raise Rollback(JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content=schemas.TaskBatchResponse(results=results).dict()
+            ))
+        return results
+
+    try:
+        results = writer.run(write)
+        if isinstance(results, JSONResponse):
+            return results
+        summary = {}
+        for r in results:
+            if r.status == "ok":
+                summary.setdefault(r.op, []).append(r.id)
+        notify_change("tasks", "tasks.batch", summary)
+        return schemas.TaskBatchResponse(results=results)
+    except Exception as e:
+        logger.error("Error applying task batch: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 即時事件串流（Server-Sent Events）
+@app.get("/events")
+async def stream_events(request: Request):
+    subscriber = broker.subscribe()
+    return StreamingResponse(
+        broker.stream(subscriber, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 標籤統計
+@app.get("/tags", response_model=List[schemas.TagCount])
+def get_tag_facets(
+    type: schemas.ContentType = Query(schemas.ContentType.TASK),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    try:
+        return tagging.tag_facets(db, type.value, limit=limit)
+    except Exception as e:
+        logger.error("Error fetching tag facets: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 匯出與匯入
+@app.get("/export")
+def export_data(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    type: Optional[schemas.ContentType] = Query(None)
+):
+    # CSV 每個檔案只能有一種欄位結構
+    if format == "csv" and type is None:
+        raise HTTPException(status_code=400, detail="CSV export requires type=task or type=article")
+    kinds = [type.value] if type else ["task", "article"]
+    timestamp = datetime.now(pytz.timezone('Asia/Taipei')).strftime("%Y%m%d-%H%M%S")
+    filename = f"smart-todo-{'-'.join(kinds)}-{timestamp}.{format}"
+    if format == "csv":
+        content = transfer.export_csv(SessionLocal, kinds[0])
+        media_type = "text/csv; charset=utf-8"
+    else:
+        content = transfer.export_ndjson(SessionLocal, kinds)
+        media_type = "application/x-ndjson"
+    logger.info("Exporting %s as %s", kinds, format)
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/import", response_model=schemas.ImportResult)
+async def import_data(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    type: Optional[schemas.ContentType] = Query(None)
+):
+    # NDJSON 可由每行的 type 欄位決定種類，CSV 必須指定
+    if format == "csv" and type is None:
+        raise HTTPException(status_code=400, detail="CSV import requires type=task or type=article")
+    try:
+        result = await transfer.import_stream(
+            writer.run_async, request.stream(), format, type.value if type else None
+        )
+        if result.imported["task"]:
+            notify_change("tasks", "tasks.imported", {"count": result.imported["task"]})
+        if result.imported["article"]:
+            notify_change("articles", "articles.imported", {"count": result.imported["article"]})
+        return result
+    except Exception as e:
+        logger.error("Error importing data: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 任務統計
+@app.get("/analytics", response_model=schemas.Analytics)
+def get_analytics(days: int = Query(7, ge=1, le=90), db: Session = Depends(get_db)):
+    try:
+        return analytics.get_analytics(db, days=days)
+    except Exception as e:
+        logger.error("Error fetching analytics: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+# 全文搜尋
+@app.get("/search", response_model=List[schemas.SearchResult])
+def search_all(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[schemas.ContentType] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    if not search.search_available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Full-text search is not available"
+        )
+    try:
+        return search.search(db, q, kind=type.value if type else None, skip=skip, limit=limit)
+    except Exception as e:
+        logger.error("Error searching: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -214,17 +717,85 @@ def reorder_tasks(task_id: int, new_position: int, db: Session = Depends(get_db)
 # 文章相關的路由
 @app.get("/articles", response_model=List[schemas.Article])
 async def get_articles(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    view: str = Query("full", pattern="^(full|list)$"),
+    fields: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    tag_mode: str = Query("all", pattern="^(all|any)$"),
+    fast: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    # 欄位投影：view=list 使用精簡模型，fields= 指定任意欄位（id 一律包含）
+    columns = None
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in schemas.ARTICLE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        columns = ["id"] + [f for f in schemas.ARTICLE_FIELDS if f in requested and f != "id"]
+    elif view == "list":
+        columns = list(schemas.ARTICLE_LIST_FIELDS)
+
     try:
-        logger.info(f"Fetching articles with skip={skip} and limit={limit}")
-        articles = db.query(models.Article).offset(skip).limit(limit).all()
-        logger.info(f"Found {len(articles)} articles")
-        return articles
+        # 資料未變時直接回應 304
+        not_modified = await conditional_response_async(request, response, "articles")
+        if not_modified is not None:
+            return not_modified
+
+        cached = response_cache.lookup(request, "articles")
+        if cached.hit:
+            return cached.response(response.headers)
+
+        logger.info("Fetching articles with skip=%s and limit=%s", skip, limit)
+        conditions = []
+        tag_names = tagging.parse_tags(tags)
+        if tag_names:
+            conditions.append(models.Article.id.in_(tagging.tag_filter("article", tag_names, tag_mode == "all")))
+
+        if fast:
+            # 快速路徑：以 tuple 取回並直接序列化為 bytes
+            names = columns or fastjson.ARTICLE_FIELDS
+            result = await db.execute(
+                select(*fastjson.article_columns(names))
+                .where(*conditions).order_by(models.Article.id).offset(skip).limit(limit)
+            )
+            body = fastjson.dumps(fastjson.rows_to_dicts(result.all(), names))
+            cached.store(body)
+            return fastjson.ORJSONBytesResponse(content=body, headers=dict(response.headers))
+
+        if columns is None:
+            result = await db.execute(
+                select(models.Article).where(*conditions).order_by(models.Article.id).offset(skip).limit(limit)
+            )
+            articles = result.scalars().all()
+            logger.info("Found %s articles", len(articles))
+            if not response_cache.enabled:
+                return articles
+            body = fastjson.dump_models(schemas.Article, articles)
+            cached.store(body)
+            return fastjson.ORJSONBytesResponse(content=body, headers=dict(response.headers))
+
+        # 只在 SQL 層選取需要的欄位，不載入大型的 content 欄位
+        result = await db.execute(
+            select(*[getattr(models.Article, c) for c in columns])
+            .where(*conditions).order_by(models.Article.id).offset(skip).limit(limit)
+        )
+        rows = result.mappings().all()
+        logger.info("Found %s articles", len(rows))
+        if fields:
+            content = jsonable_encoder([dict(row) for row in rows])
+        else:
+            content = jsonable_encoder([schemas.ArticleListItem.model_validate(row) for row in rows])
+        if not response_cache.enabled:
+            return JSONResponse(content=content, headers=dict(response.headers))
+        body = fastjson.dumps(content)
+        cached.store(body)
+        return fastjson.ORJSONBytesResponse(content=body, headers=dict(response.headers))
     except Exception as e:
-        logger.error(f"Error fetching articles: {str(e)}")
+        logger.error("Error fetching articles: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -232,44 +803,107 @@ async def get_articles(
 
 @app.get("/articles/{article_id}", response_model=schemas.Article)
 async def get_article(
+    request: Request,
     article_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        logger.info(f"Fetching article with id={article_id}")
-        article = db.query(models.Article).filter(models.Article.id == article_id).first()
-        if article is None:
-            logger.warning(f"Article {article_id} not found")
-            raise HTTPException(status_code=404, detail="Article not found")
-        article.views += 1
-        db.commit()
-        logger.info(f"Article {article_id} found and views updated")
-        return article
+        logger.info("Fetching article with id=%s", article_id)
+        # 快取的內容為數據庫中的瀏覽數，回應時再加上記憶體中尚未寫回的部分；
+        # 多 worker 時先同步共用版本，其他 worker 的寫入會以 articles:* 使詳情快取失效
+        await table_versions.sync_async()
+        cached = response_cache.lookup(request, f"articles:{article_id}", "articles:*")
+        if cached.body is None:
+            article = await db.get(models.Article, article_id)
+            if article is None:
+                logger.warning("Article %s not found", article_id)
+                raise HTTPException(status_code=404, detail="Article not found")
+            data = schemas.Article.model_validate(article).model_dump(mode="json")
+            cached.store(orjson.dumps(data))
+        else:
+            data = orjson.loads(cached.body)
+        # 瀏覽數先累加在記憶體，由背景批次寫回，讀取不再產生寫入交易
+        view_counter.increment(article_id)
+        logger.info("Article %s found and view counted", article_id)
+        data = fastjson.add_views(data, view_counter.pending(article_id))
+        return fastjson.ORJSONBytesResponse(content=orjson.dumps(data))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching article: {str(e)}")
+        logger.error("Error fetching article: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
-@app.post("/articles", response_model=schemas.Article)
-async def create_article(
-    article: schemas.ArticleCreate,
-    db: Session = Depends(get_db)
+@app.get("/articles/{article_id}/related", response_model=List[schemas.RelatedArticle])
+async def get_related_articles(
+    article_id: int = Path(..., ge=1),
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    if not related.related_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Related articles are not available"
+        )
     try:
-        logger.info("Creating new article")
+        # 第一次建立完成前需等待；之後若背景正在同步，沿用目前的索引
+        await table_versions.sync_async()
+        await run_in_threadpool(related_index.sync, not related_index.ready)
+        results = await run_in_threadpool(related_index.related, article_id, limit)
+        if results is None:
+            # 可能是剛由其他 worker 建立、尚未補上的文章
+            if await db.get(models.Article, article_id) is None:
+                raise HTTPException(status_code=404, detail="Article not found")
+            related_index.mark_changed(article_id)
+            await run_in_threadpool(related_index.sync)
+            results = await run_in_threadpool(related_index.related, article_id, limit) or []
+        if not results:
+            return []
+
+        result = await db.execute(
+            select(*[getattr(models.Article, c) for c in schemas.ARTICLE_LIST_FIELDS])
+            .where(models.Article.id.in_([other for other, _ in results]))
+        )
+        rows = {row["id"]: row for row in result.mappings().all()}
+        articles = []
+        for other, score in results:
+            row = rows.get(other)
+            if row is None:
+                # 已由其他 worker 刪除
+                related_index.remove(other)
+                continue
+            articles.append(schemas.RelatedArticle(**row, score=round(score, 4)))
+        return articles
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error fetching related articles: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+@app.post("/articles", response_model=schemas.Article)
+async def create_article(article: schemas.ArticleCreate):
+    def write(db: Session):
         db_article = models.Article(**article.dict())
         db.add(db_article)
-        db.commit()
+        db.flush()
+        if db_article.tags:
+            tagging.sync_article_tags(db, {db_article.id: db_article.tags})
         db.refresh(db_article)
-        logger.info(f"Article created with id={db_article.id}")
+        return schemas.Article.model_validate(db_article)
+
+    try:
+        logger.info("Creating new article")
+        db_article = await writer.run_async(write)
+        notify_change("articles", "article.created", {"id": db_article.id})
+        logger.info("Article created with id=%s", db_article.id)
         return db_article
     except Exception as e:
-        logger.error(f"Error creating article: {str(e)}")
-        db.rollback()
+        logger.error("Error creating article: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -278,55 +912,59 @@ async def create_article(
 @app.put("/articles/{article_id}", response_model=schemas.Article)
 async def update_article(
     article_id: int = Path(..., ge=1),
-    article_update: schemas.ArticleUpdate = Body(...),
-    db: Session = Depends(get_db)
+    article_update: schemas.ArticleUpdate = Body(...)
 ):
-    try:
-        logger.info(f"Updating article {article_id}")
-        db_article = db.query(models.Article).filter(models.Article.id == article_id).first()
+    update_data = article_update.dict(exclude_unset=True)
+
+    def write(db: Session):
+        db_article = db.get(models.Article, article_id)
         if db_article is None:
-            logger.warning(f"Article {article_id} not found")
+            logger.warning("Article %s not found", article_id)
             raise HTTPException(status_code=404, detail="Article not found")
         
-        update_data = article_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_article, field, value)
+        if "tags" in update_data:
+            tagging.sync_article_tags(db, {article_id: db_article.tags})
         
-        db.commit()
+        db.flush()
         db.refresh(db_article)
-        logger.info(f"Article {article_id} updated successfully")
+        return schemas.Article.model_validate(db_article)
+
+    try:
+        logger.info("Updating article %s", article_id)
+        db_article = await writer.run_async(write)
+        notify_change("articles", "article.updated", {"id": article_id, "fields": list(update_data)})
+        logger.info("Article %s updated successfully", article_id)
         return db_article
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating article: {str(e)}")
-        db.rollback()
+        logger.error("Error updating article: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @app.delete("/articles/{article_id}")
-async def delete_article(
-    article_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db)
-):
-    try:
-        logger.info(f"Deleting article {article_id}")
-        db_article = db.query(models.Article).filter(models.Article.id == article_id).first()
+async def delete_article(article_id: int = Path(..., ge=1)):
+    def write(db: Session):
+        db_article = db.get(models.Article, article_id)
         if db_article is None:
-            logger.warning(f"Article {article_id} not found")
+            logger.warning("Article %s not found", article_id)
             raise HTTPException(status_code=404, detail="Article not found")
-        
         db.delete(db_article)
-        db.commit()
-        logger.info(f"Article {article_id} deleted successfully")
+
+    try:
+        logger.info("Deleting article %s", article_id)
+        await writer.run_async(write)
+        notify_change("articles", "article.deleted", {"id": article_id})
+        logger.info("Article %s deleted successfully", article_id)
         return {"status": "success"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting article: {str(e)}")
-        db.rollback()
+        logger.error("Error deleting article: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
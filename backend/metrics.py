@@ -0,0 +1,229 @@
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+from sqlalchemy import event
+import os
+import threading
+import time
+
+# 行程內的 Prometheus 指標，由 /metrics 以文字格式輸出。
+# 每次觀測只做一次 bisect 與數個整數累加，不依賴 prometheus_client，可常駐於正式環境。
+# 路由以樣板路徑（例如 /tasks/{task_id}）作為標籤，避免標籤數量隨 id 成長。
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# 秒
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values]
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def collect(self) -> List[str]:
+        lines = super().collect()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # 每組標籤：[各區間計數..., +Inf 計數, 總和]
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labels, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {values[-1]!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """註冊在輸出時才讀取數值的收集函數（例如連接池狀態）"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.collect()
+        for collector in self._collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+))
+http_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency until response headers are sent.", ("method", "route")
+))
+http_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method",)
+))
+db_statements = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time by statement type.",
+    ("engine", "operation"), buckets=DB_BUCKETS
+))
+db_errors = registry.register(Counter(
+    "db_statement_errors_total", "SQL statements that raised an error.", ("engine", "operation")
+))
+pool_events = registry.register(Counter(
+    "db_pool_events_total", "Connection pool connect/checkout/checkin events.", ("engine", "event")
+))
+pool_hold = registry.register(Histogram(
+    "db_pool_checkout_duration_seconds", "Time a connection stays checked out of the pool.",
+    ("engine",), buckets=DB_BUCKETS
+))
+
+
+def route_label(request) -> str:
+    """已匹配的路由樣板路徑；未匹配（404）時合併為單一標籤"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+def instrument_engine(engine, name: str) -> None:
+    """以引擎事件記錄每個語句的執行時間與連接池使用情形"""
+    if not METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        db_statements.observe(time.perf_counter() - started, name, _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        stack = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+        db_errors.inc(name, _operation(context.statement or ""))
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        pool_events.inc(name, "connect")
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_events.inc(name, "checkout")
+        connection_record.info["metrics_checkout"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        pool_events.inc(name, "checkin")
+        started = connection_record.info.pop("metrics_checkout", None)
+        if started is not None:
+            pool_hold.observe(time.perf_counter() - started, name)
+
+    _pools.append((name, engine))
+
+
+# 已掛上事件的引擎，輸出時讀取其連接池狀態
+_pools: List[Tuple[str, object]] = []
+
+
+def pool_status() -> List[str]:
+    """連接池目前狀態（輸出時讀取）"""
+    lines = []
+    for metric, attribute, help in (
+        ("db_pool_size", "size", "Configured pool size."),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out."),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool."),
+        ("db_pool_overflow", "overflow", "Overflow connections beyond the pool size (negative until the pool is full)."),
+    ):
+        values = [
+            (name, getattr(engine.pool, attribute)())
+            for name, engine in _pools if hasattr(engine.pool, attribute)
+        ]
+        if values:
+            lines += [f"# HELP {metric} {help}", f"# TYPE {metric} gauge"]
+            lines += [f'{metric}{{engine="{name}"}} {value}' for name, value in values]
+    return lines
+
+
+registry.add_collector(pool_status)
+
+
+def render() -> str:
+    return registry.render()
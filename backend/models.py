@@ -1,14 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, ForeignKey
 from sqlalchemy.sql import func
 from database import Base
 from enum import Enum as PyEnum
-from datetime import datetime
 import logging
 from sqlalchemy.types import TypeDecorator
 import pytz
 
-# 配置日誌
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 自定義 DateTime 類型，自動處理時區
@@ -35,16 +32,20 @@ class TaskStatus(str, PyEnum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 依狀態篩選並依位置排序（看板欄位）
+        Index("ix_tasks_status_position", "status", "position"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(String(1000))
     priority = Column(Integer, default=2)
     status = Column(String, default=TaskStatus.TODO)
-    due_date = Column(TZDateTime)
+    due_date = Column(TZDateTime, index=True)
     created_at = Column(TZDateTime, server_default=func.now())
     updated_at = Column(TZDateTime, server_default=func.now(), onupdate=func.now())
-    position = Column(Integer, default=0)
+    position = Column(Integer, default=0, index=True)
     tags = Column(String(255))
 
     def to_dict(self):
@@ -65,6 +66,25 @@ class Task(Base):
 # 在模型加載時記錄
 logger.info("Task model loaded successfully")
 
+# 已封存的任務：完成超過一段時間的任務由 archive.py 分批移出 tasks，
+# 保持看板查詢、位置更新與統計只處理仍在使用的任務。原任務 id 存在 task_id，還原時盡量沿用；
+# tasks.id 沒有 AUTOINCREMENT，封存最大 id 後新任務可能沿用同一個 id，因此同一個 task_id 可能封存多次
+class ArchivedTask(Base):
+    __tablename__ = "archived_tasks"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(String(1000))
+    priority = Column(Integer, default=2)
+    status = Column(String, default=TaskStatus.DONE)
+    due_date = Column(TZDateTime)
+    created_at = Column(TZDateTime)
+    updated_at = Column(TZDateTime)
+    position = Column(Integer, default=0)
+    tags = Column(String(255))
+    archived_at = Column(TZDateTime, nullable=False, index=True)
+
 class Article(Base):
     __tablename__ = "articles"
 
@@ -72,9 +92,10 @@ class Article(Base):
     title = Column(String(255), nullable=False)
     content = Column(String(10000), nullable=False)
     summary = Column(String(500), nullable=True)
-    category = Column(String(100), nullable=True)
-    created_at = Column(TZDateTime, server_default=func.now())
-    updated_at = Column(TZDateTime, server_default=func.now(), onupdate=func.now())
+    category = Column(String(100), nullable=True, index=True)
+    created_at = Column(TZDateTime, server_default=func.now(), index=True)
+    # 相關文章索引依 updated_at 補上其他 worker 的修改（見 related.py）
+    updated_at = Column(TZDateTime, server_default=func.now(), onupdate=func.now(), index=True)
     views = Column(Integer, default=0)
     tags = Column(String(255), nullable=True)
 
@@ -94,3 +115,32 @@ class Article(Base):
 
 # 在模型加載時記錄
 logger.info("Article model loaded successfully")
+
+# 標籤正規化儲存：tags 字串欄位仍保留於 API 回應，
+# 另以標籤表與關聯表建立倒排索引，供標籤篩選與統計使用
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True, index=True)
+
+class TaskTag(Base):
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+    )
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+class ArticleTag(Base):
+    __tablename__ = "article_tags"
+    __table_args__ = (
+        Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+    )
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+# 在模型加載時記錄
+logger.info("Tag models loaded successfully")
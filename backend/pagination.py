@@ -0,0 +1,21 @@
+import base64
+import json
+from typing import Tuple
+
+
+# 游標分頁（keyset pagination）工具
+# 游標內容為 (position, id)，以 base64url 編碼成不透明字串
+def encode_cursor(position: int, task_id: int) -> str:
+    """將排序鍵編碼為游標"""
+    raw = json.dumps([position, task_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """解析游標，格式錯誤時拋出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(position), int(task_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
@@ -0,0 +1,64 @@
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+import logging
+import models
+
+logger = logging.getLogger(__name__)
+
+# 任務位置採用稀疏整數（間隔 POSITION_GAP），
+# 移動或刪除只需改寫單一列；間隔用盡時才整體重新編號
+POSITION_GAP = 1024
+
+
+def next_position(db: Session) -> int:
+    """取得新增任務時排在最後的位置"""
+    max_position = db.query(models.Task.position).order_by(models.Task.position.desc()).limit(1).scalar()
+    return (max_position or 0) + POSITION_GAP
+
+
+def position_between(before: Optional[int], after: Optional[int]) -> Optional[int]:
+    """計算兩個位置之間的新位置，沒有空隙時返回 None"""
+    if before is None and after is None:
+        return POSITION_GAP
+    if before is None:
+        return after // 2 if after > 1 else None
+    if after is None:
+        return before + POSITION_GAP
+    if after - before < 2:
+        return None
+    return before + (after - before) // 2
+
+
+def position_for_index(db: Session, task_id: int, index: int) -> Optional[int]:
+    """計算任務移到排序第 index 位時的新位置（不計入任務本身）"""
+    others = db.query(models.Task.position).filter(
+        models.Task.id != task_id
+    ).order_by(models.Task.position, models.Task.id)
+
+    if index <= 0:
+        after = others.limit(1).scalar()
+        return position_between(None, after)
+
+    neighbours = [row.position for row in others.offset(index - 1).limit(2).all()]
+    if not neighbours:
+        # 超出範圍時放到最後
+        before = db.query(models.Task.position).filter(
+            models.Task.id != task_id
+        ).order_by(models.Task.position.desc()).limit(1).scalar()
+        return position_between(before, None)
+    if len(neighbours) == 1:
+        return position_between(neighbours[0], None)
+    return position_between(neighbours[0], neighbours[1])
+
+
+def rebalance_positions(db: Session) -> int:
+    """依目前順序重新編號所有任務位置，返回更新的任務數"""
+    rows = db.query(models.Task.id).order_by(models.Task.position, models.Task.id).all()
+    if rows:
+        db.execute(
+            update(models.Task),
+            [{"id": row.id, "position": (i + 1) * POSITION_GAP} for i, row in enumerate(rows)]
+        )
+    logger.info("Rebalanced positions for %d tasks", len(rows))
+    return len(rows)
@@ -0,0 +1,162 @@
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import event
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 選用的逐請求 SQL 分析器（SQL_PROFILE=true 時啟用）。
+# 每個請求記錄所有語句的 SQL、耗時與 DML 影響筆數，並以 Server-Timing 標頭回傳；
+# 超過語句數或耗時預算、或同一語句重複執行（N+1）時記錄警告，
+# 另依路由彙總，可由 /debug/sql-profile 查看或於關閉時寫入 SQL_PROFILE_DUMP。
+SQL_PROFILE_ENABLED = os.getenv("SQL_PROFILE", "false").lower() == "true"
+SQL_PROFILE_MAX_QUERIES = int(os.getenv("SQL_PROFILE_MAX_QUERIES", "20"))
+SQL_PROFILE_MAX_DB_MS = float(os.getenv("SQL_PROFILE_MAX_DB_MS", "100"))
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "5"))
+SQL_PROFILE_DUMP = os.getenv("SQL_PROFILE_DUMP", "")
+SQL_PROFILE_SLOWEST = 5
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.statements: List[dict] = []
+
+    def record(self, statement: str, duration: float, rows: Optional[int], executemany: bool) -> None:
+        self.statements.append({
+            "sql": " ".join(statement.split()),
+            "ms": round(duration * 1000, 3),
+            "rows": rows,
+            "executemany": executemany,
+        })
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_ms(self) -> float:
+        return sum(s["ms"] for s in self.statements)
+
+    def repeated(self, threshold: int = SQL_PROFILE_REPEAT_THRESHOLD) -> Dict[str, int]:
+        """同一個請求中重複執行達門檻的語句（可能是 N+1 查詢）"""
+        counts: Dict[str, int] = {}
+        for s in self.statements:
+            if not s["executemany"]:
+                counts[s["sql"]] = counts.get(s["sql"], 0) + 1
+        return {sql: count for sql, count in counts.items() if count >= threshold}
+
+    def server_timing(self, total_ms: float) -> str:
+        return f'db;desc="{self.query_count} queries";dur={self.db_ms:.2f}, total;dur={total_ms:.2f}'
+
+
+class ProfileSummary:
+    """依路由彙總請求的語句數與數據庫耗時"""
+
+    def __init__(self):
+        self._routes: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, profile: RequestProfile, total_ms: float, flagged: bool) -> None:
+        slowest = sorted(profile.statements, key=lambda s: s["ms"], reverse=True)[:SQL_PROFILE_SLOWEST]
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries_total": 0,
+                "queries_max": 0,
+                "db_ms_total": 0.0,
+                "db_ms_max": 0.0,
+                "total_ms_total": 0.0,
+                "over_budget": 0,
+                "slowest": [],
+            })
+            entry["requests"] += 1
+            entry["queries_total"] += profile.query_count
+            entry["queries_max"] = max(entry["queries_max"], profile.query_count)
+            entry["db_ms_total"] += profile.db_ms
+            entry["db_ms_max"] = max(entry["db_ms_max"], profile.db_ms)
+            entry["total_ms_total"] += total_ms
+            entry["over_budget"] += int(flagged)
+            entry["slowest"] = sorted(entry["slowest"] + slowest, key=lambda s: s["ms"], reverse=True)[:SQL_PROFILE_SLOWEST]
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            routes = {route: dict(entry) for route, entry in self._routes.items()}
+        for entry in routes.values():
+            requests = entry["requests"]
+            entry["queries_avg"] = round(entry["queries_total"] / requests, 2)
+            entry["db_ms_avg"] = round(entry["db_ms_total"] / requests, 3)
+            entry["total_ms_avg"] = round(entry["total_ms_total"] / requests, 3)
+            entry["db_ms_total"] = round(entry["db_ms_total"], 3)
+            entry["db_ms_max"] = round(entry["db_ms_max"], 3)
+            entry["total_ms_total"] = round(entry["total_ms_total"], 3)
+        return dict(sorted(routes.items(), key=lambda item: item[1]["db_ms_total"], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def dump(self, path: str = SQL_PROFILE_DUMP) -> None:
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        logger.info("SQL profile summary written to %s", path)
+
+
+summary = ProfileSummary()
+
+
+def start() -> RequestProfile:
+    """開始記錄目前請求的語句"""
+    profile = RequestProfile()
+    _current.set(profile)
+    return profile
+
+
+def finish(route: str, method: str, profile: RequestProfile, total_ms: float) -> None:
+    """檢查預算與重複語句，並加入路由彙總"""
+    endpoint = f"{method} {route}"
+    repeated = profile.repeated()
+    over_budget = profile.query_count > SQL_PROFILE_MAX_QUERIES or profile.db_ms > SQL_PROFILE_MAX_DB_MS
+    if over_budget:
+        logger.warning(
+            "%s exceeded SQL budget: %d queries, %.2fms in database, %.2fms total",
+            endpoint, profile.query_count, profile.db_ms, total_ms
+        )
+    for sql, count in repeated.items():
+        logger.warning("%s executed the same statement %s times (possible N+1): %s", endpoint, count, sql[:200])
+    summary.add(endpoint, profile, total_ms, over_budget or bool(repeated))
+
+
+def instrument_engine(engine) -> None:
+    """在引擎上記錄屬於目前請求的語句"""
+    if not SQL_PROFILE_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        stack = conn.info.get("profile_started")
+        if profile is None or not stack:
+            return
+        duration = time.perf_counter() - stack.pop()
+        # 只記錄 DML 的影響筆數；回傳資料列的語句（SELECT、RETURNING）在事件之後才逐批取回，無法得知筆數
+        rows = cursor.rowcount if cursor.description is None and cursor.rowcount >= 0 else None
+        profile.record(statement, duration, rows, executemany)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        stack = context.connection.info.get("profile_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
@@ -0,0 +1,589 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import Counter
+from sqlalchemy import select
+from database import SessionLocal
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+import metrics
+import models
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    from scipy import sparse
+    related_available = True
+except ImportError:  # pragma: no cover - 依部署環境而定
+    np = sparse = None
+    related_available = False
+
+# 相關文章推薦：以標題、摘要與內文建立 TF-IDF 稀疏矩陣，依餘弦相似度取前 k 篇。
+# 啟動時建立一次（背景執行緒），之後文章新增、修改、刪除只更新該篇：
+# 新的向量先放在增量區（小型倒排表），舊的列標記為失效；累積到一定比例才合併重建矩陣，
+# 同時以最新的文件頻率重新計算 idf 與向量長度。
+#
+# 查詢只使用來源文章 tf-idf 最高的 RELATED_QUERY_TERMS 個詞（更多相似文章常用的做法），
+# 以 CSC 矩陣取出這些詞的欄位加總分數，成本與這些詞的文件數成正比，不需掃描整個矩陣。
+# 中文、日文與韓文以相鄰兩字（bigram）為詞，英數以單字為詞。
+#
+# 多 worker 時各 worker 各自建立索引；其他 worker 的修改依 updated_at 補上
+# （最多每 RELATED_SYNC_INTERVAL 秒掃描一次），已刪除的文章在查詢時略過並移除。
+#
+# 記憶體：每篇文章約 3.6 KB（十萬篇約 360 MB，其中詞彙表約四成），建立與合併期間峰值約為四倍，
+# 建立十萬篇約 80 秒（見 benchmarks/related_index.py）；總用量再乘以 WEB_CONCURRENCY。
+# 記憶體不足時設定 RELATED_INDEX=false 停用（/articles/{id}/related 返回 503，不載入索引）。
+RELATED_INDEX = os.getenv("RELATED_INDEX", "true").lower() == "true"
+RELATED_QUERY_TERMS = int(os.getenv("RELATED_QUERY_TERMS", "32"))
+RELATED_MERGE_RATIO = float(os.getenv("RELATED_MERGE_RATIO", "0.1"))
+RELATED_SYNC_INTERVAL = float(os.getenv("RELATED_SYNC_INTERVAL", "10"))
+
+# 相關文章功能是否啟用：需要 numpy／scipy 且未以 RELATED_INDEX 停用
+related_enabled = related_available and RELATED_INDEX
+
+TITLE_WEIGHT = 2
+MIN_MERGE_ROWS = 32
+LOAD_BATCH_SIZE = 500
+SQLITE_MAX_VARIABLES = 900
+
+# 假名、中日韓統一表意文字（含擴充 A 與相容字）、韓文音節
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN = re.compile("[" + _CJK + "]+|[a-z0-9]+")
+_CJK_RUN = re.compile("[" + _CJK + "]")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """中日韓文字以 bigram（單一字時為該字）、英數以單字為詞，英文略過停用詞與單一字母"""
+    terms: List[str] = []
+    if not text:
+        return terms
+    for run in _TOKEN.findall(text.lower()):
+        if _CJK_RUN.match(run):
+            if len(run) == 1:
+                terms.append(run)
+            else:
+                terms.extend(map(str.__add__, run[:-1], run[1:]))
+        elif len(run) > 1 and run not in _STOPWORDS:
+            terms.append(run)
+    return terms
+
+
+def document_terms(title: Optional[str], summary: Optional[str], content: Optional[str]) -> Counter:
+    counts = Counter(tokenize(summary))
+    counts.update(tokenize(content))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+Document = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+class RelatedIndex:
+    def __init__(self, session_factory=SessionLocal, query_terms: int = RELATED_QUERY_TERMS,
+                 merge_ratio: float = RELATED_MERGE_RATIO, sync_interval: float = RELATED_SYNC_INTERVAL):
+        self._session_factory = session_factory
+        self._query_terms = query_terms
+        self._merge_ratio = merge_ratio
+        self._sync_interval = sync_interval
+        self._lock = threading.Lock()
+        # 同一時間只有一個建立或同步
+        self._sync_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._built = False
+        self._pending: Set[int] = set()
+        self._rebuild = False
+        self._foreign = False
+        self._watermark: Optional[datetime] = None
+        self._last_scan = 0.0
+        self._stop = False
+        self._thread = None
+        self._reset()
+
+    # --- 內部狀態 ---------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._vocab: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int32) if related_available else None
+        # 每個詞的 idf，於建立或合併時計算，之後新增的詞於第一次出現時計算；合併前不再變動，
+        # 向量長度與查詢使用同一組 idf，餘弦相似度才會一致
+        self._term_idf = np.zeros(0, dtype=np.float32) if related_available else None
+        self._documents = 0
+        # 主矩陣：列為 slot、欄為詞，值為 1 + log(tf)
+        self._matrix = None
+        self._main_slots = 0
+        # slot 對應的文章、是否有效、向量長度與查詢詞（-1 為空位）
+        self._slots: Dict[int, int] = {}
+        self._slot_ids = None
+        self._alive = None
+        self._norms = None
+        self._sig_terms = None
+        self._sig_weights = None
+        self._slot_count = 0
+        self._dead = 0
+        # 增量區：主矩陣之後的 slot 與其倒排表
+        self._delta_rows: Dict[int, Tuple["np.ndarray", "np.ndarray"]] = {}
+        self._delta_postings: Dict[int, List[Tuple[int, float]]] = {}
+        # 記憶體用量：詞彙表走訪成本與詞數成正比，於建立或合併時計算一次；增量區隨新增累加
+        self._vocabulary_bytes = 0
+        self._delta_bytes = 0
+
+    def _idf(self, terms: "np.ndarray") -> "np.ndarray":
+        return self._term_idf[terms]
+
+    def _term_ids(self, counts: Counter, grow: bool) -> Tuple["np.ndarray", "np.ndarray"]:
+        terms = []
+        weights = []
+        for term, count in counts.items():
+            term_id = self._vocab.get(term)
+            if term_id is None:
+                if not grow:
+                    continue
+                term_id = self._vocab[term] = len(self._vocab)
+            terms.append(term_id)
+            weights.append(1.0 + math.log(count))
+        order = np.argsort(np.asarray(terms, dtype=np.int32), kind="stable")
+        return (np.asarray(terms, dtype=np.int32)[order], np.asarray(weights, dtype=np.float32)[order])
+
+    def _signature(self, terms: "np.ndarray", tf: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", float]:
+        """返回 (查詢詞, 查詢詞的 tf, 向量長度)"""
+        weights = tf * self._idf(terms)
+        norm = float(np.sqrt(np.dot(weights, weights)))
+        k = min(self._query_terms, len(terms))
+        top = np.argpartition(-weights, k - 1)[:k] if 0 < k < len(terms) else np.arange(len(terms))
+        sig_terms = np.full(self._query_terms, -1, dtype=np.int32)
+        sig_tf = np.zeros(self._query_terms, dtype=np.float32)
+        sig_terms[:len(top)] = terms[top]
+        sig_tf[:len(top)] = tf[top]
+        return sig_terms, sig_tf, norm
+
+    def _grow_slots(self, needed: int) -> None:
+        capacity = 0 if self._slot_ids is None else len(self._slot_ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 64)
+
+        def grow(array, fill, dtype, width=None):
+            shape = (capacity,) if width is None else (capacity, width)
+            grown = np.full(shape, fill, dtype=dtype)
+            if array is not None:
+                grown[:len(array)] = array
+            return grown
+
+        self._slot_ids = grow(self._slot_ids, -1, np.int64)
+        self._alive = grow(self._alive, False, np.bool_)
+        self._norms = grow(self._norms, 0, np.float32)
+        self._sig_terms = grow(self._sig_terms, -1, np.int32, self._query_terms)
+        self._sig_weights = grow(self._sig_weights, 0, np.float32, self._query_terms)
+
+    def _remove_locked(self, article_id: int) -> bool:
+        slot = self._slots.pop(article_id, None)
+        if slot is None:
+            return False
+        # 文件頻率在下次合併時重新計算
+        self._alive[slot] = False
+        self._documents -= 1
+        self._dead += 1
+        return True
+
+    def _add_locked(self, article_id: int, counts: Counter) -> None:
+        self._remove_locked(article_id)
+        terms, tf = self._term_ids(counts, grow=True)
+        if len(self._vocab) > len(self._df):
+            df = np.zeros(max(len(self._vocab), len(self._df) * 2), dtype=np.int32)
+            df[:len(self._df)] = self._df
+            self._df = df
+        self._df[terms] += 1
+        self._documents += 1
+        known = len(self._term_idf)
+        if len(self._vocab) > known:
+            df = self._df[known:len(self._vocab)].astype(np.float32)
+            self._term_idf = np.concatenate([
+                self._term_idf, np.log((1.0 + self._documents) / (1.0 + df)).astype(np.float32) + 1.0
+            ])
+        slot = self._slot_count
+        self._slot_count += 1
+        self._grow_slots(self._slot_count)
+        sig_terms, sig_tf, norm = self._signature(terms, tf)
+        self._slots[article_id] = slot
+        self._slot_ids[slot] = article_id
+        self._alive[slot] = True
+        self._norms[slot] = norm
+        self._sig_terms[slot] = sig_terms
+        self._sig_weights[slot] = sig_tf
+        self._delta_rows[slot] = (terms, tf)
+        self._delta_bytes += terms.nbytes + tf.nbytes
+        for term, value in zip(terms.tolist(), tf.tolist()):
+            self._delta_postings.setdefault(term, []).append((slot, value))
+
+    def _needs_merge(self) -> bool:
+        changed = len(self._delta_rows) + self._dead
+        return changed >= max(MIN_MERGE_ROWS, self._merge_ratio * max(self._documents, 1))
+
+    # --- 建立與合併 -------------------------------------------------------
+
+    def _build_state(self, rows: "sparse.csr_matrix", article_ids: "np.ndarray", vocab: Dict[str, int]) -> dict:
+        """由 tf 矩陣（列為文章）計算 idf、向量長度與查詢詞，返回新的狀態"""
+        count = rows.shape[0]
+        df = np.bincount(rows.indices, minlength=len(vocab)).astype(np.int32)
+        idf = (np.log((1.0 + count) / (1.0 + df.astype(np.float32))) + 1.0).astype(np.float32)
+        # 直接在 data 陣列上計算，不建立加權後的矩陣副本（十萬篇時每個副本約 200 MB）
+        indptr, indices, tf = rows.indptr, rows.indices, rows.data
+        data = tf * idf[indices]
+        squares = data * data
+        norms = np.zeros(count, dtype=np.float32)
+        nonempty = np.flatnonzero(np.diff(indptr))
+        if len(nonempty):
+            norms[nonempty] = np.sqrt(np.add.reduceat(squares, indptr[nonempty]))
+        del squares
+
+        k = self._query_terms
+        sig_terms = np.full((count, k), -1, dtype=np.int32)
+        sig_weights = np.zeros((count, k), dtype=np.float32)
+        for slot in range(count):
+            start, end = indptr[slot], indptr[slot + 1]
+            n = end - start
+            if n == 0:
+                continue
+            if n > k:
+                top = start + np.argpartition(-data[start:end], k - 1)[:k]
+            else:
+                top = np.arange(start, end)
+            sig_terms[slot, :len(top)] = indices[top]
+            sig_weights[slot, :len(top)] = tf[top]
+
+        vocabulary_bytes = sys.getsizeof(vocab) + sum(map(sys.getsizeof, vocab)) + 28 * len(vocab) + df.nbytes
+
+        return {
+            "vocab": vocab, "df": df, "idf": idf, "documents": count, "matrix": rows.tocsc(),
+            "slot_ids": article_ids.astype(np.int64), "norms": norms,
+            "sig_terms": sig_terms, "sig_weights": sig_weights, "vocabulary_bytes": vocabulary_bytes,
+        }
+
+    def _install(self, state: dict) -> None:
+        count = state["documents"]
+        self._reset()
+        self._vocab = state["vocab"]
+        self._df = state["df"]
+        self._term_idf = state["idf"]
+        self._documents = count
+        self._matrix = state["matrix"]
+        self._main_slots = count
+        self._slot_count = count
+        self._slot_ids = state["slot_ids"]
+        self._alive = np.ones(count, dtype=np.bool_)
+        self._norms = state["norms"]
+        self._sig_terms = state["sig_terms"]
+        self._sig_weights = state["sig_weights"]
+        self._slots = {int(article_id): slot for slot, article_id in enumerate(self._slot_ids.tolist())}
+        self._vocabulary_bytes = state["vocabulary_bytes"]
+
+    def build_from(self, documents: Iterable[Document]) -> int:
+        """以 (id, 標題, 摘要, 內文) 建立索引，取代目前的內容，返回文章數"""
+        started = time.perf_counter()
+        vocab: Dict[str, int] = {}
+        article_ids: List[int] = []
+        indptr = [0]
+        indices: List["np.ndarray"] = []
+        data: List["np.ndarray"] = []
+        for article_id, title, summary, content in documents:
+            counts = document_terms(title, summary, content)
+            terms = np.fromiter((vocab.setdefault(term, len(vocab)) for term in counts), dtype=np.int32,
+                                count=len(counts))
+            tf = np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts))) + 1.0
+            article_ids.append(article_id)
+            indices.append(terms)
+            data.append(tf)
+            indptr.append(indptr[-1] + len(terms))
+        rows = sparse.csr_matrix(
+            (np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+             np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+             np.asarray(indptr, dtype=np.int64)),
+            shape=(len(article_ids), len(vocab))
+        )
+        rows.sort_indices()
+        del indices, data
+        state = self._build_state(rows, np.asarray(article_ids, dtype=np.int64), vocab)
+        with self._lock:
+            self._install(state)
+            self._built = True
+        logger.info("Related-article index built: %s articles, %s terms in %.2fs",
+                    len(article_ids), len(vocab), time.perf_counter() - started)
+        return len(article_ids)
+
+    def merge(self) -> None:
+        """把增量區併入主矩陣並移除失效的列，以目前的文件頻率重新計算 idf"""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._slot_count])
+            main_live = live[live < self._main_slots]
+            parts = []
+            if self._matrix is not None and len(main_live):
+                main = self._matrix.tocsr()
+                if len(main_live) < main.shape[0]:
+                    main = main[main_live]
+                # 詞彙在上次合併後可能增加
+                parts.append(sparse.csr_matrix(
+                    (main.data, main.indices, main.indptr), shape=(main.shape[0], len(self._vocab))
+                ))
+            delta_slots = [slot for slot in live.tolist() if slot >= self._main_slots]
+            if delta_slots:
+                terms = [self._delta_rows[slot][0] for slot in delta_slots]
+                values = [self._delta_rows[slot][1] for slot in delta_slots]
+                indptr = np.concatenate([[0], np.cumsum([len(t) for t in terms])]).astype(np.int64)
+                parts.append(sparse.csr_matrix(
+                    (np.concatenate(values), np.concatenate(terms), indptr),
+                    shape=(len(delta_slots), len(self._vocab))
+                ))
+            if len(parts) > 1:
+                rows = sparse.vstack(parts, format="csr")
+            elif parts:
+                rows = parts[0]
+            else:
+                rows = sparse.csr_matrix((0, len(self._vocab)), dtype=np.float32)
+            article_ids = self._slot_ids[np.concatenate([main_live, np.asarray(delta_slots, dtype=np.int64)])]
+            vocab = self._vocab
+        # 重新計算時不持有鎖，查詢照常使用舊狀態；呼叫端持有 _sync_lock，期間不會套用其他修改
+        # （查詢時移除的已刪除文章若在此期間發生，下次查詢會再移除一次）
+        state = self._build_state(rows, article_ids, vocab)
+        with self._lock:
+            self._install(state)
+        logger.info("Related-article index merged: %s articles", state["documents"])
+
+    # --- 查詢 -------------------------------------------------------------
+
+    def related(self, article_id: int, limit: int = 5) -> Optional[List[Tuple[int, float]]]:
+        """返回 (文章 id, 相似度) 依相似度排序；文章不在索引中時返回 None"""
+        with self._lock:
+            slot = self._slots.get(article_id)
+            if slot is None:
+                return None
+            mask = self._sig_terms[slot] >= 0
+            terms = self._sig_terms[slot][mask]
+            if not len(terms):
+                return []
+            query = self._sig_weights[slot][mask] * self._idf(terms) ** 2
+
+            scores = np.zeros(self._slot_count, dtype=np.float64)
+            matrix = self._matrix
+            if matrix is not None:
+                main_terms = terms < matrix.shape[1]
+                if main_terms.any():
+                    columns = terms[main_terms]
+                    starts = matrix.indptr[columns]
+                    lengths = matrix.indptr[columns + 1] - starts
+                    total = int(lengths.sum())
+                    if total:
+                        # 一次取出所有查詢詞的欄位：各段的起點加上段內位移
+                        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+                        weights = np.repeat(query[main_terms], lengths) * matrix.data[offsets]
+                        scores[:matrix.shape[0]] += np.bincount(
+                            matrix.indices[offsets], weights=weights, minlength=matrix.shape[0]
+                        )
+            for term, weight in zip(terms.tolist(), query.tolist()):
+                for other, tf in self._delta_postings.get(term, ()):
+                    scores[other] += weight * tf
+
+            norms = self._norms[:self._slot_count]
+            np.divide(scores, norms, out=scores, where=norms > 0)
+            scores[~self._alive[:self._slot_count]] = 0
+            scores[slot] = 0
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            # 除以來源文章的向量長度，得到餘弦相似度（只以查詢詞計算，為近似值）
+            source_norm = float(self._norms[slot]) or 1.0
+            return [(int(self._slot_ids[other]), float(scores[other]) / source_norm) for other in candidates]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        各部分佔用的記憶體（bytes，詞彙表為估計值）。
+        詞彙表為上次建立或合併時的用量，之後新增的詞在下次合併時計入。
+        """
+        with self._lock:
+            usage = {"matrix": 0, "slots": 0, "signatures": 0,
+                     "vocabulary": self._vocabulary_bytes, "delta": self._delta_bytes}
+            if self._matrix is not None:
+                usage["matrix"] = self._matrix.data.nbytes + self._matrix.indices.nbytes + self._matrix.indptr.nbytes
+            if self._slot_ids is not None:
+                usage["slots"] = (self._slot_ids.nbytes + self._alive.nbytes + self._norms.nbytes
+                                  + sys.getsizeof(self._slots) + 28 * len(self._slots))
+                usage["signatures"] = self._sig_terms.nbytes + self._sig_weights.nbytes
+            return usage
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"articles": self._documents, "terms": len(self._vocab), "delta": len(self._delta_rows)}
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    # --- 與數據庫同步 -----------------------------------------------------
+
+    def _load(self, db, ids: Optional[List[int]] = None) -> Iterator[Document]:
+        query = select(models.Article.id, models.Article.title, models.Article.summary, models.Article.content)
+        if ids is None:
+            for row in db.execute(query.order_by(models.Article.id).execution_options(yield_per=LOAD_BATCH_SIZE)):
+                yield tuple(row)
+            return
+        for i in range(0, len(ids), SQLITE_MAX_VARIABLES):
+            for row in db.execute(query.where(models.Article.id.in_(ids[i:i + SQLITE_MAX_VARIABLES]))):
+                yield tuple(row)
+
+    def build(self) -> int:
+        """從數據庫建立索引"""
+        with self._sync_lock:
+            return self._build()
+
+    def _build(self) -> int:
+        with self._cond:
+            self._pending.clear()
+            self._rebuild = self._foreign = False
+        # updated_at 只有秒級精度，保留一秒的重疊
+        watermark = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db = self._session_factory()
+        try:
+            count = self.build_from(self._load(db))
+        finally:
+            db.close()
+        self._watermark = watermark
+        self._last_scan = time.monotonic()
+        return count
+
+    def mark_changed(self, article_id: Optional[int] = None) -> None:
+        """本行程寫入文章後呼叫；article_id 為 None（例如匯入）時重新建立整個索引"""
+        with self._cond:
+            if article_id is None:
+                self._rebuild = True
+            else:
+                self._pending.add(article_id)
+            self._cond.notify()
+
+    def mark_foreign_change(self) -> None:
+        """其他 worker 寫入文章時呼叫（見 versions.py 的共用版本）"""
+        with self._cond:
+            self._foreign = True
+            self._cond.notify()
+
+    def sync(self, blocking: bool = True) -> None:
+        """套用尚未處理的修改；blocking=False 時若另一個同步進行中則直接返回（沿用目前的索引）"""
+        if not self._sync_lock.acquire(blocking):
+            return
+        try:
+            if not self._built:
+                self._build()
+                return
+            with self._cond:
+                rebuild = self._rebuild
+                ids = set(self._pending)
+                self._pending.clear()
+                scan = self._foreign and time.monotonic() - self._last_scan >= self._sync_interval
+                if scan:
+                    self._foreign = False
+            if rebuild:
+                self._build()
+                return
+            if not ids and not scan:
+                return
+            db = self._session_factory()
+            try:
+                if scan:
+                    now = datetime.now(timezone.utc) - timedelta(seconds=1)
+                    ids.update(db.execute(
+                        select(models.Article.id).where(models.Article.updated_at >= self._watermark)
+                    ).scalars().all())
+                    self._watermark = now
+                    self._last_scan = time.monotonic()
+                ids = sorted(ids)
+                documents = list(self._load(db, ids))
+            finally:
+                db.close()
+            found = set()
+            with self._lock:
+                for article_id, title, summary, content in documents:
+                    found.add(article_id)
+                    self._add_locked(article_id, document_terms(title, summary, content))
+                for article_id in ids:
+                    if article_id not in found:
+                        self._remove_locked(article_id)
+                merge = self._needs_merge()
+            if merge:
+                self.merge()
+        finally:
+            self._sync_lock.release()
+
+    def remove(self, article_id: int) -> None:
+        """查詢時發現已刪除的文章（其他 worker 刪除）"""
+        with self._lock:
+            self._remove_locked(article_id)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sync()
+                retry = None
+            except Exception as e:
+                logger.error("Error updating related-article index: %s", e)
+                retry = 1.0
+            with self._cond:
+                if retry is not None and not self._stop:
+                    self._cond.wait(retry)
+                while not self._stop and not (self._pending or self._rebuild):
+                    if not self._foreign:
+                        self._cond.wait()
+                        continue
+                    # 其他 worker 的修改依間隔批次補上
+                    remaining = self._sync_interval - (time.monotonic() - self._last_scan)
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stop:
+                    return
+
+    def start(self) -> None:
+        """在背景建立索引並處理之後的修改（缺少 numpy／scipy 或 RELATED_INDEX=false 時不啟動）"""
+        if self._thread is not None or not related_enabled:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="related-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+related_index = RelatedIndex()
+
+
+def index_status() -> List[str]:
+    """索引的文章數、詞彙數與記憶體用量（輸出時讀取）"""
+    if not related_enabled or not related_index.ready:
+        return []
+    stats = related_index.stats()
+    lines = []
+    for name, help in (("articles", "Articles in the related-article index."),
+                       ("terms", "Distinct terms in the related-article index.")):
+        lines += [f"# HELP related_index_{name} {help}", f"# TYPE related_index_{name} gauge",
+                  f"related_index_{name} {stats[name]}"]
+    lines += ["# HELP related_index_bytes Memory used by the related-article index.",
+              "# TYPE related_index_bytes gauge"]
+    lines += [f'related_index_bytes{{part="{part}"}} {size}'
+              for part, size in sorted(related_index.memory_usage().items())]
+    return lines
+
+
+metrics.registry.add_collector(index_status)
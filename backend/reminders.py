@@ -0,0 +1,314 @@
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+import changes
+import metrics
+import models
+
+logger = logging.getLogger(__name__)
+
+# 到期提醒：未完成且有 due_date 的任務以最小堆積維護在記憶體中。
+# 啟動時載入一次，之後只依變更紀錄（task_changes 的 seq 游標，見 changes.py）讀取有變動的任務，
+# 涵蓋單筆寫入、批次、匯入、封存與其他 worker 的寫入，不需定期掃描整張表。
+# 背景執行緒睡到下一個提醒時間：到期前 TASK_REMINDER_LEAD_MINUTES 分鐘發出 task.due，
+# 到期時發出 task.overdue。載入前已過的提醒時間不補發（避免重啟時重複提醒）。
+# 多 worker 時每個 worker 都維護索引，發出前先在 task_reminders 以 INSERT OR IGNORE 認領
+# (任務, 種類, 到期時間)，只有寫入成功的 worker 寫入日誌、計數並送出 webhook，不會重複；
+# 即時事件則由每個 worker 送給自己的 SSE 訂閱者（各 worker 的索引相同）。
+#
+# TASK_REMINDERS=false：停用背景提醒（/tasks/due 照常可用）
+# TASK_REMINDER_WEBHOOK_URL：提醒另外以 JSON POST 到此網址，未設定時只寫入日誌與即時事件
+TASK_REMINDERS = os.getenv("TASK_REMINDERS", "true").lower() == "true"
+TASK_REMINDER_LEAD_MINUTES = float(os.getenv("TASK_REMINDER_LEAD_MINUTES", "60"))
+TASK_REMINDER_WEBHOOK_URL = os.getenv("TASK_REMINDER_WEBHOOK_URL", "")
+
+CHANGES_BATCH_SIZE = 500
+# 認領紀錄只用來去除重複，保留一天
+CLAIM_RETENTION_SECONDS = 24 * 60 * 60
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_reminders (
+        task_id INTEGER NOT NULL,
+        kind VARCHAR(10) NOT NULL,
+        due REAL NOT NULL,
+        PRIMARY KEY (task_id, kind, due)
+    )
+"""
+
+reminders_sent = metrics.registry.register(metrics.Counter(
+    "task_reminders_total", "Due-date reminders emitted by kind.", ("kind",)
+))
+
+
+def post_webhook(kind: str, payload: dict, url: str = TASK_REMINDER_WEBHOOK_URL) -> None:
+    """將提醒 POST 到 webhook；失敗只記錄，不重試"""
+    if not url:
+        return
+    body = json.dumps({"event": f"task.{kind}", **payload}, ensure_ascii=False).encode()
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        urllib.request.urlopen(request, timeout=5).close()
+    except Exception as e:
+        logger.warning("Reminder webhook failed: %s", e)
+
+
+def init_reminders(engine) -> None:
+    """建立提醒認領表"""
+    with engine.begin() as conn:
+        conn.execute(text(_CREATE_TABLE))
+
+
+def _timestamp(due_date: Optional[datetime]) -> Optional[float]:
+    if due_date is None:
+        return None
+    if due_date.tzinfo is None:
+        due_date = due_date.replace(tzinfo=timezone.utc)
+    return due_date.timestamp()
+
+
+def _due_timestamp(task: models.Task) -> Optional[float]:
+    """需要提醒的到期時間；已完成或沒有 due_date 的任務返回 None"""
+    if task.status == models.TaskStatus.DONE.value:
+        return None
+    return _timestamp(task.due_date)
+
+
+class DueScheduler:
+    def __init__(self, session_factory, on_event: Callable[[str, dict], None] = None,
+                 lead_minutes: float = TASK_REMINDER_LEAD_MINUTES, enabled: bool = TASK_REMINDERS,
+                 claim_session_factory=None):
+        self._session_factory = session_factory
+        # 認領提醒的寫入 session；None 時不認領（單一行程）
+        self._claim_session_factory = claim_session_factory
+        self._on_event = on_event
+        self._lead = lead_minutes * 60
+        self._enabled = enabled
+        # 任務 id -> 目前的到期時間；兩個堆積採延遲刪除，項目與此不符即為過期項目
+        self._due: Dict[int, float] = {}
+        self._index: List[Tuple[float, int]] = []
+        # (提醒時間, 到期時間, 任務 id, 種類)
+        self._timers: List[Tuple[float, float, int, str]] = []
+        self._stale = 0
+        self._cursor: Optional[int] = None
+        self._dirty = False
+        self._cond = threading.Condition()
+        # 同一時間只有一個同步（背景執行緒或 /tasks/due），游標才會一致
+        self._sync_lock = threading.Lock()
+        self._stop = False
+        self._thread = None
+
+    def _set(self, task_id: int, due: Optional[float], now: float) -> None:
+        old = self._due.get(task_id)
+        if old == due:
+            return
+        if old is not None:
+            self._stale += 1
+        if due is None:
+            del self._due[task_id]
+            return
+        self._due[task_id] = due
+        heapq.heappush(self._index, (due, task_id))
+        if self._lead > 0 and due - self._lead > now:
+            heapq.heappush(self._timers, (due - self._lead, due, task_id, "due"))
+        if due > now:
+            heapq.heappush(self._timers, (due, due, task_id, "overdue"))
+
+    def _compact(self) -> None:
+        """過期項目過多時重建堆積"""
+        if self._stale <= len(self._due) + 64:
+            return
+        self._index = [(due, task_id) for task_id, due in self._due.items()]
+        heapq.heapify(self._index)
+        self._timers = [timer for timer in self._timers if self._due.get(timer[2]) == timer[1]]
+        heapq.heapify(self._timers)
+        self._stale = 0
+
+    def load(self) -> int:
+        """從數據庫重新建立索引，返回索引中的任務數"""
+        db = self._session_factory()
+        try:
+            # 先取得游標再載入：之間的變更會在下一次同步時重新套用（以 id 覆蓋，不會重複）
+            cursor = db.execute(text("SELECT coalesce(max(seq), 0) FROM task_changes")).scalar()
+            rows = db.execute(
+                select(models.Task.id, models.Task.due_date)
+                .where(models.Task.due_date.isnot(None), models.Task.status != models.TaskStatus.DONE.value)
+            ).all()
+        finally:
+            db.close()
+        now = time.time()
+        with self._cond:
+            self._due, self._index, self._timers, self._stale = {}, [], [], 0
+            for task_id, due_date in rows:
+                self._set(task_id, _timestamp(due_date), now)
+            self._cursor = cursor
+            self._cond.notify()
+        logger.info("Due-date index loaded: %s tasks", len(rows))
+        return len(rows)
+
+    def mark_changed(self) -> None:
+        """任務有寫入時呼叫（不查詢數據庫），由背景執行緒或下一次查詢同步"""
+        with self._cond:
+            self._dirty = True
+            self._cond.notify()
+
+    def catch_up(self) -> None:
+        """套用游標之後的任務變更；尚未載入時先載入"""
+        with self._sync_lock:
+            with self._cond:
+                self._dirty = False
+                cursor = self._cursor
+            if cursor is None:
+                self.load()
+                return
+            db = self._session_factory()
+            try:
+                while True:
+                    try:
+                        result = changes.get_changes(db, cursor, CHANGES_BATCH_SIZE)
+                    except changes.CursorExpired:
+                        db.close()
+                        self.load()
+                        return
+                    now = time.time()
+                    with self._cond:
+                        for task in result["changed"]:
+                            self._set(task.id, _due_timestamp(task), now)
+                        for task_id in result["deleted"]:
+                            self._set(task_id, None, now)
+                        self._compact()
+                        self._cursor = cursor = result["cursor"]
+                        self._cond.notify()
+                    if not result["has_more"]:
+                        break
+            finally:
+                db.close()
+
+    def due_within(self, seconds: float, overdue: bool = True, limit: int = 50) -> List[Tuple[int, datetime]]:
+        """
+        返回 seconds 秒內到期的任務 (id, 到期時間)，依到期時間排序；overdue 為 True 時包含已逾期的任務。
+        由堆積的根開始依到期時間順序走訪（子節點不會早於父節點），取滿 limit 筆或超過上限即停止。
+        """
+        now = time.time()
+        upper = now + seconds
+        lower = float("-inf") if overdue else now
+        found: List[Tuple[int, datetime]] = []
+        seen = set()
+        with self._cond:
+            heap = self._index
+            frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+            while frontier and len(found) < limit:
+                due, task_id, i = heapq.heappop(frontier)
+                if due > upper:
+                    break
+                if due >= lower and self._due.get(task_id) == due and task_id not in seen:
+                    seen.add(task_id)
+                    found.append((task_id, datetime.fromtimestamp(due, timezone.utc)))
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+        return found
+
+    def _pop_ready(self, now: float) -> List[Tuple[str, int, float]]:
+        ready = []
+        while self._timers and self._timers[0][0] <= now:
+            _, due, task_id, kind = heapq.heappop(self._timers)
+            if self._due.get(task_id) == due:
+                ready.append((kind, task_id, due))
+        return ready
+
+    def _claim(self, ready: List[Tuple[str, int, float]]) -> List[Tuple[str, int, float]]:
+        """在一個交易中認領提醒，返回本行程取得的部分；失敗時不發出（寧可漏發也不重複）"""
+        if self._claim_session_factory is None or not ready:
+            return ready
+        db = self._claim_session_factory()
+        try:
+            claimed = [
+                (kind, task_id, due) for kind, task_id, due in ready
+                if db.execute(
+                    text("INSERT OR IGNORE INTO task_reminders(task_id, kind, due) VALUES (:task_id, :kind, :due)"),
+                    {"task_id": task_id, "kind": kind, "due": due}
+                ).rowcount
+            ]
+            db.execute(
+                text("DELETE FROM task_reminders WHERE due < :cutoff"),
+                {"cutoff": time.time() - CLAIM_RETENTION_SECONDS}
+            )
+            db.commit()
+            return claimed
+        except Exception as e:
+            logger.error("Error claiming reminders: %s", e)
+            db.rollback()
+            return []
+        finally:
+            db.close()
+
+    def _emit(self, kind: str, task_id: int, due: float, claimed: bool = True) -> None:
+        """發出即時事件；claimed 時另外寫入日誌、計數並送出 webhook"""
+        due_date = datetime.fromtimestamp(due, timezone.utc).isoformat()
+        payload = {"id": task_id, "due_date": due_date}
+        if self._on_event is not None:
+            self._on_event(kind, payload)
+        if not claimed:
+            return
+        if kind == "overdue":
+            logger.info("Task %s is overdue (due %s)", task_id, due_date)
+        else:
+            logger.info("Task %s is due soon (due %s)", task_id, due_date)
+        reminders_sent.inc(kind)
+        post_webhook(kind, payload)
+
+    def _run(self) -> None:
+        try:
+            with self._sync_lock:
+                self.load()
+        except Exception as e:
+            logger.error("Error loading due-date index: %s", e)
+        while True:
+            with self._cond:
+                while not self._stop and not self._dirty:
+                    now = time.time()
+                    if self._timers and self._timers[0][0] <= now:
+                        break
+                    timeout = self._timers[0][0] - now if self._timers else None
+                    self._cond.wait(timeout)
+                if self._stop:
+                    return
+                dirty = self._dirty
+            if dirty:
+                try:
+                    self.catch_up()
+                except Exception as e:
+                    logger.error("Error updating due-date index: %s", e)
+                    time.sleep(1)
+            with self._cond:
+                ready = self._pop_ready(time.time())
+            claimed = set(self._claim(ready))
+            for kind, task_id, due in ready:
+                try:
+                    self._emit(kind, task_id, due, (kind, task_id, due) in claimed)
+                except Exception as e:
+                    logger.error("Error emitting reminder for task %s: %s", task_id, e)
+
+    def start(self) -> None:
+        """啟動背景提醒執行緒（TASK_REMINDERS=false 時不啟動，索引在第一次查詢時載入）"""
+        if self._thread is not None or not self._enabled:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="due-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Due-date scheduler started: reminders %s minutes before due", self._lead / 60)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,11 +1,10 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Union, Literal
+from typing_extensions import Annotated
 from enum import Enum
 import logging
 
-# 配置日誌
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TaskStatus(str, Enum):
@@ -57,6 +56,59 @@ class Task(TaskBase):
             datetime: lambda v: v.isoformat() if v else None
         }
 
+# 封存任務的模型：id 為原任務 id
+class ArchivedTask(Task):
+    id: int = Field(..., validation_alias="task_id")
+    archived_at: datetime
+
+# 增量同步相關的模型
+class TaskChanges(BaseModel):
+    cursor: int
+    has_more: bool
+    changed: List[Task]
+    deleted: List[int]
+
+class TaskChangesCursor(BaseModel):
+    cursor: int
+
+# 批次操作相關的模型
+class TaskBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskCreate
+
+class TaskBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TaskUpdate
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+class TaskBatchReorder(BaseModel):
+    op: Literal["reorder"]
+    id: int
+    new_position: int = Field(..., ge=0)
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete, TaskBatchReorder],
+    Field(discriminator="op")
+]
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=5000)
+    atomic: bool = Field(default=False)
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    status: Literal["ok", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
 # Article 相關的模型
 class ArticleBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
@@ -99,6 +151,80 @@ class Article(ArticleBase):
             datetime: lambda v: v.isoformat() if v else None
         }
 
+# 文章列表的精簡模型，不含 content
+class ArticleListItem(BaseModel):
+    id: int
+    title: str
+    summary: Optional[str] = None
+    category: Optional[str] = None
+    tags: Optional[str] = None
+    views: int = Field(default=0)
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+        json_encoders = {
+            datetime: lambda v: v.isoformat() if v else None
+        }
+
+# 相關文章：精簡欄位加上相似度（0–1）
+class RelatedArticle(ArticleListItem):
+    score: float
+
+# fields= 可選擇的欄位與精簡列表的欄位
+ARTICLE_FIELDS = ("id", "title", "content", "summary", "category", "tags", "views", "created_at", "updated_at")
+ARTICLE_LIST_FIELDS = tuple(ArticleListItem.model_fields)
+
+# 標籤相關的模型
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+# 統計相關的模型
+class CompletionPoint(BaseModel):
+    date: str
+    completed: int
+
+class Analytics(BaseModel):
+    total: int
+    status: Dict[str, int]
+    priority: Dict[str, int]
+    completion_trend: List[CompletionPoint]
+
+# 搜尋相關的模型
+class ContentType(str, Enum):
+    TASK = "task"
+    ARTICLE = "article"
+
+class SearchResult(BaseModel):
+    type: ContentType
+    id: int
+    title: str
+    snippet: Optional[str] = None
+    score: float
+
+# 匯入相關的模型：保留原始時間戳記與瀏覽數，id 與 position 由伺服器重新分配
+class TaskImport(TaskCreate):
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ArticleImport(ArticleCreate):
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    views: int = Field(default=0, ge=0)
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportResult(BaseModel):
+    imported: Dict[str, int]
+    failed: int
+    errors: List[ImportRowError]
+    seconds: float
+    rows_per_second: float
+
 # 記錄模型加載
 logger.info("Pydantic models loaded successfully")
 logger.info("Article Pydantic models loaded successfully")
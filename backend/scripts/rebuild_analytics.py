@@ -0,0 +1,19 @@
+"""
+從任務表完整重新計算統計彙總表（task_stats / task_completions）。
+
+平常由觸發器增量維護，只有在手動修改數據庫或懷疑資料不一致時才需要執行。
+
+用法：
+    cd backend
+    python scripts/rebuild_analytics.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import engine  # noqa: E402
+from analytics import rebuild_analytics  # noqa: E402
+
+if __name__ == "__main__":
+    rebuild_analytics(engine)
@@ -0,0 +1,211 @@
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import html
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 全文搜尋：FTS5 虛擬表同時收錄任務與文章，以觸發器與原表保持同步。
+# 使用 trigram 分詞器，中文不需斷詞即可搜尋（查詢詞至少 3 個字元才走索引）。
+# rowid 編碼為 id * 2（任務）或 id * 2 + 1（文章），刪改時可直接以 rowid 定位。
+SEARCH_TABLE = "search_index"
+TRIGRAM_MIN_LENGTH = 3
+
+# 摘要片段為 HTML：原文先跳脫，再把 snippet() 標示的位置換成 <mark>。
+# 標示使用私用區字元，跳脫後才替換，原文中的同一字元最多產生多餘的 <mark>，不會成為其他標籤
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    kind UNINDEXED,
+    ref_id UNINDEXED,
+    title,
+    body,
+    tags,
+    tokenize = 'trigram'
+)
+"""
+
+_TASK_ROW = "'task', new.id, new.title, coalesce(new.description, ''), coalesce(new.tags, '')"
+_ARTICLE_ROW = (
+    "'article', new.id, new.title, "
+    "coalesce(new.summary, '') || char(10) || new.content, coalesce(new.tags, '')"
+)
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+        VALUES (new.id * 2, {_TASK_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_au AFTER UPDATE OF title, description, tags ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+        VALUES (new.id * 2, {_TASK_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_search_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+        VALUES (new.id * 2 + 1, {_ARTICLE_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_search_ad AFTER DELETE ON articles BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_search_au AFTER UPDATE OF title, content, summary, tags ON articles BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+        VALUES (new.id * 2 + 1, {_ARTICLE_ROW});
+    END
+    """,
+]
+
+_BACKFILL = [
+    f"""
+    INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+    SELECT id * 2, 'task', id, title, coalesce(description, ''), coalesce(tags, '') FROM tasks
+    """,
+    f"""
+    INSERT INTO {SEARCH_TABLE}(rowid, kind, ref_id, title, body, tags)
+    SELECT id * 2 + 1, 'article', id, title, coalesce(summary, '') || char(10) || content, coalesce(tags, '')
+    FROM articles
+    """,
+]
+
+search_available = False
+
+
+def init_search_index(engine) -> bool:
+    """建立搜尋索引與同步觸發器，首次建立時回填既有資料"""
+    global search_available
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SEARCH_TABLE}
+            ).first()
+            conn.execute(text(_CREATE_TABLE))
+            for trigger in _TRIGGERS:
+                conn.execute(text(trigger))
+            if not exists:
+                for statement in _BACKFILL:
+                    conn.execute(text(statement))
+                logger.info("Search index created and backfilled")
+        search_available = True
+    except Exception as e:
+        # 舊版 SQLite 可能缺少 FTS5 或 trigram 分詞器
+        logger.error("Full-text search unavailable: %s", e)
+        search_available = False
+    return search_available
+
+
+def detect_search_index(engine) -> bool:
+    """不執行 DDL，只檢查部署步驟是否已建立搜尋索引（DB_AUTO_INIT=false 的 worker 啟動時使用）"""
+    global search_available
+    with engine.connect() as conn:
+        search_available = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE}
+        ).first() is not None
+    if not search_available:
+        logger.error("Full-text search unavailable: %s has not been created", SEARCH_TABLE)
+    return search_available
+
+
+def rebuild_search_index(engine) -> None:
+    """清空並重新建立搜尋索引內容"""
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        for statement in _BACKFILL:
+            conn.execute(text(statement))
+
+
+def _split_terms(query: str) -> List[str]:
+    return [term for term in query.split() if term]
+
+
+def _fts_phrase(term: str) -> str:
+    """將查詢詞轉為 FTS5 字串，避免語法字元被解讀"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _snippet_html(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search(db: Session, query: str, kind: Optional[str] = None, skip: int = 0, limit: int = 20) -> List[dict]:
+    """
+    搜尋任務與文章。
+    所有查詢詞都達 trigram 長度時以 MATCH 查詢並依 bm25 排序；
+    含有較短的詞（例如兩個字的中文詞）時退回 LIKE 比對，依建立時間由新到舊排序。
+    snippet 為已跳脫的 HTML，只包含 <mark> 標籤。
+    """
+    terms = _split_terms(query)
+    if not terms:
+        return []
+
+    params = {"skip": skip, "limit": limit}
+    if kind:
+        params["kind"] = kind
+
+    if all(len(term) >= TRIGRAM_MIN_LENGTH for term in terms):
+        params["match"] = " AND ".join(_fts_phrase(term) for term in terms)
+        params["mark_start"], params["mark_end"] = _MARK_START, _MARK_END
+        kind_clause = "AND kind = :kind" if kind else ""
+        statement = f"""
+            SELECT kind, ref_id, title,
+                   snippet({SEARCH_TABLE}, -1, :mark_start, :mark_end, '…', 16) AS snippet,
+                   bm25({SEARCH_TABLE}, 0.0, 0.0, 10.0, 1.0, 5.0) AS score
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH :match {kind_clause}
+            ORDER BY score
+            LIMIT :limit OFFSET :skip
+        """
+    else:
+        conditions = []
+        for i, term in enumerate(terms):
+            params[f"term{i}"] = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append(
+                f"(s.title LIKE :term{i} ESCAPE '\\' OR s.body LIKE :term{i} ESCAPE '\\' "
+                f"OR s.tags LIKE :term{i} ESCAPE '\\')"
+            )
+        kind_clause = "AND s.kind = :kind" if kind else ""
+        # rowid 交錯編碼任務與文章，不代表新舊；以原表的建立時間排序（以主鍵逐筆查詢）
+        statement = f"""
+            SELECT s.kind AS kind, s.ref_id AS ref_id, s.title AS title,
+                   substr(s.body, 1, 64) AS snippet,
+                   0.0 AS score
+            FROM {SEARCH_TABLE} AS s
+            LEFT JOIN tasks ON s.kind = 'task' AND tasks.id = s.ref_id
+            LEFT JOIN articles ON s.kind = 'article' AND articles.id = s.ref_id
+            WHERE {" AND ".join(conditions)} {kind_clause}
+            ORDER BY coalesce(tasks.created_at, articles.created_at) DESC, s.kind, s.ref_id DESC
+            LIMIT :limit OFFSET :skip
+        """
+
+    rows = db.execute(text(statement), params).mappings().all()
+    return [
+        {
+            "type": row["kind"],
+            "id": row["ref_id"],
+            "title": row["title"],
+            "snippet": _snippet_html(row["snippet"]),
+            "score": -row["score"] or 0.0,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, delete, insert, func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+import logging
+import models
+
+logger = logging.getLogger(__name__)
+
+# 標籤倒排索引的維護與查詢。
+# 寫入路由在 commit 前呼叫 sync_*_tags，與任務／文章本身在同一個交易中更新；
+# 刪除任務或文章時由外鍵 ON DELETE CASCADE 清除關聯。
+SQLITE_MAX_VARIABLES = 900
+
+KINDS = ("task", "article")
+
+
+def _links(kind: str):
+    """返回 (關聯表模型, 擁有者欄位, 擁有者模型)；延後取用，database.init_db 可能在 models 載入完成前匯入本模組"""
+    if kind == "task":
+        return models.TaskTag, models.TaskTag.task_id, models.Task
+    if kind == "article":
+        return models.ArticleTag, models.ArticleTag.article_id, models.Article
+    raise KeyError(kind)
+
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    """解析逗號分隔的標籤字串，去除空白與重複"""
+    if not value:
+        return []
+    seen = []
+    for tag in value.split(","):
+        tag = tag.strip()
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+def _chunks(values: List, size: int = SQLITE_MAX_VARIABLES):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _tag_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """取得標籤 id，不存在的標籤會先建立"""
+    names = list(set(names))
+    if not names:
+        return {}
+    db.execute(
+        sqlite_insert(models.Tag).on_conflict_do_nothing(index_elements=["name"]),
+        [{"name": name} for name in names]
+    )
+    ids = {}
+    for chunk in _chunks(names):
+        for row in db.execute(select(models.Tag.id, models.Tag.name).where(models.Tag.name.in_(chunk))):
+            ids[row.name] = row.id
+    return ids
+
+
+def sync_tags(db: Session, kind: str, owners: Dict[int, Optional[str]]) -> None:
+    """以 {擁有者 id: 標籤字串} 批次重建關聯"""
+    if not owners:
+        return
+    link, owner_column, _ = _links(kind)
+    parsed = {owner_id: parse_tags(value) for owner_id, value in owners.items()}
+    ids = _tag_ids(db, [name for names in parsed.values() for name in names])
+
+    for chunk in _chunks(list(parsed)):
+        db.execute(delete(link).where(owner_column.in_(chunk)))
+    rows = [
+        {owner_column.key: owner_id, "tag_id": ids[name]}
+        for owner_id, names in parsed.items()
+        for name in names
+    ]
+    if rows:
+        db.execute(insert(link), rows)
+
+
+def sync_task_tags(db: Session, owners: Dict[int, Optional[str]]) -> None:
+    sync_tags(db, "task", owners)
+
+
+def sync_article_tags(db: Session, owners: Dict[int, Optional[str]]) -> None:
+    sync_tags(db, "article", owners)
+
+
+def tag_filter(kind: str, names: List[str], match_all: bool = True):
+    """返回符合標籤條件的擁有者 id 子查詢（match_all 為 AND，否則為 OR）"""
+    link, owner_column, _ = _links(kind)
+    tag_ids = select(models.Tag.id).where(models.Tag.name.in_(names))
+    query = select(owner_column).where(link.tag_id.in_(tag_ids))
+    if match_all and len(names) > 1:
+        query = query.group_by(owner_column).having(func.count(link.tag_id) == len(names))
+    return query
+
+
+def tag_facets(db: Session, kind: str, limit: int = 50) -> List[dict]:
+    """各標籤的使用次數，依次數排序"""
+    link, _, _ = _links(kind)
+    count = func.count().label("count")
+    rows = db.execute(
+        select(models.Tag.name, count)
+        .join(link, link.tag_id == models.Tag.id)
+        .group_by(models.Tag.id)
+        .order_by(count.desc(), models.Tag.name)
+        .limit(limit)
+    )
+    return [{"name": row.name, "count": row.count} for row in rows]
+
+
+def rebuild_tag_index(db: Session) -> None:
+    """從 tags 字串欄位重建所有關聯"""
+    for kind in KINDS:
+        link, _, owner = _links(kind)
+        db.execute(delete(link))
+        owners = {row.id: row.tags for row in db.execute(select(owner.id, owner.tags).where(owner.tags.isnot(None)))}
+        sync_tags(db, kind, owners)
+
+
+def init_tags(engine) -> None:
+    """標籤表為空但已有帶標籤的資料時（升級既有數據庫），回填關聯"""
+    with Session(engine) as db:
+        has_links = db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM task_tags) OR EXISTS (SELECT 1 FROM article_tags)"
+        )).scalar()
+        has_tagged = db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM tasks WHERE coalesce(tags, '') != '') "
+            "OR EXISTS (SELECT 1 FROM articles WHERE coalesce(tags, '') != '')"
+        )).scalar()
+        if has_tagged and not has_links:
+            rebuild_tag_index(db)
+            db.commit()
+            logger.info("Tag index backfilled from existing tags")
@@ -0,0 +1,53 @@
+"""
+後端測試共用設定：在匯入應用程式之前指向臨時數據庫，整個測試階段共用一個 TestClient
+（啟動寫入佇列、瀏覽數緩衝等背景執行緒）。各測試以專用的標籤或標題區分自己建立的資料。
+
+用法：
+    cd backend
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# 必須在匯入應用程式之前設定，避免動到真正的 todo.db
+_tmpdir = tempfile.mkdtemp(prefix="smart-todo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ["TASK_REMINDERS"] = "false"
+os.environ["TASK_REMINDER_WEBHOOK_URL"] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def tag():
+    """本測試專用的標籤，以 GET /tasks?tags= 只取回本測試建立的任務"""
+    return f"test-{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def create_tasks(client):
+    """以批次建立任務，返回新任務的 id（依建立順序）"""
+    def create(count, **fields):
+        operations = [
+            {"op": "create", "data": {"title": f"任務 {i}", **fields}}
+            for i in range(count)
+        ]
+        response = client.post("/tasks/batch", json={"operations": operations})
+        assert response.status_code == 200, response.text
+        return [result["id"] for result in response.json()["results"]]
+    return create
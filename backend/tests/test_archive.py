@@ -0,0 +1,89 @@
+from sqlalchemy import text
+
+import main
+from database import engine
+
+
+def make_archivable(task_ids):
+    """讓任務符合封存條件：已完成且超過保留天數未修改"""
+    with engine.begin() as conn:
+        for task_id in task_ids:
+            conn.execute(
+                text("UPDATE tasks SET status = 'DONE', updated_at = '2020-01-01 00:00:00' WHERE id = :id"),
+                {"id": task_id}
+            )
+
+
+def archived_ids(client):
+    return [task["id"] for task in client.get("/tasks/archive", params={"limit": 200}).json()]
+
+
+def test_archive_and_restore(client, tag, create_tasks):
+    archived, active = create_tasks(2, tags=tag)
+    make_archivable([archived])
+
+    assert main.task_archiver.run_once() >= 1
+    assert [t["id"] for t in client.get("/tasks", params={"tags": tag}).json()] == [active]
+    assert archived in archived_ids(client)
+
+    response = client.post(f"/tasks/archive/{archived}/restore")
+    assert response.status_code == 200
+    restored = response.json()
+    assert restored["id"] == archived
+    assert restored["tags"] == tag
+    assert archived not in archived_ids(client)
+    # 還原的任務排在看板最後
+    assert [t["id"] for t in client.get("/tasks", params={"tags": tag}).json()] == [active, archived]
+
+
+def test_restore_unknown_task_returns_404(client):
+    assert client.post("/tasks/archive/999999/restore").status_code == 404
+
+
+def test_archive_list_is_paged(client, tag, create_tasks):
+    ids = create_tasks(3, tags=tag)
+    make_archivable(ids)
+    main.task_archiver.run_once()
+
+    first = client.get("/tasks/archive", params={"limit": 2})
+    assert len(first.json()) == 2
+    cursor = first.headers["x-next-cursor"]
+    rest = client.get("/tasks/archive", params={"limit": 200, "cursor": cursor}).json()
+    seen = [t["id"] for t in first.json() + rest]
+    assert len(seen) == len(set(seen))
+    assert set(ids) <= set(seen)
+
+
+def completions_on(day):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count FROM task_completions WHERE day = :day"), {"day": day}).scalar() or 0
+
+
+def test_completions_survive_archiving(client, create_tasks):
+    ids = create_tasks(2)
+    make_archivable(ids)
+    before = completions_on("2020-01-01")
+    main.task_archiver.run_once()
+    assert completions_on("2020-01-01") == before
+
+
+def test_reused_task_id_can_be_archived_again(client, tag, create_tasks):
+    # tasks.id 沒有 AUTOINCREMENT：封存目前最大 id 的任務後，下一個新任務會沿用同一個 id
+    (first,) = create_tasks(1, tags=tag)
+    make_archivable([first])
+    main.task_archiver.run_once()
+    (second,) = create_tasks(1, tags=tag)
+    assert second == first
+
+    make_archivable([second])
+    assert main.task_archiver.run_once() >= 1
+    assert client.get("/tasks", params={"tags": tag}).json() == []
+    archived = [t for t in client.get("/tasks/archive", params={"limit": 200}).json() if t["tags"] == tag]
+    assert [t["id"] for t in archived] == [first, first]
+
+    # 先還原最近封存的一筆，原 id 空著時沿用；原 id 已被使用時另一筆以新的 id 還原
+    restored = client.post(f"/tasks/archive/{first}/restore").json()
+    assert restored["id"] == first
+    again = client.post(f"/tasks/archive/{first}/restore").json()
+    assert again["id"] != first
+    assert sorted(t["id"] for t in client.get("/tasks", params={"tags": tag}).json()) == sorted([first, again["id"]])
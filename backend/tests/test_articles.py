@@ -0,0 +1,100 @@
+import uuid
+
+import pytest
+
+import fastjson
+import main
+import related
+
+
+def create_article(client, **fields):
+    data = {"title": "文章", "content": "內容", **fields}
+    response = client.post("/articles", json=data)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_article_crud(client):
+    article = create_article(client, title="時間管理", content="番茄鐘工作法", summary="摘要")
+
+    fetched = client.get(f"/articles/{article['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["title"] == "時間管理"
+
+    updated = client.put(f"/articles/{article['id']}", json={"title": "新的標題"})
+    assert updated.status_code == 200
+    # 詳情快取隨寫入失效
+    assert client.get(f"/articles/{article['id']}").json()["title"] == "新的標題"
+
+    assert client.delete(f"/articles/{article['id']}").status_code == 200
+    assert client.get(f"/articles/{article['id']}").status_code == 404
+
+
+def test_missing_article_returns_404(client):
+    assert client.get("/articles/999999").status_code == 404
+    assert client.put("/articles/999999", json={"title": "x"}).status_code == 404
+    assert client.delete("/articles/999999").status_code == 404
+
+
+def test_views_include_pending_counts(client):
+    article = create_article(client)
+    views = [client.get(f"/articles/{article['id']}").json()["views"] for _ in range(3)]
+    assert views[1:] == [views[0] + 1, views[0] + 2]
+
+    main.view_counter.flush()
+    assert main.view_counter.pending(article["id"]) == 0
+    assert client.get(f"/articles/{article['id']}").json()["views"] == views[0] + 3
+
+
+def test_add_views_does_not_depend_on_key_order_or_value():
+    assert fastjson.add_views({"views": 3, "title": "x"}, 2) == {"views": 5, "title": "x"}
+    assert fastjson.add_views({"views": None}, 2) == {"views": 2}
+    assert fastjson.add_views({"views": None}, 0) == {"views": None}
+
+
+def test_list_view_and_field_projection(client):
+    tag = f"test-{uuid.uuid4().hex[:12]}"
+    article = create_article(client, tags=tag)
+
+    listed = client.get("/articles", params={"tags": tag, "view": "list"}).json()
+    assert [a["id"] for a in listed] == [article["id"]]
+    assert "content" not in listed[0]
+
+    projected = client.get("/articles", params={"tags": tag, "fields": "title"}).json()
+    assert projected == [{"id": article["id"], "title": "文章"}]
+
+    assert client.get("/articles", params={"fields": "title,password"}).status_code == 400
+
+
+def test_unchanged_article_list_returns_304(client):
+    etag = client.get("/articles").headers["etag"]
+    assert client.get("/articles", headers={"If-None-Match": etag}).status_code == 304
+    create_article(client)
+    assert client.get("/articles", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.skipif(not related.related_enabled, reason="numpy/scipy not installed or RELATED_INDEX=false")
+def test_related_articles(client):
+    topic = uuid.uuid4().hex[:10]
+    source = create_article(client, title=f"{topic} 番茄鐘", content=f"{topic} 番茄鐘工作法與專注力")
+    similar = create_article(client, title=f"{topic} 專注", content=f"{topic} 番茄鐘讓專注力提升")
+    other = create_article(client, title="料理", content="紅燒肉的做法")
+
+    results = client.get(f"/articles/{source['id']}/related", params={"limit": 50}).json()
+    ids = [r["id"] for r in results]
+    assert ids[0] == similar["id"]
+    assert source["id"] not in ids
+    assert other["id"] not in ids
+    assert 0 < results[0]["score"] <= 1
+
+    assert client.delete(f"/articles/{similar['id']}").status_code == 200
+    ids = [r["id"] for r in client.get(f"/articles/{source['id']}/related").json()]
+    assert similar["id"] not in ids
+
+    assert client.get("/articles/999999/related").status_code == 404
+
+
+def test_related_articles_can_be_disabled(client, monkeypatch):
+    article = create_article(client)
+    monkeypatch.setattr(related, "related_enabled", False)
+    assert client.get(f"/articles/{article['id']}/related").status_code == 503
@@ -0,0 +1,107 @@
+import time
+
+from sqlalchemy import text
+
+import changes
+from database import engine, write_engine
+
+
+def latest_cursor(client):
+    cursor = 0
+    while True:
+        body = client.get("/tasks/changes", params={"since": cursor, "limit": 1000}).json()
+        cursor = body["cursor"]
+        if not body["has_more"]:
+            return cursor
+
+
+def test_changes_since_cursor(client, tag, create_tasks):
+    # 先刪除較小的 id：刪除最大 id 後 SQLite 會把同一個 id 配給下一個新任務
+    removed, kept = create_tasks(2, tags=tag)
+    cursor = latest_cursor(client)
+
+    assert client.put(f"/tasks/{kept}", json={"title": "更新"}).status_code == 200
+    assert client.delete(f"/tasks/{removed}").status_code == 200
+    (created,) = create_tasks(1, tags=tag)
+
+    body = client.get("/tasks/changes", params={"since": cursor}).json()
+    assert [task["id"] for task in body["changed"]] == [kept, created]
+    assert body["changed"][0]["title"] == "更新"
+    assert body["deleted"] == [removed]
+    assert body["cursor"] > cursor
+    assert not body["has_more"]
+
+    # 沒有新的變更時游標不變
+    again = client.get("/tasks/changes", params={"since": body["cursor"]}).json()
+    assert again == {"cursor": body["cursor"], "has_more": False, "changed": [], "deleted": []}
+
+
+def test_changes_are_paged(client, tag, create_tasks):
+    cursor = latest_cursor(client)
+    ids = create_tasks(3, tags=tag)
+
+    first = client.get("/tasks/changes", params={"since": cursor, "limit": 2}).json()
+    assert first["has_more"]
+    second = client.get("/tasks/changes", params={"since": first["cursor"], "limit": 2}).json()
+    assert not second["has_more"]
+    assert [t["id"] for t in first["changed"] + second["changed"]] == ids
+
+
+def test_cursor_older_than_pruned_tombstones_returns_410(client, create_tasks):
+    (task_id,) = create_tasks(1)
+    assert client.delete(f"/tasks/{task_id}").status_code == 200
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE task_changes SET changed_at = datetime('now', '-400 days') WHERE task_id = :id"),
+            {"id": task_id}
+        )
+    assert changes.prune_tombstones(engine) >= 1
+
+    assert client.get("/tasks/changes", params={"since": 1}).status_code == 410
+    # 以 since=0 重新完整同步
+    assert client.get("/tasks/changes", params={"since": 0}).status_code == 200
+
+
+def tombstone_exists(task_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM task_changes WHERE task_id = :id AND deleted = 1"), {"id": task_id}
+        ).first() is not None
+
+
+def test_tombstones_are_pruned_in_the_background(client, create_tasks):
+    (task_id,) = create_tasks(1)
+    assert client.delete(f"/tasks/{task_id}").status_code == 200
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE task_changes SET changed_at = datetime('now', '-400 days') WHERE task_id = :id"),
+            {"id": task_id}
+        )
+
+    pruner = changes.TombstonePruner(write_engine, interval=0.05)
+    pruner.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and tombstone_exists(task_id):
+            time.sleep(0.05)
+    finally:
+        pruner.stop()
+    assert not tombstone_exists(task_id)
+
+
+def test_current_cursor_matches_the_change_feed(client, create_tasks):
+    (task_id,) = create_tasks(1)
+    assert client.get("/tasks/changes/cursor").json() == {"cursor": latest_cursor(client)}
+
+    # 最新的紀錄是已清除的墓碑時，游標仍不早於清除範圍
+    assert client.delete(f"/tasks/{task_id}").status_code == 200
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE task_changes SET changed_at = datetime('now', '-400 days') WHERE task_id = :id"),
+            {"id": task_id}
+        )
+    assert changes.prune_tombstones(engine) >= 1
+    cursor = client.get("/tasks/changes/cursor").json()["cursor"]
+    body = client.get("/tasks/changes", params={"since": cursor})
+    assert body.status_code == 200
+    assert body.json()["changed"] == [] and body.json()["deleted"] == []
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import main
+from events import EventBroker
+
+
+class ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+
+def test_events_fan_out_to_every_subscriber():
+    async def run():
+        broker = EventBroker(queue_size=10)
+        subscribers = [broker.subscribe(), broker.subscribe()]
+        # 同步路由在執行緒池中發佈
+        publisher = threading.Thread(target=broker.publish, args=("task.created", {"id": 1}))
+        publisher.start()
+        publisher.join()
+        return [await asyncio.wait_for(s.queue.get(), timeout=1) for s in subscribers]
+
+    messages = asyncio.run(run())
+    assert messages[0] == messages[1]
+    assert "event: task.created\n" in messages[0]
+    assert 'data: {"id": 1}' in messages[0]
+
+
+def test_slow_subscriber_is_reset_and_dropped():
+    async def run():
+        broker = EventBroker(queue_size=2)
+        fast, slow = broker.subscribe(), broker.subscribe()
+        for i in range(3):
+            broker.publish("task.updated", {"id": i})
+            await asyncio.sleep(0)
+            fast.queue.get_nowait()
+        stream = [chunk async for chunk in broker.stream(slow, ConnectedRequest())]
+        return fast, slow, stream, broker.subscriber_count
+
+    fast, slow, stream, remaining = asyncio.run(run())
+    assert slow.overflowed and not fast.overflowed
+    assert stream[-1].startswith("event: reset\n")
+    assert remaining == 1
+
+
+def test_writes_are_published(client, tag):
+    # 寫入路由於 commit 後發佈事件
+    async def run():
+        subscriber = main.broker.subscribe()
+        try:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, lambda: client.post("/tasks", json={"title": "事件", "tags": tag})
+            )
+            message = await asyncio.wait_for(subscriber.queue.get(), timeout=2)
+            return response.json(), message
+        finally:
+            main.broker.unsubscribe(subscriber)
+
+    task, message = asyncio.run(run())
+    assert "event: task.created\n" in message
+    assert f'"id": {task["id"]}' in message
@@ -0,0 +1,30 @@
+import pytest
+
+
+def fetch(client, path, **params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_fast_task_list_matches_pydantic(client, tag, create_tasks):
+    create_tasks(2, tags=tag, description="說明", priority=3)
+    create_tasks(1, tags=tag, due_date="2026-05-01T09:30:00")
+
+    expected = fetch(client, "/tasks", tags=tag)
+    assert len(expected) == 3
+    assert fetch(client, "/tasks", tags=tag, fast="true") == expected
+
+
+@pytest.mark.parametrize("params", [{}, {"view": "list"}, {"fields": "title,tags,created_at"}],
+                         ids=["full", "view=list", "fields"])
+def test_fast_article_list_matches_pydantic(client, tag, params):
+    for i in range(2):
+        response = client.post("/articles", json={
+            "title": f"文章 {i}", "content": "內容" * 10, "summary": "摘要", "category": "效率", "tags": tag,
+        })
+        assert response.status_code == 200, response.text
+
+    expected = fetch(client, "/articles", tags=tag, **params)
+    assert len(expected) == 2
+    assert fetch(client, "/articles", tags=tag, fast="true", **params) == expected
@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+import logging_config
+
+
+def queued_json_logger(name):
+    """與 configure_logging 相同的佇列與背景寫出，輸出到 StringIO"""
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging_config.JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = logging_config.DeferredQueueHandler(log_queue)
+    handler.addFilter(logging_config.SamplingFilter())
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger, listener, log_queue, stream
+
+
+def test_queued_records_are_written_as_json():
+    logger, listener, log_queue, stream = queued_json_logger("tests.queued_json")
+    logger.info("Task %s moved to %s", 7, "DONE", extra={"task_id": 7})
+    # 呼叫端只把紀錄放進佇列，訊息尚未格式化
+    record = log_queue.get_nowait()
+    assert record.msg == "Task %s moved to %s" and record.args == (7, "DONE")
+    log_queue.put(record)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.error("Write failed", exc_info=True)
+
+    listener.start()
+    listener.stop()
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert entries[0]["message"] == "Task 7 moved to DONE"
+    assert entries[0]["level"] == "INFO"
+    assert entries[0]["logger"] == "tests.queued_json"
+    assert entries[0]["task_id"] == 7
+    assert "ts" in entries[0]
+    assert entries[1]["level"] == "ERROR"
+    assert "ValueError: boom" in entries[1]["exception"]
+
+
+def test_unsampled_requests_keep_warnings_only():
+    logger, listener, log_queue, stream = queued_json_logger("tests.sampled")
+    token = logging_config._sampled.set(False)
+    try:
+        logger.info("skipped")
+        logger.warning("kept")
+    finally:
+        logging_config._sampled.reset(token)
+    listener.start()
+    listener.stop()
+    assert [json.loads(line)["message"] for line in stream.getvalue().splitlines()] == ["kept"]
+
+
+def test_sample_rates_match_method_and_route():
+    rates = logging_config.parse_sample_rates("GET /tasks=0.01, /articles/{article_id}=0.5,*=2,bad=x")
+    assert rates == {"GET /tasks": 0.01, "/articles/{article_id}": 0.5, "*": 1.0}
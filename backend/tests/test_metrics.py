@@ -0,0 +1,45 @@
+import metrics
+
+
+def scrape(client):
+    """{樣本名稱與標籤: 數值}，略過 HELP / TYPE 行"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return response.text, samples
+
+
+def test_metrics_count_requests_by_route_template(client, create_tasks, tag):
+    (task_id,) = create_tasks(1, tags=tag)
+    _, before = scrape(client)
+    client.put(f"/tasks/{task_id}", json={"priority": 2})
+    client.get("/no-such-route")
+    text, after = scrape(client)
+
+    # 路徑參數以路由樣板彙總，未匹配的路徑合併為 unmatched
+    requests = 'http_requests_total{method="PUT",route="/tasks/{task_id}",status="200"}'
+    assert after[requests] == before.get(requests, 0) + 1
+    assert after['http_requests_total{method="GET",route="unmatched",status="404"}'] >= 1
+    count = 'http_request_duration_seconds_count{method="PUT",route="/tasks/{task_id}"}'
+    assert after[count] == before.get(count, 0) + 1
+    assert after['http_request_duration_seconds_bucket{method="PUT",route="/tasks/{task_id}",le="+Inf"}'] == after[count]
+
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert after['db_statement_duration_seconds_count{engine="sync",operation="SELECT"}'] > 0
+    assert 'db_pool_checked_out{engine="sync"}' in after
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, 'a"b')
+    lines = histogram.collect()
+    assert 'test_seconds_bucket{route="a\\"b",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="a\\"b",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="a\\"b",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="a\\"b"} 3' in lines
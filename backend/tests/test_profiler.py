@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+import profiler
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 分析器的中介層在匯入 main 時依 SQL_PROFILE 掛上，另開一個行程啟用
+_PROFILED_APP = """
+import json
+from fastapi.testclient import TestClient
+import main
+
+with TestClient(main.app) as client:
+    client.post("/tasks", json={"title": "分析"})
+    response = client.get("/tasks")
+    profile = client.get("/debug/sql-profile").json()
+    print(json.dumps({"server_timing": response.headers.get("server-timing"), "profile": profile}))
+"""
+
+
+def test_server_timing_and_sql_profile_summary():
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='smart-todo-profile-'), 'test.db')}",
+        SQL_PROFILE="true",
+        TASK_REMINDERS="false",
+        LOG_LEVEL="WARNING",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _PROFILED_APP], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert output["server_timing"].startswith('db;desc="')
+    assert "total;dur=" in output["server_timing"]
+    entry = output["profile"]["GET /tasks"]
+    assert entry["requests"] == 1
+    assert entry["queries_total"] >= 1
+    assert entry["slowest"][0]["sql"].startswith("SELECT")
+    assert "POST /tasks" in output["profile"]
+
+
+@pytest.mark.skipif(profiler.SQL_PROFILE_ENABLED, reason="SQL_PROFILE is enabled for this run")
+def test_sql_profile_is_hidden_when_disabled(client):
+    assert client.get("/debug/sql-profile").status_code == 404
+
+
+def test_repeated_statements_are_flagged():
+    profile = profiler.RequestProfile()
+    for _ in range(profiler.SQL_PROFILE_REPEAT_THRESHOLD):
+        profile.record("SELECT * FROM tags WHERE task_id = ?", 0.001, None, False)
+    profile.record("UPDATE tasks SET position = ?", 0.002, 3, True)
+
+    assert profile.repeated() == {"SELECT * FROM tags WHERE task_id = ?": profiler.SQL_PROFILE_REPEAT_THRESHOLD}
+    assert profile.query_count == profiler.SQL_PROFILE_REPEAT_THRESHOLD + 1
+    assert profile.server_timing(12.5).endswith("total;dur=12.50")
@@ -0,0 +1,164 @@
+"""
+熱點查詢的查詢計畫檢查。
+
+填入足夠的資料讓查詢規劃器做出實際的選擇，實際呼叫路由並擷取送出的 SQL，
+再以 EXPLAIN QUERY PLAN 檢查：任何沒有使用索引的全表掃描（或不允許時使用臨時
+B-tree 排序）都會失敗，除非列在 ALLOWED_SCANS 中。
+"""
+from contextlib import contextmanager
+import re
+
+import pytest
+from sqlalchemy import event, text
+
+import main
+import related
+from cache import response_cache
+from database import engine, async_engine, write_engine
+
+# 沒有使用任何索引的掃描
+FULL_SCAN = re.compile(r"^SCAN (tasks|articles)$")
+TEMP_BTREE = "USE TEMP B-TREE FOR ORDER BY"
+
+# 已確認可接受的掃描：(請求名稱, 查詢計畫步驟)
+ALLOWED_SCANS = {
+    # 依主鍵排序的 LIMIT/OFFSET 分頁沿 rowid 順序讀取，讀到 skip + limit 筆即停止
+    ("list articles", "SCAN articles"),
+}
+
+# (名稱, 是否允許臨時排序)
+HOT_REQUESTS = [
+    ("list tasks", False),
+    ("list tasks (cursor)", False),
+    ("list tasks by status", False),
+    ("list tasks by due date", True),
+    ("list tasks by tag", True),
+    ("due tasks", False),
+    ("list archived tasks", False),
+    ("restore archived task", False),
+    ("tag facets", True),
+    ("create task", False),
+    ("update task", False),
+    ("reorder task", False),
+    ("delete task", False),
+    ("list articles", False),
+    ("get article", False),
+    ("related articles", False),
+    ("update article", False),
+    ("search", True),
+]
+
+
+@contextmanager
+def captured_statements():
+    """擷取所有 engine 送出的 SELECT / UPDATE / DELETE"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    targets = (engine, async_engine.sync_engine, write_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", capture)
+
+
+def explain(statement, parameters):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+@pytest.fixture(scope="module")
+def hot_calls(client):
+    """填入資料，返回 {名稱: 呼叫函式}"""
+    statuses = ["TODO", "IN_PROGRESS", "DONE"]
+    operations = [
+        {
+            "op": "create",
+            "data": {
+                "title": f"任務 {i}",
+                "status": statuses[i % 3],
+                "priority": 1 + i % 3,
+                "due_date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00",
+                "tags": "工作,重要" if i % 5 == 0 else "生活",
+            },
+        }
+        for i in range(3000)
+    ]
+    response = client.post("/tasks/batch", json={"operations": operations})
+    assert response.status_code == 200
+    task_ids = [result["id"] for result in response.json()["results"]]
+    article_ids = [
+        client.post("/articles", json={
+            "title": f"文章 {i}",
+            "content": "這是一篇關於時間管理與專注力的文章。" * 20,
+            "category": ["效率", "生活", "技術"][i % 3],
+        }).json()["id"]
+        for i in range(200)
+    ]
+    with engine.begin() as conn:
+        # 讓部分完成的任務符合封存條件
+        conn.execute(
+            text("UPDATE tasks SET updated_at = '2020-01-01 00:00:00' "
+                 "WHERE status = 'DONE' AND id % 2 = 1 AND id BETWEEN :first AND :last"),
+            {"first": task_ids[0], "last": task_ids[-1]}
+        )
+    main.task_archiver.run_once()
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    # 到期提醒與相關文章索引第一次使用時完整載入（啟動時的一次性讀取），檢查前先載入
+    client.get("/tasks/due")
+    client.get(f"/articles/{article_ids[0]}/related")
+
+    archived_id = client.get("/tasks/archive", params={"limit": 1}).json()[0]["id"]
+    cursor = client.get("/tasks", params={"limit": 50}).headers["x-next-cursor"]
+    return {
+        "list tasks": lambda: client.get("/tasks", params={"limit": 50}),
+        "list tasks (cursor)": lambda: client.get("/tasks", params={"limit": 50, "cursor": cursor}),
+        "list tasks by status": lambda: client.get("/tasks", params={"status": "TODO"}),
+        "list tasks by due date": lambda: client.get("/tasks", params={
+            "due_after": "2026-03-01T00:00:00", "due_before": "2026-03-08T00:00:00"}),
+        "list tasks by tag": lambda: client.get("/tasks", params={"tags": "工作,重要"}),
+        "due tasks": lambda: client.get("/tasks/due", params={"within": 60 * 24 * 30}),
+        "list archived tasks": lambda: client.get("/tasks/archive", params={"limit": 50}),
+        "restore archived task": lambda: client.post(f"/tasks/archive/{archived_id}/restore"),
+        "tag facets": lambda: client.get("/tags", params={"type": "task"}),
+        "create task": lambda: client.post("/tasks", json={"title": "新任務"}),
+        "update task": lambda: client.put(f"/tasks/{task_ids[9]}", json={"status": "DONE"}),
+        "reorder task": lambda: client.put(f"/tasks/{task_ids[19]}/reorder", params={"new_position": 5}),
+        "delete task": lambda: client.delete(f"/tasks/{task_ids[30]}"),
+        "list articles": lambda: client.get("/articles", params={"limit": 20}),
+        "get article": lambda: client.get(f"/articles/{article_ids[4]}"),
+        "related articles": lambda: client.get(f"/articles/{article_ids[4]}/related"),
+        "update article": lambda: client.put(f"/articles/{article_ids[5]}", json={"summary": "摘要"}),
+        "search": lambda: client.get("/search", params={"q": "時間管理"}),
+    }
+
+
+@pytest.mark.parametrize("name,allow_temp_btree", HOT_REQUESTS, ids=[name for name, _ in HOT_REQUESTS])
+def test_hot_queries_use_indexes(hot_calls, monkeypatch, name, allow_temp_btree):
+    if name == "related articles" and not related.related_enabled:
+        pytest.skip("related-article index disabled")
+    # 回應快取命中時不會執行查詢，檢查時停用
+    monkeypatch.setattr(response_cache, "backend", None)
+    with captured_statements() as captured:
+        response = hot_calls[name]()
+    assert response.status_code < 400, response.text
+    assert captured, "no statements captured"
+
+    failures = []
+    for statement, parameters in captured:
+        plan = explain(statement, parameters)
+        bad = [step for step in plan if FULL_SCAN.match(step) and (name, step) not in ALLOWED_SCANS]
+        if not allow_temp_btree:
+            bad += [step for step in plan if step.startswith(TEMP_BTREE)]
+        if bad:
+            failures.append(f"{' '.join(statement.split())}\n    -> {bad}")
+    assert not failures, "\n".join(failures)
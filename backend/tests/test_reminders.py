@@ -0,0 +1,38 @@
+import time
+
+import reminders
+from database import SessionLocal, WriteSessionLocal
+from reminders import DueScheduler
+
+
+def test_each_reminder_is_posted_by_one_worker(monkeypatch):
+    # 每個 worker 各有一個排程器：即時事件送給各自的訂閱者，webhook 只有先認領的送出
+    emitted = []
+    posted = []
+    monkeypatch.setattr(reminders, "post_webhook", lambda kind, payload: posted.append((kind, payload["id"])))
+
+    def worker(name):
+        return DueScheduler(
+            SessionLocal,
+            on_event=lambda kind, payload: emitted.append((name, kind, payload["id"])),
+            enabled=False,
+            claim_session_factory=WriteSessionLocal
+        )
+
+    workers = [worker("a"), worker("b")]
+    due = time.time() + 0.2
+    for worker in workers:
+        with worker._cond:
+            worker._set(987654, due, time.time())
+
+    time.sleep(0.3)
+    for worker in workers:
+        with worker._cond:
+            ready = worker._pop_ready(time.time())
+        assert ready == [("overdue", 987654, due)]
+        claimed = worker._claim(ready)
+        for kind, task_id, due_at in ready:
+            worker._emit(kind, task_id, due_at, (kind, task_id, due_at) in claimed)
+
+    assert emitted == [("a", "overdue", 987654), ("b", "overdue", 987654)]
+    assert posted == [("overdue", 987654)]
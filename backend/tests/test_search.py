@@ -0,0 +1,82 @@
+import re
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+import search
+from database import engine
+
+
+pytestmark = pytest.mark.skipif(not search.search_available, reason="SQLite FTS5 trigram tokenizer not available")
+
+
+def test_search_finds_tasks_and_articles(client, create_tasks):
+    word = uuid.uuid4().hex[:12]
+    (task_id,) = create_tasks(1, description=f"關於 {word} 的任務")
+    article = client.post("/articles", json={"title": f"{word} 筆記", "content": "內容"}).json()
+
+    results = client.get("/search", params={"q": word}).json()
+    assert {(r["type"], r["id"]) for r in results} == {("task", task_id), ("article", article["id"])}
+    # 標題權重較高
+    assert results[0]["type"] == "article"
+    assert "<mark>" in results[0]["snippet"]
+
+    only_tasks = client.get("/search", params={"q": word, "type": "task"}).json()
+    assert [(r["type"], r["id"]) for r in only_tasks] == [("task", task_id)]
+
+
+def test_search_index_follows_updates_and_deletes(client, create_tasks):
+    word = uuid.uuid4().hex[:12]
+    (task_id,) = create_tasks(1, title=word)
+    assert [r["id"] for r in client.get("/search", params={"q": word}).json()] == [task_id]
+
+    client.put(f"/tasks/{task_id}", json={"title": "另一個標題"})
+    assert client.get("/search", params={"q": word}).json() == []
+
+    (task_id,) = create_tasks(1, title=word)
+    client.delete(f"/tasks/{task_id}")
+    assert client.get("/search", params={"q": word}).json() == []
+
+
+def test_short_terms_fall_back_to_like(client, create_tasks):
+    marker = uuid.uuid4().hex[:8]
+    (task_id,) = create_tasks(1, title=f"讀書 {marker}")
+    results = client.get("/search", params={"q": f"讀書 {marker}"}).json()
+    assert [(r["type"], r["id"]) for r in results] == [("task", task_id)]
+
+
+def test_empty_query_is_rejected(client):
+    assert client.get("/search", params={"q": ""}).status_code == 422
+
+
+def test_like_fallback_lists_newest_first(client, create_tasks):
+    marker = uuid.uuid4().hex[:8]
+    (task_id,) = create_tasks(1, title=f"讀書 {marker}")
+    article = client.post("/articles", json={"title": f"讀書 {marker}", "content": "內容"}).json()
+    (newer_task,) = create_tasks(1, title=f"讀書 {marker}")
+    # rowid 以 id * 2（任務）與 id * 2 + 1（文章）交錯，不能代表新舊
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET created_at = '2026-01-01 00:00:00' WHERE id = :id"), {"id": task_id})
+        conn.execute(text("UPDATE articles SET created_at = '2026-01-02 00:00:00' WHERE id = :id"), {"id": article["id"]})
+        conn.execute(text("UPDATE tasks SET created_at = '2026-01-03 00:00:00' WHERE id = :id"), {"id": newer_task})
+
+    results = client.get("/search", params={"q": f"讀書 {marker}"}).json()
+    assert [(r["type"], r["id"]) for r in results] == [
+        ("task", newer_task), ("article", article["id"]), ("task", task_id)
+    ]
+    only_articles = client.get("/search", params={"q": f"讀書 {marker}", "type": "article"}).json()
+    assert [r["id"] for r in only_articles] == [article["id"]]
+
+
+def test_snippets_escape_html(client, create_tasks):
+    word = uuid.uuid4().hex[:12]
+    create_tasks(1, description=f"<script>alert(1)</script> {word} <b>")
+
+    # FTS 與 LIKE 退回路徑的片段都只能有 <mark> 標籤
+    for query in (word, f"<b {word}"):
+        (result,) = client.get("/search", params={"q": query}).json()
+        assert "&lt;" in result["snippet"]
+        assert "<" not in re.sub("</?mark>", "", result["snippet"])
+    (result,) = client.get("/search", params={"q": word}).json()
+    assert f"<mark>{word}</mark>" in result["snippet"]
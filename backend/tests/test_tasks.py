@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+
+import versions
+from positions import POSITION_GAP, position_between
+
+
+def list_tasks(client, tag, **params):
+    response = client.get("/tasks", params={"tags": tag, **params})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_keyset_pagination_follows_cursor(client, tag, create_tasks):
+    ids = create_tasks(5, tags=tag)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = list_tasks(client, tag, **params)
+        seen += [task["id"] for task in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert seen == ids
+    assert pages == 3
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/tasks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_server_side_filters(client, tag, create_tasks):
+    todo = create_tasks(2, tags=tag, status="TODO", priority=1)
+    done = create_tasks(1, tags=tag, status="DONE", priority=3)
+
+    assert [t["id"] for t in list_tasks(client, tag, status="TODO").json()] == todo
+    assert [t["id"] for t in list_tasks(client, tag, status="DONE").json()] == done
+    assert [t["id"] for t in list_tasks(client, tag, priority=3).json()] == done
+
+
+def test_new_tasks_get_gapped_positions(client, tag, create_tasks):
+    create_tasks(3, tags=tag)
+    positions = [task["position"] for task in list_tasks(client, tag).json()]
+    assert [b - a for a, b in zip(positions, positions[1:])] == [POSITION_GAP, POSITION_GAP]
+
+
+def test_reorder_only_moves_the_target(client, tag, create_tasks):
+    first, second, third = create_tasks(3, tags=tag)
+    before = {task["id"]: task["position"] for task in list_tasks(client, tag).json()}
+
+    assert client.put(f"/tasks/{third}/reorder", params={"new_position": 0}).status_code == 200
+
+    after = list_tasks(client, tag).json()
+    assert [task["id"] for task in after] == [third, first, second]
+    positions = {task["id"]: task["position"] for task in after}
+    assert positions[first] == before[first]
+    assert positions[second] == before[second]
+
+
+def test_reorder_rebalances_when_gaps_run_out(client, tag, create_tasks):
+    first, second = create_tasks(2, tags=tag)
+    # 反覆移到最前面，每次位置減半，間隔用盡後必須重新編號才能繼續
+    for i in range(40):
+        task_id = first if i % 2 == 0 else second
+        assert client.put(f"/tasks/{task_id}/reorder", params={"new_position": 0}).status_code == 200
+
+    tasks = list_tasks(client, tag).json()
+    assert [task["id"] for task in tasks] == [second, first]
+    assert tasks[0]["position"] < tasks[1]["position"]
+
+
+def test_position_between_reports_exhausted_gap():
+    assert position_between(1, 2) is None
+    assert position_between(None, 1) is None
+    assert position_between(1024, 2048) == 1536
+
+
+def test_reorder_unknown_task_returns_404(client):
+    assert client.put("/tasks/999999/reorder", params={"new_position": 0}).status_code == 404
+
+
+def test_batch_reports_per_operation_results(client, tag, create_tasks):
+    (existing,) = create_tasks(1, tags=tag)
+    response = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "新任務", "tags": tag}},
+        {"op": "update", "id": existing, "data": {"status": "DONE"}},
+        {"op": "delete", "id": 999999},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["ok", "ok", "error"]
+    assert len(list_tasks(client, tag).json()) == 2
+    assert [t["id"] for t in list_tasks(client, tag, status="DONE").json()] == [existing]
+
+
+def test_atomic_batch_rolls_back_on_error(client, tag):
+    response = client.post("/tasks/batch", json={"atomic": True, "operations": [
+        {"op": "create", "data": {"title": "不應留下", "tags": tag}},
+        {"op": "update", "id": 999999, "data": {"status": "DONE"}},
+    ]})
+    assert response.status_code == 409
+    assert response.json()["results"][1]["status"] == "error"
+    assert list_tasks(client, tag).json() == []
+
+
+def test_unchanged_list_returns_304(client, tag, create_tasks):
+    create_tasks(1, tags=tag)
+    etag = list_tasks(client, tag).headers["etag"]
+
+    response = client.get("/tasks", params={"tags": tag}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    create_tasks(1, tags=tag)
+    response = client.get("/tasks", params={"tags": tag}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_if_modified_since_ignores_writes_in_the_same_second(client, tag, create_tasks, monkeypatch):
+    clock = {"now": datetime(2026, 1, 1, 12, 0, 0, 300000, tzinfo=timezone.utc)}
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock["now"]
+
+    monkeypatch.setattr(versions, "datetime", FrozenDatetime)
+    create_tasks(1, tags=tag)
+    written = "Thu, 01 Jan 2026 12:00:00 GMT"
+
+    # 寫入的那一秒尚未結束，同一秒內可能還有寫入：不送出 Last-Modified，也不以日期回應 304
+    assert "last-modified" not in list_tasks(client, tag).headers
+    response = client.get("/tasks", params={"tags": tag}, headers={"If-Modified-Since": written})
+    assert response.status_code == 200
+
+    clock["now"] += timedelta(seconds=1)
+    assert list_tasks(client, tag).headers["last-modified"] == written
+    response = client.get("/tasks", params={"tags": tag}, headers={"If-Modified-Since": written})
+    assert response.status_code == 304
+
+    create_tasks(1, tags=tag)
+    response = client.get("/tasks", params={"tags": tag}, headers={"If-Modified-Since": written})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_cached_list_is_invalidated_by_writes(client, tag, create_tasks):
+    (task_id,) = create_tasks(1, tags=tag)
+    assert list_tasks(client, tag).json()[0]["title"] == "任務 0"
+
+    assert client.put(f"/tasks/{task_id}", json={"title": "改過的標題"}).status_code == 200
+    assert list_tasks(client, tag).json()[0]["title"] == "改過的標題"
+
+    assert client.delete(f"/tasks/{task_id}").status_code == 200
+    assert list_tasks(client, tag).json() == []
+
+
+def test_update_and_delete_unknown_task_return_404(client):
+    assert client.put("/tasks/999999", json={"title": "x"}).status_code == 404
+    assert client.delete("/tasks/999999").status_code == 404
+
+
+def test_due_tasks(client, tag, create_tasks):
+    now = datetime.now(timezone.utc)
+    soon, later = create_tasks(1, tags=tag, due_date=(now + timedelta(minutes=30)).isoformat()) + \
+        create_tasks(1, tags=tag, due_date=(now + timedelta(days=3)).isoformat())
+
+    due = [task["id"] for task in client.get("/tasks/due", params={"within": 60, "overdue": False, "limit": 200}).json()]
+    assert soon in due
+    assert later not in due
+
+    assert client.put(f"/tasks/{soon}", json={"status": "DONE"}).status_code == 200
+    due = [task["id"] for task in client.get("/tasks/due", params={"within": 60, "overdue": False, "limit": 200}).json()]
+    assert soon not in due
+
+
+def test_tag_facets_count_tasks(client, tag, create_tasks):
+    create_tasks(3, tags=tag)
+    facets = {facet["name"]: facet["count"] for facet in client.get("/tags", params={"limit": 500}).json()}
+    assert facets[tag] == 3
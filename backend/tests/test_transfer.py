@@ -0,0 +1,92 @@
+import json
+
+from sqlalchemy import text
+
+import main
+import transfer
+from database import engine
+
+
+def test_ndjson_export_contains_tasks_and_articles(client, tag, create_tasks):
+    (task_id,) = create_tasks(1, tags=tag)
+    response = client.get("/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert {"task", "article"} >= {record["type"] for record in records}
+    assert any(record["type"] == "task" and record["id"] == task_id for record in records)
+
+
+def test_csv_export_requires_type(client):
+    assert client.get("/export", params={"format": "csv"}).status_code == 400
+    response = client.get("/export", params={"format": "csv", "type": "task"})
+    assert response.status_code == 200
+    assert response.text.startswith("\ufefftitle,")
+
+
+def test_ndjson_import_reports_bad_rows(client, tag):
+    lines = [
+        json.dumps({"type": "task", "title": "匯入一", "tags": tag}, ensure_ascii=False),
+        "{not json",
+        json.dumps({"type": "task", "title": "匯入二", "tags": tag}, ensure_ascii=False),
+        json.dumps({"type": "task", "priority": 2}),
+    ]
+    response = client.post("/import", content="\n".join(lines).encode())
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"]["task"] == 2
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 4]
+
+    tasks = client.get("/tasks", params={"tags": tag}).json()
+    assert [task["title"] for task in tasks] == ["匯入一", "匯入二"]
+    assert tasks[0]["position"] < tasks[1]["position"]
+
+
+def test_csv_import(client, tag):
+    body = f'title,tags,description\n"逗號, 與引號""",{tag},"兩行\n描述"\n'
+    response = client.post("/import", params={"format": "csv", "type": "task"}, content=body.encode())
+    assert response.status_code == 200
+    assert response.json()["imported"]["task"] == 1
+    (task,) = client.get("/tasks", params={"tags": tag}).json()
+    assert task["title"] == '逗號, 與引號"'
+    assert task["description"] == "兩行\n描述"
+
+
+def test_csv_import_requires_type(client):
+    assert client.post("/import", params={"format": "csv"}, content=b"title\nx\n").status_code == 400
+
+
+def test_export_import_round_trip(client, tag, create_tasks):
+    create_tasks(2, tags=tag, priority=3)
+    exported = [
+        line for line in client.get("/export", params={"type": "task"}).text.splitlines()
+        if json.loads(line).get("tags") == tag
+    ]
+    assert len(exported) == 2
+    result = client.post("/import", content="\n".join(exported).encode()).json()
+    assert result["imported"]["task"] == 2
+    tasks = client.get("/tasks", params={"tags": tag}).json()
+    assert len(tasks) == 4
+    assert {task["priority"] for task in tasks} == {3}
+
+
+def test_import_batches_go_through_the_write_queue(client, tag, monkeypatch):
+    calls = []
+    run_async = main.writer.run_async
+
+    async def recording(fn):
+        calls.append(fn)
+        return await run_async(fn)
+
+    monkeypatch.setattr(transfer, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(main.writer, "run_async", recording)
+    lines = [json.dumps({"type": "task", "title": f"匯入 {i}", "tags": tag}, ensure_ascii=False) for i in range(5)]
+    assert client.post("/import", content="\n".join(lines).encode()).json()["imported"]["task"] == 5
+    assert len(calls) == 3
+
+    # 位置在寫入交易中計算，各批依序接在看板最後
+    positions = [task["position"] for task in client.get("/tasks", params={"tags": tag}).json()]
+    assert positions == sorted(set(positions))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT max(position) FROM tasks")).scalar() == positions[-1]
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database import ASYNC_DATABASE_URL, engine
+from versions import TableVersions
+
+
+def test_shared_versions_report_other_workers_writes(client, create_tasks, tag):
+    # 另一個「worker」的共用版本：測試用應用程式的寫入對它而言是其他行程的寫入
+    shared = TableVersions(engine)
+    changes = []
+    shared.add_listener(lambda table, local: changes.append((table, local)))
+    shared.sync()
+    assert changes == []
+
+    create_tasks(1, tags=tag)
+    shared.sync()
+    assert changes == [("tasks", False)]
+
+    # 本行程寫入後的 bump：寫入路由已自行通知
+    create_tasks(1, tags=tag)
+    shared.bump("tasks")
+    assert changes == [("tasks", False), ("tasks", True)]
+
+
+def test_background_sync_relays_writes(client, create_tasks, tag):
+    shared = TableVersions(engine)
+    changes = []
+    shared.add_listener(lambda table, local: changes.append((table, local)))
+    shared.sync()
+    shared.start(interval=0.05)
+    try:
+        create_tasks(1, tags=tag)
+        deadline = time.time() + 2
+        while not changes and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        shared.stop()
+    assert ("tasks", False) in changes
+
+
+def test_async_sync_reads_shared_versions(client, create_tasks, tag):
+    # async 路由以 aiosqlite 同步，不在事件循環中執行阻塞查詢
+    async def run():
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+        try:
+            shared = TableVersions(engine, async_engine)
+            changes = []
+            shared.add_listener(lambda table, local: changes.append((table, local)))
+            await shared.sync_async()
+            before = shared.version("tasks")
+            create_tasks(1, tags=tag)
+            await shared.sync_async()
+            return before, shared.version("tasks"), changes
+        finally:
+            await async_engine.dispose()
+
+    before, after, changes = asyncio.run(run())
+    assert after > before
+    assert changes == [("tasks", False)]
@@ -0,0 +1,249 @@
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+import codecs
+import csv
+import io
+import logging
+import os
+import time
+import orjson
+import models
+import schemas
+import fastjson
+from positions import POSITION_GAP, next_position
+from batch import bulk_insert_ids
+from tagging import sync_tags
+
+logger = logging.getLogger(__name__)
+
+# 任務與文章的串流匯出／匯入。
+# 匯出以 yield_per 分段取回資料並逐段輸出，記憶體用量與資料量無關；
+# 匯入逐段讀取上傳內容，每 IMPORT_BATCH_SIZE 筆交給寫入佇列（見 writer.py）批次寫入，
+# 與其他寫入相同以 BEGIN IMMEDIATE 取得寫入鎖，位置在同一個交易中計算。
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+_EXPORTS = {
+    "task": (models.Task, fastjson.TASK_FIELDS, models.Task.position),
+    "article": (models.Article, fastjson.ARTICLE_FIELDS, models.Article.id),
+}
+
+_IMPORTS = {
+    "task": (models.Task, schemas.TaskImport),
+    "article": (models.Article, schemas.ArticleImport),
+}
+
+
+class ImportFormatError(Exception):
+    """上傳內容無法繼續解析（編碼錯誤或缺少 CSV 標題列）"""
+
+
+def _export_rows(db: Session, kind: str) -> Iterator[List[dict]]:
+    """以 yield_per 分段取回資料，每次產生一段字典"""
+    model, fields, order = _EXPORTS[kind]
+    result = db.execute(
+        select(*fastjson.columns_for(model, fields))
+        .order_by(order, model.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+    for rows in result.partitions():
+        yield fastjson.rows_to_dicts(rows, fields)
+
+
+def export_ndjson(session_factory, kinds: Sequence[str]) -> Iterator[bytes]:
+    """產生 NDJSON，每行一筆並以 type 標示種類"""
+    with session_factory() as db:
+        # 所有種類在同一個讀取交易中匯出，內容為一致的快照
+        for kind in kinds:
+            for chunk in _export_rows(db, kind):
+                yield b"".join(orjson.dumps({"type": kind, **row}) + b"\n" for row in chunk)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_csv(session_factory, kind: str) -> Iterator[str]:
+    """產生單一種類的 CSV，開頭加上 BOM 讓試算表正確辨識 UTF-8"""
+    _, fields, _ = _EXPORTS[kind]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield "\ufeff" + buffer.getvalue()
+    with session_factory() as db:
+        for chunk in _export_rows(db, kind):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(row[name]) for name in fields] for row in chunk)
+            yield buffer.getvalue()
+
+
+async def _lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """將上傳的位元組串流切成文字行（保留換行符號）"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in stream:
+            pending += decoder.decode(chunk)
+            # 只以 \n 切行：JSON 字串內可能含有 U+2028 等其他換行字元
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"Upload is not valid UTF-8: {e}")
+    if pending:
+        yield pending
+
+
+async def _ndjson_records(stream: AsyncIterator[bytes], kind: Optional[str]) -> AsyncIterator[Tuple[int, Optional[str], object]]:
+    """產生 (行號, 種類, 資料或錯誤訊息)"""
+    line_no = 0
+    async for line in _lines(stream):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, data.pop("type", kind), data
+
+
+async def _csv_records(stream: AsyncIterator[bytes], kind: str) -> AsyncIterator[Tuple[int, Optional[str], object]]:
+    """產生 (行號, 種類, 資料)；引號內的換行會合併為同一筆"""
+    header = None
+    record = ""
+    line_no = 0
+    start = 1
+    async for line in _lines(stream):
+        line_no += 1
+        if not record:
+            start = line_no
+        record += line
+        # 引號成對時才是完整的一筆（欄位內的引號以 "" 跳脫，不影響奇偶）
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        # 空字串視為未提供，讓欄位套用預設值
+        yield start, kind, {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        yield start, kind, "Unterminated quoted field"
+    if header is None:
+        raise ImportFormatError("CSV upload has no header row")
+
+
+def _insert_batch(db: Session, kind: str, items: List[dict]) -> int:
+    """寫入一批資料，返回寫入筆數（由寫入佇列 commit）"""
+    model, _ = _IMPORTS[kind]
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    if kind == "task":
+        # 依檔案順序接在看板最後，不沿用匯出時的 position
+        position = next_position(db)
+        for offset, item in enumerate(items):
+            item["position"] = position + offset * POSITION_GAP
+    for item in items:
+        item["created_at"] = item["created_at"] or now
+        item["updated_at"] = item["updated_at"] or item["created_at"]
+    ids = bulk_insert_ids(db, model, items)
+    sync_tags(db, kind, {owner_id: item["tags"] for owner_id, item in zip(ids, items) if item.get("tags")})
+    return len(ids)
+
+
+Write = Callable[[Callable[[Session], int]], Awaitable[int]]
+
+
+class ImportJob:
+    """累積驗證後的資料並分批寫入，同時記錄錯誤與吞吐量"""
+
+    def __init__(self, write: Write):
+        # write 為 writer.run_async：在寫入執行緒的交易中執行並等待 commit
+        self._write = write
+        self._pending: Dict[str, List[Tuple[int, dict]]] = {kind: [] for kind in _IMPORTS}
+        self.imported: Dict[str, int] = {kind: 0 for kind in _IMPORTS}
+        self.failed = 0
+        self.errors: List[schemas.ImportRowError] = []
+        self._started = time.perf_counter()
+
+    def error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append(schemas.ImportRowError(line=line, error=message))
+
+    async def add(self, line: int, kind: Optional[str], data) -> None:
+        if isinstance(data, str):
+            self.error(line, data)
+            return
+        if kind not in _IMPORTS:
+            self.error(line, f"Unknown or missing type: {kind}")
+            return
+        _, schema = _IMPORTS[kind]
+        try:
+            item = schema(**data).dict()
+        except ValidationError as e:
+            self.error(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            return
+        pending = self._pending[kind]
+        pending.append((line, item))
+        if len(pending) >= IMPORT_BATCH_SIZE:
+            await self.flush(kind)
+
+    async def flush(self, kind: str) -> None:
+        pending = self._pending[kind]
+        if not pending:
+            return
+        self._pending[kind] = []
+        items = [item for _, item in pending]
+        try:
+            self.imported[kind] += await self._write(lambda db: _insert_batch(db, kind, items))
+        except Exception as e:
+            # 整批回滾，批次內每一行都記為失敗
+            logger.error("Error importing %s batch at line %s: %s", kind, pending[0][0], e)
+            for line, _ in pending:
+                self.error(line, f"Batch insert failed: {e}")
+
+    async def finish(self) -> schemas.ImportResult:
+        for kind in _IMPORTS:
+            await self.flush(kind)
+        seconds = time.perf_counter() - self._started
+        total = sum(self.imported.values())
+        logger.info("Imported %s rows (%s failed) in %.2fs", total, self.failed, seconds)
+        return schemas.ImportResult(
+            imported=self.imported,
+            failed=self.failed,
+            errors=self.errors,
+            seconds=round(seconds, 3),
+            rows_per_second=round(total / seconds, 1) if seconds > 0 else 0.0,
+        )
+
+
+async def import_stream(write: Write, stream: AsyncIterator[bytes],
+                        format: str, kind: Optional[str]) -> schemas.ImportResult:
+    """匯入上傳的 NDJSON 或 CSV 串流"""
+    job = ImportJob(write)
+    records = _csv_records(stream, kind) if format == "csv" else _ndjson_records(stream, kind)
+    try:
+        async for line, record_kind, data in records:
+            await job.add(line, record_kind, data)
+    except ImportFormatError as e:
+        # 已寫入的批次保留，其餘內容無法解析
+        job.error(0, str(e))
+    return await job.finish()
@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from database import MULTI_WORKER, async_engine, engine
+
+# 每個資料表的版本號，於寫入路由 commit 後遞增。
+# 列表路由以「版本 + 查詢參數」產生 ETag，資料未變時直接回應 304，
+# 不需查詢數據庫或序列化。epoch 於每次啟動時重新產生，避免重啟後版本號重複。
+#
+# 多 worker 時（database.MULTI_WORKER）各行程看不到彼此的寫入，改用共用版本：
+# data_versions 表的版本號由觸發器在每次寫入時遞增，讀取路由先以主鍵查詢同步（sync；async 路由用 sync_async 經 aiosqlite 讀取），
+# 發現其他行程的寫入時通知監聽者（回應快取據此失效）。背景執行緒每 VERSION_POLL_SECONDS 秒同步一次，
+# 沒有讀取請求的 worker 也能把其他 worker 的寫入轉發給自己的 SSE 訂閱者。
+
+logger = logging.getLogger(__name__)
+
+VERSION_POLL_SECONDS = float(os.getenv("VERSION_POLL_SECONDS", "1"))
+
+VERSIONED_TABLES = ("tasks", "articles")
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS data_versions (
+        name VARCHAR(50) NOT NULL PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+_SELECT_VERSIONS = "SELECT name, version FROM data_versions"
+
+_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS {table}_versions_{suffix} AFTER {event} ON {table} BEGIN
+        UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+    END
+"""
+
+
+def init_versions(engine) -> None:
+    """建立共用版本表與遞增版本的觸發器"""
+    with engine.begin() as conn:
+        conn.execute(text(_CREATE_TABLE))
+        for table in VERSIONED_TABLES:
+            conn.execute(text("INSERT OR IGNORE INTO data_versions(name, version) VALUES (:name, 0)"), {"name": table})
+            for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+                conn.execute(text(_TRIGGER.format(table=table, suffix=suffix, event=event)))
+
+
+class TableVersions:
+    def __init__(self, engine=None, async_engine=None):
+        # engine 不為 None 時使用共用版本；各 worker 的 ETag 必須一致，epoch 固定
+        self._engine = engine
+        self._async_engine = async_engine
+        self._epoch = "shared" if engine is not None else uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._modified: Dict[str, datetime] = {}
+        self._started = datetime.now(timezone.utc).replace(microsecond=0)
+        self._listeners: List[Callable[[str, bool], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[str, bool], None]) -> None:
+        """
+        sync 發現資料表版本改變時呼叫 listener(table, local)；
+        local 為 True 表示由本行程寫入後的 bump 發現，寫入路由已自行通知
+        """
+        self._listeners.append(listener)
+
+    def sync(self, local: Optional[str] = None) -> None:
+        """共用版本：讀取 data_versions，更新有變動的資料表（單一 worker 時不做任何事）"""
+        if self._engine is None:
+            return
+        with self._engine.connect() as conn:
+            rows = conn.execute(text(_SELECT_VERSIONS)).all()
+        self._apply(rows, local)
+
+    async def sync_async(self) -> None:
+        """供 async 路由使用的 sync，以 aiosqlite 讀取，不阻塞事件循環"""
+        if self._engine is None:
+            return
+        if self._async_engine is None:
+            await run_in_threadpool(self.sync)
+            return
+        async with self._async_engine.connect() as conn:
+            rows = (await conn.execute(text(_SELECT_VERSIONS))).all()
+        self._apply(rows, None)
+
+    def _apply(self, rows, local: Optional[str]) -> None:
+        changed = []
+        with self._lock:
+            for table, version in rows:
+                if self._versions.get(table) != version:
+                    if table in self._versions:
+                        changed.append(table)
+                    self._versions[table] = version
+                    self._modified[table] = datetime.now(timezone.utc).replace(microsecond=0)
+        for table in changed:
+            for listener in self._listeners:
+                listener(table, table == local)
+
+    def bump(self, table: str) -> int:
+        """資料表有寫入時遞增版本（共用版本時改為同步觸發器已遞增的版本）"""
+        if self._engine is not None:
+            self.sync(local=table)
+            return self.version(table)
+        with self._lock:
+            version = self._versions.get(table, 0) + 1
+            self._versions[table] = version
+            self._modified[table] = datetime.now(timezone.utc).replace(microsecond=0)
+            return version
+
+    def version(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def last_modified(self, table: str) -> datetime:
+        return self._modified.get(table, self._started)
+
+    def etag(self, table: str, variant: str = "") -> str:
+        """強 ETag：同一版本、同一查詢參數會產生完全相同的回應內容"""
+        digest = hashlib.sha1(variant.encode()).hexdigest()[:12]
+        return f'"{table}-{self._epoch}-{self.version(table)}-{digest}"'
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error("Error syncing data versions: %s", e)
+
+    def start(self, interval: float = VERSION_POLL_SECONDS) -> None:
+        """共用版本時啟動背景同步執行緒"""
+        if self._engine is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="version-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+
+table_versions = TableVersions(engine, async_engine) if MULTI_WORKER else TableVersions()
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def conditional_response(request: Request, response: Response, table: str) -> Optional[Response]:
+    """
+    處理條件式 GET：資料未變時返回 304 回應；
+    否則在 response 上設定 ETag / Last-Modified 並返回 None，由路由繼續產生內容。
+    必須在查詢數據庫之前呼叫，確保 ETag 不會比內容新。
+    """
+    table_versions.sync()
+    return _check_conditions(request, response, table)
+
+
+async def conditional_response_async(request: Request, response: Response, table: str) -> Optional[Response]:
+    """async 路由使用的 conditional_response"""
+    await table_versions.sync_async()
+    return _check_conditions(request, response, table)
+
+
+def _check_conditions(request: Request, response: Response, table: str) -> Optional[Response]:
+    etag = table_versions.etag(table, str(request.url.query))
+    last_modified = table_versions.last_modified(table)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    # Last-Modified 只有秒級精度：最後一次寫入的那一秒結束前不送出，也不以 If-Modified-Since 回應 304，
+    # 同一秒內的後續寫入才不會被相同的日期掩蓋；ETag 不受影響，If-None-Match 優先
+    settled = datetime.now(timezone.utc) >= last_modified + timedelta(seconds=1)
+    if settled:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif settled:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                if last_modified <= parsedate_to_datetime(if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+
+    response.headers.update(headers)
+    return None
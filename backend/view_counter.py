@@ -0,0 +1,94 @@
+from typing import Dict
+from sqlalchemy import update, bindparam
+import threading
+import logging
+import os
+import models
+from versions import table_versions
+from cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# 文章瀏覽數的寫入緩衝：讀取時只累加記憶體計數，
+# 由背景執行緒定期以單一批次 UPDATE 寫回資料庫
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+
+_articles = models.Article.__table__
+
+# 只累加 views，保留 updated_at 不變（瀏覽不算內容修改）
+_increment_views = update(_articles).where(
+    _articles.c.id == bindparam("article_id")
+).values(
+    views=_articles.c.views + bindparam("delta"),
+    updated_at=_articles.c.updated_at
+)
+
+
+class ViewCounter:
+    def __init__(self, session_factory, interval: float = VIEW_FLUSH_INTERVAL):
+        self._session_factory = session_factory
+        self._interval = interval
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def increment(self, article_id: int, count: int = 1) -> None:
+        """累加一次瀏覽"""
+        with self._lock:
+            self._pending[article_id] = self._pending.get(article_id, 0) + count
+
+    def pending(self, article_id: int) -> int:
+        """尚未寫回資料庫的瀏覽數"""
+        with self._lock:
+            return self._pending.get(article_id, 0)
+
+    def flush(self) -> int:
+        """將累積的瀏覽數寫回資料庫，返回寫入的文章數"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        db = self._session_factory()
+        try:
+            db.execute(
+                _increment_views,
+                [{"article_id": article_id, "delta": delta} for article_id, delta in pending.items()]
+            )
+            db.commit()
+            # 文章列表包含瀏覽數，寫回後視為資料變更；單篇文章的快取只失效有寫回的文章
+            table_versions.bump("articles")
+            response_cache.invalidate("articles", *(f"articles:{article_id}" for article_id in pending))
+            return len(pending)
+        except Exception as e:
+            logger.error("Error flushing article views: %s", e)
+            db.rollback()
+            # 寫入失敗時放回緩衝，下次再試
+            with self._lock:
+                for article_id, delta in pending.items():
+                    self._pending[article_id] = self._pending.get(article_id, 0) + delta
+            return 0
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.flush()
+
+    def start(self) -> None:
+        """啟動背景寫回執行緒"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self._thread.start()
+        logger.info("View counter started with interval=%ss", self._interval)
+
+    def stop(self) -> None:
+        """停止背景執行緒並寫回剩餘的瀏覽數"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,172 @@
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import contextvars
+import logging
+import os
+import queue
+import threading
+import time
+import metrics
+from database import WriteSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 單一寫入執行緒與 group commit。
+# 寫入路由把「在 session 上執行的函數」交給寫入佇列，由單一執行緒以同一個連接執行；
+# 佇列中已累積的寫入在同一個交易中依序執行、只 commit 一次，每個寫入以 SAVEPOINT 隔開，
+# 失敗只回滾自己的部分。行程內的寫入不再互相等待 SQLite 的寫入鎖；多 worker 時各行程的
+# 寫入執行緒以 BEGIN IMMEDIATE（見 database.write_engine）依 busy_timeout 排隊，
+# 每次取得鎖就提交一整批。
+#
+# WRITE_QUEUE=false：在呼叫端執行緒以獨立交易執行（每個請求各自 commit）
+# WRITE_GROUP_MAX：每次 commit 最多包含的寫入數
+# WRITE_GROUP_WAIT_MS：取得第一個寫入後再等待其他寫入的時間；預設 0，只合併已在排隊的寫入
+WRITE_QUEUE = os.getenv("WRITE_QUEUE", "true").lower() == "true"
+WRITE_GROUP_MAX = int(os.getenv("WRITE_GROUP_MAX", "64"))
+WRITE_GROUP_WAIT_MS = float(os.getenv("WRITE_GROUP_WAIT_MS", "0"))
+
+T = TypeVar("T")
+Job = Tuple[Callable[[Session], object], contextvars.Context, Future, float]
+
+group_size = metrics.registry.register(metrics.Histogram(
+    "db_write_group_size", "Writes committed together by the write queue.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+))
+queue_wait = metrics.registry.register(metrics.Histogram(
+    "db_write_queue_wait_seconds", "Time a write waits in the queue before it starts executing.",
+    buckets=metrics.DB_BUCKETS
+))
+
+
+class Rollback(Exception):
+    """在寫入函數中拋出：回滾這次寫入，但仍以 result 作為返回值（例如 atomic 批次有錯誤時）"""
+
+    def __init__(self, result=None):
+        super().__init__("write rolled back")
+        self.result = result
+
+
+class WriteQueue:
+    def __init__(self, session_factory=WriteSessionLocal, enabled: bool = WRITE_QUEUE,
+                 max_group: int = WRITE_GROUP_MAX, wait_ms: float = WRITE_GROUP_WAIT_MS):
+        self._session_factory = session_factory
+        self.enabled = enabled
+        self._max_group = max_group
+        self._wait = wait_ms / 1000
+        self._queue: "queue.SimpleQueue[Optional[Job]]" = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        """執行寫入並等待 commit，返回 fn 的結果（fn 拋出的例外原樣拋出）"""
+        if not self.enabled:
+            return self._run_inline(fn)
+        return self.submit(fn).result()
+
+    async def run_async(self, fn: Callable[[Session], T]) -> T:
+        """在事件循環中等待寫入完成"""
+        if not self.enabled:
+            return await run_in_threadpool(self._run_inline, fn)
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def submit(self, fn: Callable[[Session], T]) -> Future:
+        """排入寫入佇列；fn 在寫入執行緒中以呼叫端的 contextvars 執行（SQL 分析等）"""
+        if self._thread is None:
+            self.start()
+        future: Future = Future()
+        self._queue.put((fn, contextvars.copy_context(), future, time.perf_counter()))
+        return future
+
+    def _run_inline(self, fn: Callable[[Session], T]) -> T:
+        db = self._session_factory()
+        try:
+            result = fn(db)
+            db.commit()
+            return result
+        except Rollback as e:
+            db.rollback()
+            return e.result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _collect(self, first: Job) -> Tuple[List[Job], bool]:
+        """取出已在排隊（或等待 WRITE_GROUP_WAIT_MS 內到達）的寫入，返回 (寫入, 是否收到停止訊號)"""
+        jobs = [first]
+        deadline = time.perf_counter() + self._wait
+        while len(jobs) < self._max_group:
+            try:
+                remaining = deadline - time.perf_counter()
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+        return jobs, False
+
+    def _execute(self, jobs: List[Job]) -> None:
+        outcomes = []
+        db = self._session_factory()
+        try:
+            started = time.perf_counter()
+            for fn, context, future, queued in jobs:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                queue_wait.observe(started - queued)
+                try:
+                    with db.begin_nested():
+                        outcomes.append((future, context.run(fn, db), None))
+                except Rollback as e:
+                    outcomes.append((future, e.result, None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+            db.commit()
+        except Exception as e:
+            logger.error("Error committing %s queued writes: %s", len(jobs), e)
+            db.rollback()
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        finally:
+            db.close()
+
+        group_size.observe(len(outcomes))
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            jobs, stopping = self._collect(first)
+            self._execute(jobs)
+            if stopping:
+                return
+
+    def start(self) -> None:
+        """啟動寫入執行緒（第一次寫入時也會自動啟動）"""
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                return
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+        logger.info("Write queue started: group max=%s, wait=%sms", self._max_group, self._wait * 1000)
+
+    def stop(self) -> None:
+        """處理完已排隊的寫入後停止"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+writer = WriteQueue()
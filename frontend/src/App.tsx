@@ -1,4 +1,5 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect, useMemo, useCallback, useRef } from 'react';
+import axios from 'axios';
 import { BrowserRouter as Router, Routes, Route, Link } from 'react-router-dom';
 import TaskList from './components/TaskList';
 import TaskForm from './components/TaskForm';
@@ -12,26 +13,162 @@ import Analytics from './components/Analytics';
 import ArticleList from './components/ArticleList';
 import ArticleDetail from './components/ArticleDetail';
 import ArticleEditor from './components/ArticleEditor';
-import { getTasks, createTask, updateTask, deleteTask } from './api/tasks';
+import {
+  getTasksPage, getAnalytics, getTaskChanges, getChangesCursor, createTask, updateTask, deleteTask,
+  subscribeToEvents, TaskAnalytics, TaskChanges
+} from './api/tasks';
+
+// 將增量同步的結果套用到已載入的任務（依位置排序）：已載入的任務就地更新、刪除的移除；
+// 尚有未載入的頁面時，新任務只在位置落在已載入範圍內時加入，其餘留給後續頁面
+const mergeTaskChanges = (tasks: Task[], changes: TaskChanges, hasMorePages: boolean): Task[] => {
+  const deleted = new Set(changes.deleted);
+  const changed = new Map(changes.changed.map(t => [t.id, t]));
+  const loaded = new Set(tasks.map(t => t.id));
+  const lastPosition = tasks.reduce((max, t) => Math.max(max, t.position), -Infinity);
+  const merged = tasks
+    .filter(t => !deleted.has(t.id))
+    .map(t => changed.get(t.id) ?? t);
+  changes.changed.forEach(t => {
+    if (!loaded.has(t.id) && (!hasMorePages || t.position <= lastPosition)) {
+      merged.push(t);
+    }
+  });
+  return merged.sort((a, b) => a.position - b.position || a.id - b.id);
+};
 
 function App() {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [filterStatus] = useState<'all' | 'pending' | 'completed'>('all');
   const [currentView, setCurrentView] = useState('tasks');
+  // 下一頁任務的游標，沒有更多任務時為 undefined
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [analytics, setAnalytics] = useState<TaskAnalytics | null>(null);
+
+  // 統計由伺服器計算，任務有變動時重新取得
+  const refreshAnalytics = useCallback(async () => {
+    try {
+      setAnalytics(await getAnalytics());
+    } catch (error) {
+      console.error('Error fetching analytics:', error);
+    }
+  }, []);
+
+  // 變更紀錄的游標（見 getTaskChanges），載入任務時取得，之後依事件增量同步
+  const changesCursor = useRef<number | null>(null);
+  const hasMorePages = useRef(false);
+  const syncing = useRef(false);
+  const syncPending = useRef(false);
+
+  useEffect(() => {
+    hasMorePages.current = nextCursor !== undefined;
+  }, [nextCursor]);
+
+  // 重新載入第一頁任務；先取得游標再載入，期間的寫入會在下次同步時再套用一次，不會遺漏
+  const reloadTasks = useCallback(async () => {
+    changesCursor.current = null;
+    try {
+      const cursor = await getChangesCursor();
+      const page = await getTasksPage();
+      setTasks(page.tasks);
+      setNextCursor(page.nextCursor);
+      changesCursor.current = cursor;
+    } catch (error) {
+      console.error('Error fetching tasks:', error);
+      toast.error('加載任務失敗');
+    }
+  }, []);
+
+  // 依變更紀錄套用游標之後的寫入；游標早於已清除的墓碑（410）時重新載入
+  const catchUp = useCallback(async () => {
+    if (syncing.current) {
+      syncPending.current = true;
+      return;
+    }
+    syncing.current = true;
+    try {
+      do {
+        syncPending.current = false;
+        let hasMore = true;
+        while (hasMore && changesCursor.current !== null) {
+          const changes = await getTaskChanges(changesCursor.current);
+          setTasks(prevTasks => mergeTaskChanges(prevTasks, changes, hasMorePages.current));
+          changesCursor.current = changes.cursor;
+          hasMore = changes.has_more;
+        }
+      } while (syncPending.current);
+    } catch (error) {
+      if (axios.isAxiosError(error) && error.response?.status === 410) {
+        await reloadTasks();
+      } else {
+        console.error('Error syncing task changes:', error);
+      }
+    } finally {
+      syncing.current = false;
+    }
+  }, [reloadTasks]);
+
+  useEffect(() => {
+    reloadTasks();
+    refreshAnalytics();
+  }, [reloadTasks, refreshAnalytics]);
 
+  // 即時事件：包含其他分頁、其他使用者與其他 worker 的寫入。
+  // 事件只帶 id，短時間內的事件合併成一次增量同步與統計更新；
+  // reset（事件已遺漏）與斷線重連後同樣由游標補上期間的寫入
   useEffect(() => {
-    const fetchTasks = async () => {
-      try {
-        const data = await getTasks();
-        setTasks(data);
-      } catch (error) {
-        console.error('Error fetching tasks:', error);
-        toast.error('加載任務失敗');
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const scheduleSync = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        catchUp();
+        refreshAnalytics();
+      }, 300);
+    };
+
+    const source = subscribeToEvents((type, data) => {
+      if (type === 'task.due') {
+        toast(`任務 #${data.id} 即將到期`);
+      } else if (type === 'task.overdue') {
+        toast.error(`任務 #${data.id} 已逾期`);
+      } else if (type === 'reset' || type.startsWith('task.') || type.startsWith('tasks.')) {
+        scheduleSync();
       }
+    });
+    source.onopen = scheduleSync;
+
+    return () => {
+      clearTimeout(timer);
+      source.close();
     };
+  }, [catchUp, refreshAnalytics]);
 
-    fetchTasks();
-  }, []);
+  const handleLoadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await getTasksPage({}, nextCursor);
+      // 已在本頁新增的任務可能再次出現在後面的頁面
+      setTasks(prevTasks => {
+        const loaded = new Set(prevTasks.map(t => t.id));
+        return [...prevTasks, ...page.tasks.filter(t => !loaded.has(t.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error fetching tasks:', error);
+      toast.error('加載任務失敗');
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextCursor, loadingMore]);
+
+  // 捲動到接近底部時載入下一頁
+  const handleScroll = (event: React.UIEvent<HTMLElement>) => {
+    const { scrollTop, scrollHeight, clientHeight } = event.currentTarget;
+    if (scrollHeight - scrollTop - clientHeight < 200) {
+      handleLoadMore();
+    }
+  };
 
   const handleCreateTask = async (task: TaskCreate) => {
     try {
@@ -223,7 +360,10 @@ function App() {
           </aside>
 
           {/* Main Content Area */}
-          <main className="flex-1 ml-64 mr-64 p-6 h-[calc(100vh-2rem)] overflow-y-auto">
+          <main
+            className="flex-1 ml-64 mr-64 p-6 h-[calc(100vh-2rem)] overflow-y-auto"
+            onScroll={(currentView === 'tasks' || currentView === 'kanban') ? handleScroll : undefined}
+          >
             <Routes>
               <Route path="/" element={
                 <div className="container mx-auto pb-6">
@@ -253,6 +393,17 @@ function App() {
                       />
                     </div>
                   )}
+                  {(currentView === 'tasks' || currentView === 'kanban') && nextCursor && (
+                    <div className="mt-4 text-center">
+                      <button
+                        onClick={handleLoadMore}
+                        disabled={loadingMore}
+                        className="px-4 py-2 text-sm text-blue-600 bg-white dark:bg-gray-800 border border-gray-200 dark:border-gray-700 rounded-md hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-50"
+                      >
+                        {loadingMore ? '載入中...' : '載入更多'}
+                      </button>
+                    </div>
+                  )}
                   {currentView === 'calendar' && (
                     <div>
                       <div className="text-center py-12 text-gray-500 dark:text-gray-400">
@@ -262,7 +413,7 @@ function App() {
                   )}
                   {currentView === 'analytics' && (
                     <div>
-                      <Analytics tasks={tasks} />
+                      <Analytics analytics={analytics} />
                     </div>
                   )}
                 </div>
@@ -276,7 +427,7 @@ function App() {
 
           {/* Right Sidebar */}
           <aside className="w-64 bg-white dark:bg-gray-800 border-l border-gray-200 dark:border-gray-700 fixed right-0 h-full overflow-y-auto">
-            <RightSidebar tasks={tasks} />
+            <RightSidebar analytics={analytics} />
           </aside>
         </div>
 
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Article, ArticleCreate, ArticleUpdate } from '../types/Article';
+import { Article, ArticleCreate, ArticleUpdate, ArticleListItem, RelatedArticle } from '../types/Article';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -55,6 +55,23 @@ export const getArticles = async (skip: number = 0, limit: number = 10): Promise
   }
 };
 
+// 獲取文章列表（精簡欄位，不含 content）
+export const getArticleList = async (skip: number = 0, limit: number = 10): Promise<ArticleListItem[]> => {
+  try {
+    const response = await axiosInstance.get('/articles', {
+      params: {
+        skip,
+        limit,
+        view: 'list'
+      }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching article list:', error);
+    throw error;
+  }
+};
+
 // 獲取單篇文章
 export const getArticle = async (id: number): Promise<Article> => {
   try {
@@ -68,6 +85,21 @@ export const getArticle = async (id: number): Promise<Article> => {
   }
 };
 
+// 獲取相關文章
+export const getRelatedArticles = async (id: number, limit: number = 5): Promise<RelatedArticle[]> => {
+  try {
+    const response = await axiosInstance.get(`/articles/${id}/related`, {
+      params: {
+        limit
+      }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching related articles:', error);
+    throw error;
+  }
+};
+
 // 創建文章
 export const createArticle = async (article: ArticleCreate): Promise<Article> => {
   try {
@@ -98,11 +98,34 @@ const formatTaskForApi = (task: TaskCreate | TaskUpdate): any => {
   return formattedTask;
 };
 
-export const getTasks = async (): Promise<Task[]> => {
+// 伺服器端篩選條件
+export interface TaskFilters {
+  status?: TaskStatus[];
+  priority?: number[];
+  tags?: string;
+  due_after?: string;
+  due_before?: string;
+}
+
+// 看板每次載入的任務數
+export const TASK_PAGE_SIZE = 50;
+
+// 獲取單頁任務，回傳下一頁游標（看板先載入第一頁，捲動到底或按「載入更多」時再取下一頁）
+export const getTasksPage = async (
+  filters: TaskFilters = {},
+  cursor?: string,
+  limit: number = TASK_PAGE_SIZE
+): Promise<{ tasks: Task[]; nextCursor?: string }> => {
   try {
     console.log('Fetching tasks...');
-    const response = await api.get<Task[]>('/tasks');
-    return response.data;
+    const response = await api.get<Task[]>('/tasks', {
+      params: { ...filters, cursor, limit },
+      paramsSerializer: { indexes: null },
+    });
+    return {
+      tasks: response.data,
+      nextCursor: response.headers['x-next-cursor'] || undefined,
+    };
   } catch (error) {
     console.error('Error fetching tasks:', error);
     throw error;
@@ -152,3 +175,81 @@ export const reorderTask = async (taskId: number, newPosition: number): Promise<
     throw error;
   }
 };
+
+// 伺服器端統計（由彙總表提供，不需下載全部任務）
+export interface TaskAnalytics {
+  total: number;
+  status: Record<string, number>;
+  priority: Record<string, number>;
+  completion_trend: { date: string; completed: number }[];
+}
+
+export const getAnalytics = async (days: number = 7): Promise<TaskAnalytics> => {
+  try {
+    const response = await api.get<TaskAnalytics>('/analytics', { params: { days } });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching analytics:', error);
+    throw error;
+  }
+};
+
+// 增量同步：返回游標之後變更的任務與已刪除的任務 id
+export interface TaskChanges {
+  cursor: number;
+  has_more: boolean;
+  changed: Task[];
+  deleted: number[];
+}
+
+export const getTaskChanges = async (since: number = 0, limit: number = 500): Promise<TaskChanges> => {
+  try {
+    const response = await api.get<TaskChanges>('/tasks/changes', { params: { since, limit } });
+    return { ...response.data, changed: response.data.changed.map(formatTaskDates) };
+  } catch (error) {
+    console.error('Error fetching task changes:', error);
+    throw error;
+  }
+};
+
+// 目前的變更游標，載入任務前取得，之後以 getTaskChanges 增量同步
+export const getChangesCursor = async (): Promise<number> => {
+  try {
+    const response = await api.get<{ cursor: number }>('/tasks/changes/cursor');
+    return response.data.cursor;
+  } catch (error) {
+    console.error('Error fetching task changes cursor:', error);
+    throw error;
+  }
+};
+
+// 即將到期（within 分鐘內）與已逾期的未完成任務，依到期時間排序
+export const getDueTasks = async (within: number = 1440, overdue: boolean = true): Promise<Task[]> => {
+  try {
+    const response = await api.get<Task[]>('/tasks/due', { params: { within, overdue } });
+    return response.data.map(formatTaskDates);
+  } catch (error) {
+    console.error('Error fetching due tasks:', error);
+    throw error;
+  }
+};
+
+// 訂閱伺服器即時事件（SSE），收到 reset 時應重新載入完整資料；
+// tasks.changed / articles.changed 表示其他 worker 有寫入，內容不詳，應重新同步
+const EVENT_TYPES = [
+  'task.created', 'task.updated', 'task.deleted', 'task.reordered',
+  'tasks.rebalanced', 'tasks.batch', 'tasks.imported', 'tasks.archived', 'task.restored', 'tasks.changed',
+  'task.due', 'task.overdue',
+  'article.created', 'article.updated', 'article.deleted', 'articles.imported', 'articles.changed',
+  'reset',
+];
+
+export const subscribeToEvents = (onEvent: (type: string, data: any) => void): EventSource => {
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  EVENT_TYPES.forEach(type => {
+    source.addEventListener(type, (event) => {
+      onEvent(type, JSON.parse((event as MessageEvent).data));
+    });
+  });
+  return source;
+};
@@ -1,5 +1,6 @@
 import React, { useMemo } from 'react';
-import { Task, TaskStatus } from '../types/Task';
+import { TaskStatus } from '../types/Task';
+import { TaskAnalytics } from '../api/tasks';
 import {
   Chart as ChartJS,
   CategoryScale,
@@ -11,8 +12,6 @@ import {
   ArcElement
 } from 'chart.js';
 import { Bar, Pie } from 'react-chartjs-2';
-import { format } from 'date-fns';
-import { zhTW } from 'date-fns/locale';
 
 // 註冊 ChartJS 組件
 ChartJS.register(
@@ -26,72 +25,30 @@ ChartJS.register(
 );
 
 interface AnalyticsProps {
-  tasks: Task[];
+  analytics: TaskAnalytics | null;
 }
 
-const Analytics: React.FC<AnalyticsProps> = ({ tasks }) => {
-  // 計算任務狀態分布
-  const statusDistribution = useMemo(() => {
-    const distribution = {
-      [TaskStatus.TODO]: 0,
-      [TaskStatus.IN_PROGRESS]: 0,
-      [TaskStatus.DONE]: 0,
-    };
-    tasks.forEach(task => {
-      distribution[task.status]++;
-    });
-    return distribution;
-  }, [tasks]);
-
-  // 計算優先級分布
-  const priorityDistribution = useMemo(() => {
-    const distribution = {
-      '低': 0,
-      '中': 0,
-      '高': 0,
-    };
-    tasks.forEach(task => {
-      switch (task.priority) {
-        case 1:
-          distribution['低']++;
-          break;
-        case 2:
-          distribution['中']++;
-          break;
-        case 3:
-          distribution['高']++;
-          break;
-      }
-    });
-    return distribution;
-  }, [tasks]);
-
-  // 計算最近7天的任務完成趨勢
-  const completionTrend = useMemo(() => {
-    const last7Days = Array.from({ length: 7 }, (_, i) => {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      return date;
-    }).reverse();
-
-    const trend = last7Days.map(date => {
-      const dayStart = new Date(date.setHours(0, 0, 0, 0));
-      const dayEnd = new Date(date.setHours(23, 59, 59, 999));
-      
-      return {
-        date: format(date, 'MM/dd', { locale: zhTW }),
-        completed: tasks.filter(task => {
-          if (task.updated_at && task.status === TaskStatus.DONE) {
-            const updateDate = new Date(task.updated_at);
-            return updateDate >= dayStart && updateDate <= dayEnd;
-          }
-          return false;
-        }).length
-      };
-    });
-
-    return trend;
-  }, [tasks]);
+// 統計由伺服器的彙總表提供（看板只載入部分任務，不能以已載入的任務計算）
+const Analytics: React.FC<AnalyticsProps> = ({ analytics }) => {
+  // 任務狀態分布
+  const statusDistribution = useMemo(() => ({
+    [TaskStatus.TODO]: analytics?.status[TaskStatus.TODO] ?? 0,
+    [TaskStatus.IN_PROGRESS]: analytics?.status[TaskStatus.IN_PROGRESS] ?? 0,
+    [TaskStatus.DONE]: analytics?.status[TaskStatus.DONE] ?? 0,
+  }), [analytics]);
+
+  // 優先級分布
+  const priorityDistribution = useMemo(() => ({
+    '低': analytics?.priority['1'] ?? 0,
+    '中': analytics?.priority['2'] ?? 0,
+    '高': analytics?.priority['3'] ?? 0,
+  }), [analytics]);
+
+  // 最近7天的任務完成趨勢（日期為台北時間的 YYYY-MM-DD）
+  const completionTrend = useMemo(() => (analytics?.completion_trend ?? []).map(item => ({
+    date: item.date.slice(5).replace('-', '/'),
+    completed: item.completed,
+  })), [analytics]);
 
   // 狀態分布圖表數據
   const statusChartData = {
@@ -233,7 +190,7 @@ const Analytics: React.FC<AnalyticsProps> = ({ tasks }) => {
       <div className="grid grid-cols-1 md:grid-cols-4 gap-3">
         <div className="bg-white p-4 rounded-lg shadow-md">
           <h4 className="text-sm font-medium text-gray-500">總任務數</h4>
-          <p className="text-2xl font-bold text-gray-800">{tasks.length}</p>
+          <p className="text-2xl font-bold text-gray-800">{analytics?.total ?? 0}</p>
         </div>
         <div className="bg-white p-4 rounded-lg shadow-md">
           <h4 className="text-sm font-medium text-gray-500">已完成任務</h4>
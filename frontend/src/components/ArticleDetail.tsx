@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
-import { getArticle, deleteArticle } from '../api/articles';
-import { Article } from '../types/Article';
+import { getArticle, getRelatedArticles, deleteArticle } from '../api/articles';
+import { Article, RelatedArticle } from '../types/Article';
 import { format } from 'date-fns';
 import { PencilIcon, TrashIcon } from '@heroicons/react/24/outline';
 import toast from 'react-hot-toast';
@@ -12,6 +12,7 @@ const ArticleDetail: React.FC = () => {
   const [article, setArticle] = useState<Article | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [related, setRelated] = useState<RelatedArticle[]>([]);
 
   useEffect(() => {
     const loadArticle = async () => {
@@ -32,6 +33,21 @@ const ArticleDetail: React.FC = () => {
     loadArticle();
   }, [id]);
 
+  useEffect(() => {
+    const loadRelated = async () => {
+      if (!id) return;
+      try {
+        setRelated(await getRelatedArticles(parseInt(id)));
+      } catch (err) {
+        // 相關文章只是附加資訊，失敗時不顯示該區塊
+        setRelated([]);
+        console.error('Error loading related articles:', err);
+      }
+    };
+
+    loadRelated();
+  }, [id]);
+
   const handleDelete = async () => {
     if (!id || !window.confirm('確定要刪除這篇文章嗎？')) return;
 
@@ -125,6 +141,27 @@ const ArticleDetail: React.FC = () => {
               </div>
             </div>
           )}
+
+          {related.length > 0 && (
+            <div className="mt-8 pt-6 border-t border-gray-200 dark:border-gray-700">
+              <h2 className="text-lg font-semibold text-gray-900 dark:text-white mb-2">相關文章</h2>
+              <ul className="space-y-2">
+                {related.map((item) => (
+                  <li key={item.id}>
+                    <Link
+                      to={`/articles/${item.id}`}
+                      className="text-blue-600 hover:underline dark:text-blue-400"
+                    >
+                      {item.title}
+                    </Link>
+                    {item.summary && (
+                      <p className="text-sm text-gray-500 dark:text-gray-400 truncate">{item.summary}</p>
+                    )}
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
         </div>
       </div>
     </div>
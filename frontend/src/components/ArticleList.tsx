@@ -1,12 +1,12 @@
 import React, { useEffect, useState } from 'react';
-import { Article } from '../types/Article';
-import { getArticles } from '../api/articles';
+import { ArticleListItem } from '../types/Article';
+import { getArticleList } from '../api/articles';
 import { format } from 'date-fns';
 import { Link } from 'react-router-dom';
 import { PlusIcon } from '@heroicons/react/24/outline';
 
 const ArticleList: React.FC = () => {
-  const [articles, setArticles] = useState<Article[]>([]);
+  const [articles, setArticles] = useState<ArticleListItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [page, setPage] = useState(1);
@@ -15,7 +15,7 @@ const ArticleList: React.FC = () => {
   const loadArticles = async () => {
     try {
       setLoading(true);
-      const data = await getArticles((page - 1) * 10, 10);
+      const data = await getArticleList((page - 1) * 10, 10);
       if (data.length < 10) {
         setHasMore(false);
       }
@@ -1,17 +1,19 @@
 import React from 'react';
-import { Task, TaskStatus } from '../types/Task';
+import { TaskStatus } from '../types/Task';
+import { TaskAnalytics } from '../api/tasks';
 
 interface RightSidebarProps {
-  tasks: Task[];
+  analytics: TaskAnalytics | null;
 }
 
-const RightSidebar: React.FC<RightSidebarProps> = ({ tasks }) => {
+// 統計由伺服器的彙總表提供，不以已載入的任務計算
+const RightSidebar: React.FC<RightSidebarProps> = ({ analytics }) => {
   const getStatusCount = (status: TaskStatus) => {
-    return tasks.filter(task => task.status === status).length;
+    return analytics?.status[status] ?? 0;
   };
 
   const getPriorityCount = (priority: number) => {
-    return tasks.filter(task => task.priority === priority).length;
+    return analytics?.priority[String(priority)] ?? 0;
   };
 
   return (
@@ -23,7 +25,7 @@ const RightSidebar: React.FC<RightSidebarProps> = ({ tasks }) => {
         <div className="mb-6 bg-blue-50 rounded-lg p-4">
           <div className="flex justify-between items-center">
             <span className="text-blue-700 font-medium">總任務數量</span>
-            <span className="text-2xl font-bold text-blue-700">{tasks.length}</span>
+            <span className="text-2xl font-bold text-blue-700">{analytics?.total ?? 0}</span>
           </div>
         </div>
 
@@ -10,6 +10,14 @@ export interface Article {
   updated_at: string;
 }
 
+// 文章列表使用的精簡資料（不含 content）
+export type ArticleListItem = Omit<Article, 'content'>;
+
+// 相關文章（score 為 0~1 的相似度）
+export interface RelatedArticle extends ArticleListItem {
+  score: number;
+}
+
 export interface ArticleCreate {
   title: string;
   content: string;